@@ -0,0 +1,401 @@
+"""
+============================================================================
+向量化算术内核（Arithmetic Kernel）- 整列版的 + - * / // % **
+============================================================================
+
+📚 核心总结：
+-----------
+var.py 第 5 节对两个标量做 + - * / // % ** 运算。
+同样的运算套在两列几千万行的数字上时，逐元素的 Python 循环太慢；
+直接用 NumPy 又有几处与 Python 语义不一致：
+
+   问题                         Python             NumPy 默认
+   ---------------------------  -----------------  -----------------------
+   int64 溢出                   自动变成大整数      静默回绕（wrap around）
+   整数 ** 负整数               得到 float          直接报错
+   / // % 除以 0                 ZeroDivisionError  警告 + 返回 0 / inf / nan
+   True + True                  2                  True（按逻辑或计算）
+
+本模块的做法：
+1. 按块（chunk）计算，内存占用固定
+2. // 和 % 直接用 np.floor_divide / np.remainder，
+   它们的负数规则（向下取整、余数与除数同号）与 Python 完全一致
+3. 用 float64 估算结果，绝对值接近 2**63 的元素才用 Python 整数精确重算；
+   真正溢出时按配置处理：
+   - overflow="object" 整块提升为 object 数组（Python 大整数，结果精确）
+   - overflow="float"  整块提升为 float64
+   - overflow="raise"  抛出 OverflowError
+   ** 的估算值超出 float64 范围时（例如 3 ** 10**9）一定溢出，
+   float / raise 模式下直接使用估算值或报错，不去算几百万位的精确结果
+4. 整数 ** 逐元素处理：非负指数的元素按整数精确计算，只有负指数的元素得到 float，
+   两者混在一起时结果是 object 数组（overflow="float" 时整块为 float64）
+5. 整数 / 整数：两个操作数都不超过 2**53 时 float64 除法的舍入与 Python 相同；
+   更大的元素用 Python 的整数除法重算（它按精确的商舍入）
+6. 浮点 ** 的结果超出范围时与 Python 一样抛出 OverflowError（NumPy 默认得到 inf），
+   0.0 的负数次幂抛出 ZeroDivisionError
+
+🔑 用法：
+-------
+   apply("//", a, b)                       # 单个运算
+   evaluate("(a + b) * 2 % c", a=a, b=b, c=c)   # 小表达式，一次遍历
+
+⚠️ 注意：
+--------
+1. 浮点运算直接使用 NumPy（IEEE 754），与 Python float 一致；
+   但 Python 中 (-8.0) ** 0.5 得到复数，这里得到 nan
+2. 任何一个操作数是 float 时按 float 计算，与 Python 相同
+3. uint64 列中超过 int64 范围的值（>= 2**63）会让整列按 object 计算
+4. 依赖 NumPy（pip install numpy）
+
+============================================================================
+"""
+
+import ast
+import operator
+
+from lazy_import import lazy_import
+
+np = lazy_import("numpy")  # 第一次计算时才加载
+if np is None:
+    raise ImportError("arith_kernel 依赖 NumPy，请先运行: pip install numpy")
+
+_INT64_LIMIT = 2 ** 62  # 估算值超过它的元素才需要精确重算
+_FLOAT_EXACT = 2 ** 53  # 绝对值不超过它的整数转成 float64 没有误差
+
+# 存 ufunc 的名字而不是函数本身，import 本模块时不必加载 NumPy
+_UFUNCS = {
+    "+": "add",
+    "-": "subtract",
+    "*": "multiply",
+    "/": "true_divide",
+    "//": "floor_divide",
+    "%": "remainder",
+    "**": "power",
+}
+
+_PYOPS = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": operator.truediv,
+    "//": operator.floordiv,
+    "%": operator.mod,
+    "**": operator.pow,
+}
+
+_AST_OPS = {
+    ast.Add: "+",
+    ast.Sub: "-",
+    ast.Mult: "*",
+    ast.Div: "/",
+    ast.FloorDiv: "//",
+    ast.Mod: "%",
+    ast.Pow: "**",
+}
+
+OVERFLOW_MODES = ("object", "float", "raise")
+
+
+def _as_operand(x):
+    """bool/uint 统一转成 int64，与 Python 的整数语义一致；放不进 int64 的 uint64 转成 object"""
+    x = np.asarray(x)
+    if x.dtype.kind == "u" and x.dtype.itemsize == 8 and x.size and x.max() >= 2 ** 63:
+        return x.astype(object)
+    if x.dtype.kind in "bu":
+        return x.astype(np.int64)
+    return x
+
+
+def negate(x, overflow="object"):
+    """按 Python 语义计算 -x（浮点数保留 -0.0 的符号）"""
+    x = _as_operand(x)
+    if x.dtype.kind == "i":
+        return binop("-", 0, x, overflow)  # -(-2**63) 会溢出，交给 binop 处理
+    return np.negative(x)
+
+
+def _to_float(v):
+    """Python 整数转 float，超出范围时得到 ±inf（float(v) 会报错）"""
+    try:
+        return float(v)
+    except OverflowError:
+        return np.inf if v > 0 else -np.inf
+
+
+def _exact_true_divide(a, b, result):
+    """整数 / 整数：超过 2**53 的元素转成 float 时已经有误差，改用 Python 整数除法"""
+    inexact = (a > _FLOAT_EXACT) | (a < -_FLOAT_EXACT) | (b > _FLOAT_EXACT) | (b < -_FLOAT_EXACT)
+    if not inexact.any():
+        return result
+    a_full, b_full = np.broadcast_arrays(a, b)
+    result = np.array(result, dtype=np.float64)
+    result[inexact] = [int(x) / int(y) for x, y in zip(a_full[inexact], b_full[inexact])]
+    return result
+
+
+def _check_float_power(a, b, result):
+    """有限的底数和指数得到 ±inf：Python 在这里报错，而不是返回 inf"""
+    bad = np.isinf(result) & np.isfinite(a) & np.isfinite(b)
+    if bad.any():
+        if (bad & (a == 0)).any():
+            raise ZeroDivisionError("0.0 不能做负数次幂")
+        raise OverflowError("浮点运算 ** 的结果超出范围")
+
+
+def _object_op(op, a, b):
+    """object 数组（Python 大整数）之间的精确运算"""
+    func = _PYOPS[op]
+    a, b = np.broadcast_arrays(np.asarray(a, dtype=object), np.asarray(b, dtype=object))
+    out = np.empty(a.shape, dtype=object)
+    for i, (x, y) in enumerate(zip(a.flat, b.flat)):
+        out.flat[i] = func(x, y)
+    return out
+
+
+def binop(op, a, b, overflow="object"):
+    """
+    在一块数据上按 Python 语义计算 a op b
+
+    参数:
+        op: "+" "-" "*" "/" "//" "%" "**" 之一
+        a, b: NumPy 数组或标量
+        overflow: int64 溢出时的处理方式 "object" / "float" / "raise"
+
+    返回:
+        np.ndarray
+    """
+    if op not in _UFUNCS:
+        raise ValueError(f"不支持的运算符: {op}")
+    if overflow not in OVERFLOW_MODES:
+        raise ValueError(f"overflow 必须是 {OVERFLOW_MODES} 之一")
+
+    a = _as_operand(a)
+    b = _as_operand(b)
+    if a.dtype == object or b.dtype == object:
+        return _object_op(op, a, b)
+
+    if op in ("/", "//", "%") and np.any(b == 0):
+        raise ZeroDivisionError(f"{op} 运算中除数为 0")
+
+    is_int = a.dtype.kind == "i" and b.dtype.kind == "i"
+
+    ufunc = getattr(np, _UFUNCS[op])
+    if not is_int or op == "/":
+        with np.errstate(over="ignore", invalid="ignore", divide="ignore"):
+            result = ufunc(a, b)
+        if op == "**":
+            _check_float_power(a, b, result)
+        elif is_int:
+            result = _exact_true_divide(a, b, result)
+        return result
+
+    a = a.astype(np.int64, copy=False)
+    b = b.astype(np.int64, copy=False)
+    if op == "**" and np.any(b < 0):
+        # Python: 2 ** -1 == 0.5，整数的负指数幂得到 float；0 ** -1 报错
+        if np.any((a == 0) & (b < 0)):
+            raise ZeroDivisionError("0 不能做负数次幂")
+        a_full, b_full = np.broadcast_arrays(a, b)
+        negative = b_full < 0
+        floats = np.power(a_full[negative].astype(np.float64), b_full[negative])
+        if negative.all() or overflow == "float":
+            promoted = np.array(binop("**", a_full, np.where(negative, 0, b_full), overflow),
+                                dtype=np.float64)
+            promoted[negative] = floats
+            return promoted
+        # 非负指数仍按整数精确计算，只有负指数的元素是 float
+        out = np.empty(a_full.shape, dtype=object)
+        out[~negative] = binop("**", a_full[~negative], b_full[~negative], overflow).tolist()
+        out[negative] = floats.tolist()
+        return out
+    if op == "%":
+        return ufunc(a, b)  # 取余不会溢出
+
+    with np.errstate(over="ignore", invalid="ignore"):
+        result = ufunc(a, b)
+        estimate = ufunc(a.astype(np.float64), b.astype(np.float64))
+    suspect = ~(np.abs(estimate) < _INT64_LIMIT)  # 也包含 inf / nan
+    if not suspect.any():
+        return result
+
+    # ** 的估算值是 inf 时一定溢出，精确结果可能有几百万位；不需要精确结果的模式下不去算它
+    huge = np.zeros_like(suspect)
+    if op == "**" and overflow != "object":
+        huge = np.isinf(estimate)
+        if overflow == "raise" and huge.any():
+            raise OverflowError(f"int64 运算 {op} 溢出")
+        suspect = suspect & ~huge
+
+    # 只对可疑元素用 Python 整数精确重算
+    a_full, b_full = np.broadcast_arrays(a, b)
+    result = np.array(result)
+    func = _PYOPS[op]
+    exact = [func(int(x), int(y)) for x, y in zip(a_full[suspect], b_full[suspect])]
+    if not huge.any() and all(-(2 ** 63) <= v < 2 ** 63 for v in exact):
+        result[suspect] = exact
+        return result
+
+    if overflow == "raise":
+        raise OverflowError(f"int64 运算 {op} 溢出")
+    if overflow == "float":
+        promoted = result.astype(np.float64)
+        promoted[suspect] = [_to_float(v) for v in exact]
+        promoted[huge] = estimate[huge]
+        return promoted
+    promoted = result.astype(object)
+    promoted[suspect] = exact
+    return promoted
+
+
+def _chunks(length, chunk_size):
+    for start in range(0, length, chunk_size):
+        yield slice(start, min(start + chunk_size, length))
+
+
+def _length(*operands):
+    lengths = {len(x) for x in operands if np.ndim(x) > 0}
+    if len(lengths) > 1:
+        raise ValueError(f"列长度不一致: {sorted(lengths)}")
+    return lengths.pop() if lengths else None
+
+
+def _concat(parts, overflow):
+    """拼接各块结果；只要有一块被提升，就统一提升到同一类型"""
+    kinds = {p.dtype.kind for p in parts}
+    if "O" in kinds or (overflow != "float" and {"i", "f"} <= kinds):
+        # 整数块和 float 块（负指数的 **）拼在一起：整数保持精确
+        return np.concatenate([p.astype(object) for p in parts])
+    return np.concatenate(parts)
+
+
+def apply(op, a, b, overflow="object", chunk_size=1 << 20):
+    """
+    按块对两列（或一列与一个标量）计算 a op b
+
+    参数:
+        op: 运算符字符串
+        a, b: 等长的一维数组，或标量
+        overflow: 见 binop
+        chunk_size: 每块行数
+
+    返回:
+        np.ndarray
+    """
+    n = _length(a, b)
+    if n is None:
+        return binop(op, a, b, overflow)
+    parts = []
+    for part in _chunks(n, chunk_size):
+        x = a[part] if np.ndim(a) else a
+        y = b[part] if np.ndim(b) else b
+        parts.append(binop(op, x, y, overflow))
+    return _concat(parts, overflow) if parts else np.empty(0)
+
+
+def _compile(node, names):
+    """把表达式 AST 编译成嵌套闭包：chunk 字典 -> 结果数组"""
+    if isinstance(node, ast.Expression):
+        return _compile(node.body, names)
+    if isinstance(node, ast.BinOp) and type(node.op) in _AST_OPS:
+        op = _AST_OPS[type(node.op)]
+        left = _compile(node.left, names)
+        right = _compile(node.right, names)
+        return lambda env, overflow: binop(op, left(env, overflow), right(env, overflow), overflow)
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+        operand = _compile(node.operand, names)
+        if isinstance(node.op, ast.UAdd):
+            return operand
+        return lambda env, overflow: negate(operand(env, overflow), overflow)
+    if isinstance(node, ast.Name):
+        names.add(node.id)
+        return lambda env, overflow: env[node.id]
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        value = node.value
+        return lambda env, overflow: value
+    raise ValueError(f"表达式中不支持: {ast.dump(node)}")
+
+
+def evaluate(expr, overflow="object", chunk_size=1 << 20, **columns):
+    """
+    按块计算一个由 + - * / // % ** 组成的小表达式
+
+    参数:
+        expr: 表达式字符串，例如 "(a + b) * 2 % c"
+        overflow: 见 binop
+        chunk_size: 每块行数
+        **columns: 表达式中用到的列（数组）或标量
+
+    返回:
+        np.ndarray
+    """
+    names = set()
+    program = _compile(ast.parse(expr, mode="eval"), names)
+    missing = names - columns.keys()
+    if missing:
+        raise NameError(f"表达式中的变量没有提供: {sorted(missing)}")
+
+    env = {name: _as_operand(columns[name]) for name in names}
+    n = _length(*env.values())
+    if n is None:
+        return program(env, overflow)
+    parts = []
+    for part in _chunks(n, chunk_size):
+        chunk = {k: (v[part] if v.ndim else v) for k, v in env.items()}
+        parts.append(np.asarray(program(chunk, overflow)))
+    return _concat(parts, overflow) if parts else np.empty(0)
+
+
+if __name__ == "__main__":
+    import time
+
+    print("=" * 60)
+    print("1. 负数的 // 和 % 与 Python 一致")
+    print("=" * 60)
+
+    a = np.array([10, -10, 10, -10])
+    b = np.array([3, 3, -3, -3])
+    for op in ["//", "%"]:
+        got = apply(op, a, b).tolist()
+        expected = [_PYOPS[op](x, y) for x, y in zip(a.tolist(), b.tolist())]
+        print(f"  a {op} b = {got}（Python: {expected}）")
+    print(f"  [2, 7] ** [-1, 13] = {apply('**', np.array([2, 7]), np.array([-1, 13])).tolist()}")
+
+    print()
+
+    print("=" * 60)
+    print("2. int64 溢出：提升为 object / float64，或报错")
+    print("=" * 60)
+
+    big = np.array([2 ** 62, 5], dtype=np.int64)
+    print(f"  NumPy 默认:      {np.multiply(big, 4).tolist()}")
+    print(f"  overflow=object: {apply('*', big, 4).tolist()}")
+    print(f"  overflow=float:  {apply('*', big, 4, overflow='float').tolist()}")
+    try:
+        apply("*", big, 4, overflow="raise")
+    except OverflowError as e:
+        print(f"  overflow=raise:  {e}")
+
+    print()
+
+    print("=" * 60)
+    print("3. 表达式按块计算 + 性能对比")
+    print("=" * 60)
+
+    n = 2_000_000
+    rng = np.random.default_rng(0)
+    x = rng.integers(-1000, 1000, n)
+    y = rng.integers(1, 100, n)
+
+    start = time.perf_counter()
+    expected = [(p + q) * 2 % q - p // q for p, q in zip(x.tolist(), y.tolist())]
+    print(f"  Python 逐元素:     {time.perf_counter() - start:.3f}s")
+
+    start = time.perf_counter()
+    got = evaluate("(x + y) * 2 % y - x // y", x=x, y=y)
+    print(f"  evaluate 按块计算: {time.perf_counter() - start:.3f}s")
+    assert got.tolist() == expected
+
+    print()
+    print("=" * 60)
+    print("向量化算术内核演示完成！")
+    print("=" * 60)
@@ -0,0 +1,521 @@
+"""
+============================================================================
+异步批量抓取（AsyncFetcher）- asyncio + 并发上限 + 流式写盘
+============================================================================
+
+📚 核心总结：
+-----------
+http_client.py 用线程池并发请求，适合几百上千个 URL。
+一次要抓 1 万个以上 URL 时，每个请求占一个线程太重；
+asyncio 一个线程就能同时挂起成千上万个等待中的请求。
+
+AsyncFetcher 只用标准库（asyncio streams）实现了一个精简的 HTTP/1.1 客户端：
+1. 全局并发上限：asyncio.Semaphore(concurrency)
+2. 每个主机的连接上限：per_host 个连接，keep-alive 连接放回池中复用
+3. 响应体按块（chunk_size）读取，直接写进文件，不在内存里拼接完整响应；
+   写文件放在线程池里执行，写完一块才读下一块 ——
+   磁盘慢时不再读 socket，内核接收缓冲区填满后 TCP 会让服务端暂停发送（背压）
+4. 连接错误、超时、5xx 自动重试，退避时间按 backoff * 2^n 增长
+5. 支持 Content-Length、chunked、读到连接关闭三种响应体，以及 http / https；
+   1xx、204、304 和 HEAD 的响应没有响应体（不能按"读到连接关闭"处理，否则会一直等下去）
+
+🔑 用法：
+-------
+   results = fetch_all(urls, dest_dir="downloads", concurrency=200, per_host=8)
+
+   # 或者在已有的事件循环里
+   async with AsyncFetcher(concurrency=200) as fetcher:
+       results = await fetcher.fetch_many(urls, dest_dir="downloads")
+
+🔑 基准测试（本地 asyncio 模拟服务端，可注入延迟和错误）：
+--------------------------------------------------
+   python async_fetch.py                         # 默认 2000 个 URL
+   python async_fetch.py --urls 10000 --latency 50
+
+⚠️ 注意：
+--------
+1. 只支持 GET，不处理重定向和压缩（需要这些功能请用 http_client.py）
+2. dest_dir 为 None 时响应体只计数、不保存
+3. 文件先写成 .part，成功后再改名，失败的下载不会留下半个文件
+
+============================================================================
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import ssl
+import time
+from collections import Counter
+from dataclasses import dataclass
+from urllib.parse import parse_qs, urlsplit
+
+RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+
+
+@dataclass
+class AsyncFetchResult:
+    """单个 URL 的抓取结果"""
+
+    url: str
+    status: int = None
+    path: str = None
+    size: int = 0
+    elapsed: float = 0.0
+    attempts: int = 0
+    error: Exception = None
+
+    @property
+    def ok(self):
+        return self.error is None and self.status is not None and self.status < 400
+
+
+class _HostPool:
+    """一个主机的连接池：最多 limit 个连接，空闲的 keep-alive 连接留着复用"""
+
+    def __init__(self, scheme, host, port, limit):
+        self.host = host
+        self.port = port
+        self.ssl = ssl.create_default_context() if scheme == "https" else None
+        self.slots = asyncio.Semaphore(limit)
+        self.idle = []
+
+    async def acquire(self):
+        await self.slots.acquire()
+        while self.idle:
+            reader, writer = self.idle.pop()
+            if not reader.at_eof() and not writer.is_closing():
+                return reader, writer
+            writer.close()
+        try:
+            return await asyncio.open_connection(self.host, self.port, ssl=self.ssl)
+        except BaseException:
+            self.slots.release()
+            raise
+
+    def release(self, conn, reuse):
+        if reuse:
+            self.idle.append(conn)
+        else:
+            conn[1].close()
+        self.slots.release()
+
+    def close(self):
+        writers = [writer for _, writer in self.idle]
+        for writer in writers:
+            writer.close()
+        self.idle.clear()
+        return writers
+
+
+async def _read_head(reader):
+    """读取状态行和响应头"""
+    line = await reader.readline()
+    if not line:
+        raise ConnectionError("服务端关闭了连接")
+    parts = line.split(None, 2)
+    if len(parts) < 2 or not parts[0].startswith(b"HTTP/"):
+        raise ConnectionError(f"无效的状态行: {line!r}")
+    status = int(parts[1])
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n"):
+            return status, headers
+        if not line:
+            raise ConnectionError("读取响应头时连接被关闭")
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+
+def _has_body(method, status):
+    """RFC 9112 6.3：HEAD 的响应和 1xx、204、304 响应没有响应体"""
+    return method != "HEAD" and status >= 200 and status not in (204, 304)
+
+
+async def _read_body(reader, status, headers, sink, chunk_size, method="GET"):
+    """
+    按块读取响应体，每块交给 sink
+
+    返回:
+        (响应体字节数, 连接能否复用)
+    """
+    if not _has_body(method, status):
+        return 0, True
+    size = 0
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        while True:
+            length = int((await reader.readline()).split(b";")[0], 16)
+            if length == 0:
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass  # 忽略 trailer
+                return size, True
+            while length:
+                block = await reader.readexactly(min(chunk_size, length))
+                length -= len(block)
+                size += len(block)
+                await sink(block)
+            await reader.readexactly(2)  # 块后面的 CRLF
+
+    if "content-length" in headers:
+        remaining = int(headers["content-length"])
+        while remaining:
+            block = await reader.readexactly(min(chunk_size, remaining))
+            remaining -= len(block)
+            size += len(block)
+            await sink(block)
+        return size, True
+
+    # 既没有长度也不是 chunked：读到连接关闭为止
+    while True:
+        block = await reader.read(chunk_size)
+        if not block:
+            return size, False
+        size += len(block)
+        await sink(block)
+
+
+async def _discard(block):
+    pass
+
+
+class AsyncFetcher:
+    """基于 asyncio streams 的批量 HTTP GET 客户端"""
+
+    def __init__(self, concurrency=100, per_host=8, timeout=30.0, retries=2, backoff=0.05,
+                 max_backoff=5.0, chunk_size=64 * 1024, headers=None):
+        """
+        参数:
+            concurrency: 同时进行的请求总数上限
+            per_host: 每个主机的连接数上限
+            timeout: 单次尝试的超时（秒，包括下载响应体）
+            retries: 失败后最多重试几次
+            backoff: 第一次重试前等待的秒数，之后每次翻倍
+            max_backoff: 单次等待的上限（秒）
+            chunk_size: 每次从 socket 读取、写入文件的字节数
+            headers: 每个请求都带上的请求头
+        """
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.chunk_size = chunk_size
+        self.headers = dict(headers or {})
+        self._limit = None
+        self._pools = {}
+
+    def _pool(self, parts):
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        key = (parts.scheme, parts.hostname, port)
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = self._pools[key] = _HostPool(parts.scheme, parts.hostname, port, self.per_host)
+        return pool
+
+    def _request_bytes(self, parts):
+        target = parts.path or "/"
+        if parts.query:
+            target += "?" + parts.query
+        lines = [f"GET {target} HTTP/1.1", f"Host: {parts.netloc}", "Connection: keep-alive"]
+        lines += [f"{name}: {value}" for name, value in self.headers.items()]
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+    async def _attempt(self, parts, sink):
+        """一次请求：取连接、发请求、读响应；返回 (状态码, 响应体字节数)"""
+        pool = self._pool(parts)
+        conn = await pool.acquire()
+        reuse = False
+        try:
+            reader, writer = conn
+            writer.write(self._request_bytes(parts))
+            await writer.drain()
+            status, headers = await _read_head(reader)
+            while 100 <= status < 200 and status != 101:
+                status, headers = await _read_head(reader)  # 跳过 103 Early Hints 等中间响应
+            size, reuse = await _read_body(reader, status, headers, sink, self.chunk_size)
+            if headers.get("connection", "").lower() == "close":
+                reuse = False
+            return status, size
+        finally:
+            pool.release(conn, reuse)
+
+    async def fetch(self, url, dest=None):
+        """
+        抓取一个 URL
+
+        参数:
+            url: http:// 或 https:// 地址
+            dest: 保存响应体的文件路径；None 表示只计数不保存
+
+        返回:
+            AsyncFetchResult（不会抛出网络异常，错误记录在 error 中）
+        """
+        if self._limit is None:
+            self._limit = asyncio.Semaphore(self.concurrency)
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https"):
+            return AsyncFetchResult(url, error=ValueError(f"不支持的 URL: {url}"))
+
+        loop = asyncio.get_running_loop()
+        result = AsyncFetchResult(url)
+        start = time.perf_counter()
+        async with self._limit:
+            while True:
+                result.attempts += 1
+                file = open(dest + ".part", "wb") if dest else None
+                sink = _discard
+                if file is not None:
+                    async def sink(block, write=file.write):
+                        # 在线程池里写文件；写完这一块才会继续读 socket
+                        await loop.run_in_executor(None, write, block)
+                try:
+                    status, size = await asyncio.wait_for(self._attempt(parts, sink), self.timeout)
+                    error = None
+                except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError, ValueError) as e:
+                    status, size, error = None, 0, e
+                finally:
+                    if file is not None:
+                        file.close()
+
+                retry = error is not None or status in RETRY_STATUSES
+                if not retry or result.attempts > self.retries:
+                    break
+                await asyncio.sleep(min(self.backoff * 2 ** (result.attempts - 1), self.max_backoff))
+
+        result.status, result.size, result.error = status, size, error
+        result.elapsed = time.perf_counter() - start
+        if dest:
+            if error is None:
+                os.replace(dest + ".part", dest)
+                result.path = dest
+            else:
+                os.remove(dest + ".part")
+        return result
+
+    async def fetch_many(self, urls, dest_dir=None, filename=None):
+        """
+        并发抓取多个 URL
+
+        参数:
+            urls: URL 的可迭代对象（可以是生成器，不必一次性放进内存）
+            dest_dir: 保存目录；None 表示只计数不保存
+            filename: filename(url, index) -> 文件名，默认用 6 位序号
+
+        返回:
+            list[AsyncFetchResult]，与 urls 顺序一致
+        """
+        if dest_dir:
+            os.makedirs(dest_dir, exist_ok=True)
+        results = []
+        pending = enumerate(urls)
+
+        async def worker():
+            # 固定数量的 worker 从同一个迭代器取任务：
+            # 不会为 1 万个 URL 一次性创建 1 万个 task
+            for index, url in pending:
+                dest = None
+                if dest_dir:
+                    name = filename(url, index) if filename else f"{index:06d}"
+                    dest = os.path.join(dest_dir, name)
+                results.append((index, await self.fetch(url, dest)))
+
+        await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+        results.sort(key=lambda item: item[0])
+        return [result for _, result in results]
+
+    def close(self):
+        """关闭所有空闲连接，返回被关闭的 StreamWriter 列表"""
+        writers = []
+        for pool in self._pools.values():
+            writers += pool.close()
+        self._pools.clear()
+        return writers
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        writers = self.close()
+        await asyncio.gather(*(w.wait_closed() for w in writers), return_exceptions=True)
+
+
+def fetch_all(urls, dest_dir=None, **options):
+    """同步入口：在新的事件循环里运行 AsyncFetcher.fetch_many"""
+    async def run():
+        async with AsyncFetcher(**options) as fetcher:
+            return await fetcher.fetch_many(urls, dest_dir)
+    return asyncio.run(run())
+
+
+# ========== 模拟服务端 ==========
+
+_BLOCK = bytes(range(256)) * 256  # 64 KiB
+
+
+async def start_stub_server(latency=0.0, jitter=0.0, error_rate=0.0, reset_rate=0.0,
+                            body_size=1024, seed=0):
+    """
+    启动一个本地 asyncio HTTP/1.1 服务（keep-alive）
+
+    参数:
+        latency: 每个请求固定延迟（秒）
+        jitter: 额外的随机延迟上限（秒）
+        error_rate: 返回 500 的概率
+        reset_rate: 直接断开连接的概率
+        body_size: 默认响应体大小；请求参数 ?size=N 可以覆盖，?chunked=1 使用 chunked 编码，
+                   ?close=1 不带长度、发完后关闭连接，?status=N 返回没有响应体的状态码（如 204）
+        seed: 随机数种子
+
+    返回:
+        (server, base_url, stats)；stats 是按结果计数的 Counter
+    """
+    rng = random.Random(seed)
+    stats = Counter()
+
+    async def send_body(writer, size, chunked):
+        while size:
+            block = _BLOCK[:min(size, len(_BLOCK))]
+            size -= len(block)
+            if chunked:
+                writer.write(b"%x\r\n%s\r\n" % (len(block), block))
+            else:
+                writer.write(block)
+            await writer.drain()  # 客户端读得慢时在这里等待
+        if chunked:
+            writer.write(b"0\r\n\r\n")
+
+    async def handle(reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                query = parse_qs(urlsplit(line.split()[1].decode()).query)
+                size = int(query.get("size", [body_size])[0])
+                chunked = "chunked" in query
+                close = "close" in query
+
+                delay = latency + rng.uniform(0, jitter)
+                if delay:
+                    await asyncio.sleep(delay)
+                roll = rng.random()
+                if roll < reset_rate:
+                    stats["reset"] += 1
+                    writer.transport.abort()
+                    return
+                if roll < reset_rate + error_rate:
+                    stats["500"] += 1
+                    writer.write(b"HTTP/1.1 500 Internal Server Error\r\n"
+                                 b"Content-Length: 5\r\n\r\nerror")
+                    await writer.drain()
+                    continue
+
+                if "status" in query:
+                    # 没有响应体、也不带 Content-Length 的响应，连接保持打开
+                    status = int(query["status"][0])
+                    stats[str(status)] += 1
+                    writer.write(b"HTTP/1.1 %d No Body\r\n\r\n" % status)
+                    await writer.drain()
+                    continue
+
+                stats["200"] += 1
+                head = b"HTTP/1.1 200 OK\r\nContent-Type: application/octet-stream\r\n"
+                if chunked:
+                    head += b"Transfer-Encoding: chunked\r\n\r\n"
+                elif close:
+                    head += b"Connection: close\r\n\r\n"
+                else:
+                    head += b"Content-Length: %d\r\n\r\n" % size
+                writer.write(head)
+                await send_body(writer, size, chunked)
+                if close:
+                    await writer.drain()
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass  # 客户端断开，或事件循环结束时取消了仍在等待的连接
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0, backlog=4096)
+    port = server.sockets[0].getsockname()[1]
+    return server, f"http://127.0.0.1:{port}", stats
+
+
+async def _demo(args):
+    import tempfile
+    import tracemalloc
+
+    print("=" * 60)
+    print("1. 注入错误：5% 返回 500，2% 直接断开连接")
+    print("=" * 60)
+
+    server, base, stats = await start_stub_server(latency=0.002, error_rate=0.05, reset_rate=0.02)
+    async with server:
+        async with AsyncFetcher(concurrency=50, per_host=20, retries=4, backoff=0.01) as fetcher:
+            results = await fetcher.fetch_many(f"{base}/item/{i}" for i in range(1000))
+    ok = sum(r.ok for r in results)
+    print(f"  成功 {ok}/{len(results)}，总尝试次数 {sum(r.attempts for r in results)}")
+    print(f"  服务端: 200 x {stats['200']}，500 x {stats['500']}，断开 x {stats['reset']}")
+    assert [r.url for r in results] == [f"{base}/item/{i}" for i in range(1000)]
+
+    print()
+
+    print("=" * 60)
+    print(f"2. 并发上限：{args.urls} 个 URL，服务端延迟 {args.latency} ms")
+    print("=" * 60)
+
+    server, base, _ = await start_stub_server(latency=args.latency / 1000, jitter=args.latency / 1000)
+    async with server:
+        urls = [f"{base}/item/{i}" for i in range(args.urls)]
+        for concurrency, per_host in [(10, 10), (100, 100), (1000, 1000), (1000, 50)]:
+            start = time.perf_counter()
+            async with AsyncFetcher(concurrency=concurrency, per_host=per_host) as fetcher:
+                results = await fetcher.fetch_many(urls)
+            seconds = time.perf_counter() - start
+            assert all(r.ok for r in results)
+            print(f"  concurrency={concurrency:<5} per_host={per_host:<5}"
+                  f"{seconds:>8.2f}s{len(urls) / seconds:>10.0f} 请求/秒")
+
+    print()
+
+    print("=" * 60)
+    print("3. 流式写盘：20 个 4 MiB 响应，内存峰值")
+    print("=" * 60)
+
+    size = 4 * 1024 * 1024
+    server, base, _ = await start_stub_server(body_size=size)
+    async with server:
+        with tempfile.TemporaryDirectory() as tmp:
+            urls = [f"{base}/file/{i}" + ("?chunked=1" if i % 2 else "") for i in range(20)]
+            tracemalloc.start()
+            async with AsyncFetcher(concurrency=10, per_host=10) as fetcher:
+                results = await fetcher.fetch_many(urls, dest_dir=tmp)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            assert all(r.ok and os.path.getsize(r.path) == size for r in results)
+            total = sum(r.size for r in results)
+            print(f"  下载 {total / 2 ** 20:.0f} MiB，Python 内存峰值 {peak / 2 ** 20:.1f} MiB")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="asyncio 批量抓取基准测试（本地模拟服务端）")
+    parser.add_argument("--urls", type=int, default=2000, help="URL 数量（默认 2000）")
+    parser.add_argument("--latency", type=float, default=20.0,
+                        help="服务端每个请求的模拟延迟（毫秒，另加同样大小的随机抖动，默认 20）")
+    args = parser.parse_args(argv)
+
+    asyncio.run(_demo(args))
+
+    print()
+    print("=" * 60)
+    print("异步批量抓取演示完成！")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
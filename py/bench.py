@@ -0,0 +1,363 @@
+"""
+============================================================================
+微基准测试套件（bench.py）- func.py / for.py / if.py 的性能基线
+============================================================================
+
+📚 核心总结：
+-----------
+覆盖教程里的核心函数和代码片段：
+   func.py   factorial、sum_numbers、apply_operation、process_students、create_profile
+   if.py     check_weather、get_grade、all_passed / any_excellent
+   for.py    total_and_average、find_max、square_all / even_squares
+   var.py    f-string、.format()、+ 拼接三种字符串格式化
+
+每个用例：
+1. 按多个输入规模（size）分别测量
+2. 先预热（warmup）几轮，再重复测量 repeat 次
+3. 每次测量自动决定循环次数，让单次测量至少持续 min_time 秒（类似 timeit）
+4. 统计每次调用耗时的中位数、四分位距（IQR）、最小值
+5. 单独用 tracemalloc 跑一次，记录内存峰值（tracemalloc 会拖慢计时，所以不和计时混在一起）
+
+结果写成 JSON，可以保存为基线；下次运行时指定 --baseline，
+任何用例的中位数比基线慢超过 --threshold（默认 10%）时退出码为 1，可以直接接入 CI。
+
+🔑 用法：
+-------
+   python bench.py --list                           # 列出所有用例
+   python bench.py                                  # 运行全部用例
+   python bench.py -k factorial -k weather          # 只运行名字包含关键字的用例
+   python bench.py --json base.json                 # 保存基线
+   python bench.py --baseline base.json --threshold 0.15
+
+⚠️ 注意：
+--------
+1. check_weather 每次调用都会 print，计时期间 stdout 被重定向到空设备，
+   测到的是"判断 + 格式化输出"的开销
+2. 用例直接调用 load("for") / load("if") 里各小节用到的函数，不另写一份循环，
+   教程代码改了，基准测的就是改过的代码
+3. 微基准对机器负载很敏感；CI 中比较时建议在同一台机器上生成基线
+
+============================================================================
+"""
+
+import argparse
+import contextlib
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+
+from demo_runner import NullWriter, load
+
+func = load("func")
+if_demo = load("if")
+for_demo = load("for")
+
+
+@dataclass
+class Case:
+    """一个基准用例：setup(size) 返回 (run, args)，计时的是 run(*args)"""
+
+    name: str
+    setup: object
+    sizes: tuple
+
+
+CASES = {}
+
+
+def case(name, sizes):
+    """注册用例的装饰器：被装饰的函数是 setup(size)，返回 (run, args)"""
+    def register(setup):
+        CASES[name] = Case(name, setup, tuple(sizes))
+        return setup
+    return register
+
+
+def _students(n, seed=0):
+    rng = random.Random(seed)
+    return [{"name": f"学生{i}", "score": rng.randint(0, 100), "age": rng.randint(17, 23)}
+            for i in range(n)]
+
+
+def _scores(n, seed=0):
+    rng = random.Random(seed)
+    return [rng.randint(0, 100) for _ in range(n)]
+
+
+# ========== func.py ==========
+
+@case("func.factorial", sizes=(10, 100, 500))
+def _factorial(n):
+    return func.factorial, (n,)
+
+
+@case("func.sum_numbers", sizes=(10, 1_000, 100_000))
+def _sum_numbers(n):
+    return (lambda nums: func.sum_numbers(*nums)), (list(range(n)),)
+
+
+@case("func.apply_operation", sizes=(100, 10_000))
+def _apply_operation(n):
+    def run(xs, apply=func.apply_operation, op=func.add_op):
+        for x in xs:
+            apply(x, 3, op)
+    return run, (list(range(n)),)
+
+
+@case("func.process_students", sizes=(100, 10_000, 100_000))
+def _process_students(n):
+    def run(students):
+        return func.process_students(students, filter_func=lambda s: s["score"] >= 80,
+                                     sort_func=lambda s: s["score"])
+    return run, (_students(n),)
+
+
+@case("func.create_profile", sizes=(1_000, 10_000, 100_000))
+def _create_profile(n):
+    def run(fields):
+        return func.create_profile(**fields)
+    return run, ({f"field_{i}": i for i in range(n)},)
+
+
+# ========== if.py ==========
+
+@case("if.check_weather", sizes=(100, 10_000))
+def _check_weather(n):
+    rng = random.Random(0)
+    inputs = [(rng.randint(-5, 35), rng.random() < 0.5, rng.random() < 0.3) for _ in range(n)]
+
+    def run(inputs, check=if_demo.check_weather):
+        with contextlib.redirect_stdout(NullWriter()):
+            for temp, is_sunny, is_weekend in inputs:
+                check(temp, is_sunny, is_weekend)
+    return run, (inputs,)
+
+
+@case("if.grade_chain", sizes=(100, 10_000, 1_000_000))
+def _grade_chain(n):
+    def run(scores, grade=if_demo.get_grade):
+        return [grade(score) for score in scores]
+    return run, (_scores(n),)
+
+
+@case("if.all_any", sizes=(100, 10_000, 1_000_000))
+def _all_any(n):
+    # 全部及格、没有优秀：all() 和 any() 都必须扫完整个列表
+    scores = [60 + s % 30 for s in _scores(n)]
+
+    def run(scores):
+        return if_demo.all_passed(scores), if_demo.any_excellent(scores)
+    return run, (scores,)
+
+
+# ========== for.py ==========
+
+@case("for.total_average", sizes=(100, 10_000, 1_000_000))
+def _total_average(n):
+    return for_demo.total_and_average, (_scores(n),)
+
+
+@case("for.max_loop", sizes=(100, 10_000, 1_000_000))
+def _max_loop(n):
+    return for_demo.find_max, (_scores(n),)
+
+
+@case("for.squares", sizes=(1_000, 100_000, 1_000_000))
+def _squares(n):
+    return for_demo.square_all, (list(range(n)),)
+
+
+@case("for.even_squares", sizes=(1_000, 100_000, 1_000_000))
+def _even_squares(n):
+    return for_demo.even_squares, (list(range(n)),)
+
+
+# ========== var.py：字符串格式化 ==========
+
+@case("str.fstring", sizes=(100, 10_000))
+def _fstring(n):
+    def run(students):
+        return [f"姓名: {s['name']}, 分数: {s['score']}" for s in students]
+    return run, (_students(n),)
+
+
+@case("str.format", sizes=(100, 10_000))
+def _format(n):
+    def run(students):
+        return ["姓名: {}, 分数: {}".format(s["name"], s["score"]) for s in students]
+    return run, (_students(n),)
+
+
+@case("str.concat", sizes=(100, 10_000))
+def _concat(n):
+    def run(students):
+        return ["姓名: " + s["name"] + ", 分数: " + str(s["score"]) for s in students]
+    return run, (_students(n),)
+
+
+# ========== 测量 ==========
+
+def _calibrate(run, args, min_time):
+    """找到让一次测量至少持续 min_time 秒的循环次数"""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            run(*args)
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return number
+        number *= 2 if elapsed == 0 else max(2, min(10, int(min_time / elapsed * 1.2) + 1))
+
+
+def measure(case, size, repeat=7, warmup=2, min_time=0.02):
+    """
+    测量一个用例在一个规模下的耗时和内存峰值
+
+    返回:
+        dict: name、size、median、q1、q3、iqr、min、mean（都是每次调用的秒数）、
+              number（每次测量的循环次数）、repeat、peak_bytes
+    """
+    run, args = case.setup(size)
+    for _ in range(warmup):
+        run(*args)
+    number = _calibrate(run, args, min_time)
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            run(*args)
+        samples.append((time.perf_counter() - start) / number)
+
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        run(*args)
+        peak = tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        tracemalloc.stop()
+
+    q1, median, q3 = statistics.quantiles(samples, n=4) if len(samples) > 1 else samples * 3
+    return {
+        "name": case.name,
+        "size": size,
+        "median": median,
+        "q1": q1,
+        "q3": q3,
+        "iqr": q3 - q1,
+        "min": min(samples),
+        "mean": statistics.fmean(samples),
+        "number": number,
+        "repeat": repeat,
+        "peak_bytes": peak,
+    }
+
+
+def select(keywords=None):
+    """按关键字筛选用例；没有关键字时返回全部"""
+    if not keywords:
+        return list(CASES.values())
+    return [c for c in CASES.values() if any(k in c.name for k in keywords)]
+
+
+def run_suite(cases, repeat=7, warmup=2, min_time=0.02, progress=None):
+    """运行一组用例，返回 JSON 报告"""
+    results = []
+    for c in cases:
+        for size in c.sizes:
+            result = measure(c, size, repeat, warmup, min_time)
+            results.append(result)
+            if progress:
+                progress(result)
+    return {
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def compare(baseline, report, threshold=0.10):
+    """
+    和基线比较中位数
+
+    返回:
+        list: [(name, size, 基线中位数, 当前中位数, 变化比例), ...]，只包含变慢超过阈值的用例
+    """
+    base = {(r["name"], r["size"]): r["median"] for r in baseline["results"]}
+    regressions = []
+    for r in report["results"]:
+        old = base.get((r["name"], r["size"]))
+        if old and r["median"] > old * (1 + threshold):
+            regressions.append((r["name"], r["size"], old, r["median"], r["median"] / old - 1))
+    return regressions
+
+
+def _format_seconds(seconds):
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def _print_row(r):
+    print(f"  {r['name']:<22}{r['size']:>10}{_format_seconds(r['median']):>12}"
+          f"{_format_seconds(r['iqr']):>12}{r['peak_bytes'] / 1024:>12.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="func.py / for.py / if.py 微基准测试")
+    parser.add_argument("-k", dest="keywords", action="append", help="只运行名字包含关键字的用例")
+    parser.add_argument("--list", action="store_true", help="列出所有用例")
+    parser.add_argument("--repeat", type=int, default=7, help="每个规模测量几次（默认 7）")
+    parser.add_argument("--warmup", type=int, default=2, help="预热次数（默认 2）")
+    parser.add_argument("--min-time", type=float, default=0.02,
+                        help="单次测量的最短时间（秒，默认 0.02）")
+    parser.add_argument("--json", metavar="PATH", help="把结果写入 JSON 文件")
+    parser.add_argument("--baseline", metavar="PATH", help="与基线 JSON 比较")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="中位数变慢超过这个比例视为回归（默认 0.10）")
+    args = parser.parse_args(argv)
+
+    cases = select(args.keywords)
+    if args.list:
+        for c in cases:
+            print(f"  {c.name:<22} sizes={list(c.sizes)}")
+        return 0
+
+    print("=" * 60)
+    print("微基准测试（每次调用耗时）")
+    print("=" * 60)
+    print(f"  {'用例':<20}{'size':>10}{'中位数':>10}{'IQR':>12}{'峰值 KiB':>10}")
+    report = run_suite(cases, args.repeat, args.warmup, args.min_time, progress=_print_row)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print()
+        print(f"  结果已写入 {args.json}")
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare(baseline, report, args.threshold)
+    print()
+    if not regressions:
+        print(f"  ✅ 没有用例比基线慢 {args.threshold:.0%} 以上")
+        return 0
+    for name, size, old, new, change in regressions:
+        print(f"  ❌ {name} (size={size}): {_format_seconds(old)} -> {_format_seconds(new)} "
+              f"(+{change:.0%})")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
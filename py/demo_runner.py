@@ -0,0 +1,116 @@
+"""
+============================================================================
+演示小节运行器（Demo Runner）
+============================================================================
+
+📚 核心总结：
+-----------
+var.py、for.py、if.py、func.py、import.py 的每个演示小节都是一个函数，
+并登记在模块的 SECTIONS 列表里；import 这些模块不会运行任何演示。
+本模块负责发现这些小节并按需运行。
+
+🔑 用法：
+-------
+   python demo_runner.py                 # 列出所有模块和小节
+   python demo_runner.py if              # 运行 if.py 的全部小节
+   python demo_runner.py if 3 14         # 只运行 if.py 的第 3、14 小节
+   python demo_runner.py --all           # 依次运行所有模块
+   IMBER_METRICS=json:m.json python demo_runner.py func
+                                         # 同时记录函数埋点（见 metrics.py）
+
+⚠️ 注意：
+--------
+for、if、import 都是 Python 关键字，不能写 `import if`，
+这里统一用 importlib.import_module("if") 导入。
+
+============================================================================
+"""
+
+import argparse
+import importlib
+
+# 按教程顺序排列的演示模块
+DEMO_MODULES = ["var", "for", "if", "func", "import"]
+
+
+def load(module_name):
+    """导入一个演示模块（支持 for/if/import 这类关键字模块名）"""
+    return importlib.import_module(module_name)
+
+
+class NullWriter:
+    """丢弃所有输出的 stdout 替身：contextlib.redirect_stdout(NullWriter())"""
+
+    def write(self, text):
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+def discover(module_name):
+    """
+    返回模块中的所有小节
+
+    返回:
+        list: [(编号, 标题, 函数), ...]，编号从 1 开始
+    """
+    module = load(module_name)
+    sections = []
+    for number, func in enumerate(module.SECTIONS, start=1):
+        title = (func.__doc__ or func.__name__).strip().splitlines()[0]
+        sections.append((number, title, func))
+    return sections
+
+
+def finish(module_name):
+    """打印模块 main() 在所有小节之后输出的结尾横幅；模块没有定义 finish() 时什么都不做"""
+    finish = getattr(load(module_name), "finish", None)
+    if finish is not None:
+        finish()
+
+
+def run(module_name, numbers=None):
+    """运行一个模块的全部小节，或者只运行指定编号的小节"""
+    if not numbers:
+        load(module_name).main()
+        return
+    sections = {number: func for number, _, func in discover(module_name)}
+    for number in numbers:
+        if number not in sections:
+            raise SystemExit(f"{module_name}.py 没有第 {number} 小节（共 {len(sections)} 个）")
+        sections[number]()
+
+
+def list_sections():
+    for module_name in DEMO_MODULES:
+        print(f"{module_name}.py")
+        for number, title, func in discover(module_name):
+            print(f"  {number:>2}. {func.__name__:<14} {title}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="运行 py/ 下的演示小节")
+    parser.add_argument("module", nargs="?", choices=DEMO_MODULES, help="演示模块")
+    parser.add_argument("sections", nargs="*", type=int, help="小节编号，默认全部")
+    parser.add_argument("--all", action="store_true", help="依次运行所有模块")
+    args = parser.parse_args(argv)
+
+    # 设置了 IMBER_METRICS 时开启埋点（metrics 导入了本模块，所以在这里导入）
+    import metrics
+    metrics.enable_from_env()
+
+    from output_sink import install
+
+    with install():  # 输出到文件、管道时按大块缓冲
+        if args.all:
+            for module_name in DEMO_MODULES:
+                run(module_name)
+        elif args.module:
+            run(args.module, args.sections)
+        else:
+            list_sections()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+"""
+============================================================================
+事件路由器（Event Router）- 批量版的 match status
+============================================================================
+
+📚 核心总结：
+-----------
+if.py 第 14 节用 match...case 处理单个 status。
+每秒要路由几百万个状态事件时，逐个 match 再逐个调用处理函数，
+函数调用本身就成了主要开销。
+
+EventRouter 的做法：
+1. 注册阶段把 status -> handler 编译成一个字典（分发表），查找 O(1)
+2. 一次接收一批事件，先按 handler 分组
+3. 每个 handler 每批只调用一次，参数是属于它的事件列表
+4. 记录每个 status 的事件数，以及每个 handler 的调用耗时直方图
+5. 没有匹配的 status 交给默认 handler（相当于 case _）
+
+🔑 与 match...case 的对应关系：
+-----------------------------
+   match status:                       router = EventRouter(default=on_unknown)
+       case "success": on_success()    router.add_route("success", on_success)
+       case "error":   on_error()      router.add_route("error", on_error)
+       case _:         on_unknown()    router.dispatch_batch(events)
+
+⚠️ 注意：
+--------
+1. handler 的签名是 handler(events)，接收的是一个列表
+2. 同一个 handler 可以注册到多个 status，同一批里也只调用一次
+3. 没有设置默认 handler 时，未匹配的事件只计数、不处理
+4. 计数在 handler 成功返回后才更新；handler 抛异常时，它的事件不计数
+5. latency 以 handler 对象为键，stats() 里的键也是 handler 本身
+
+============================================================================
+"""
+
+import time
+from collections import Counter
+
+
+class LatencyHistogram:
+    """
+    耗时直方图：按 2 的幂划分桶（单位纳秒），
+    记录开销固定，分位数的相对误差不超过 2 倍。
+    """
+
+    def __init__(self):
+        self.buckets = Counter()
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds):
+        ns = int(seconds * 1e9)
+        self.buckets[ns.bit_length()] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, p):
+        """返回第 p 百分位（0-100）所在桶的上界，单位秒"""
+        if not self.count:
+            return 0.0
+        target = self.count * p / 100
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= target:
+                return (1 << bucket) / 1e9
+        return self.max
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.percentile(50),
+            "p99": self.percentile(99),
+            "max": self.max,
+        }
+
+
+def _drop(events):
+    """默认 handler：什么都不做"""
+
+
+class EventRouter:
+    """status -> handler 的批量分发器"""
+
+    def __init__(self, default=None, key=None):
+        """
+        参数:
+            default: 未匹配 status 的处理函数（相当于 case _）
+            key: 从事件中取出 status 的函数；为 None 时事件本身就是 status
+        """
+        self._table = {}
+        self._default = default or _drop
+        self._key = key
+        self.counts = Counter()
+        self.latency = {}
+
+    def add_route(self, status, handler):
+        """注册一个 status 的处理函数"""
+        self._table[status] = handler
+        return handler
+
+    def route(self, *statuses):
+        """
+        装饰器形式的注册
+
+            @router.route("error", "timeout")
+            def on_error(events): ...
+        """
+        def decorator(handler):
+            for status in statuses:
+                self.add_route(status, handler)
+            return handler
+        return decorator
+
+    def dispatch(self, event):
+        """分发单个事件"""
+        self.dispatch_batch([event])
+
+    def dispatch_batch(self, events):
+        """
+        分发一批事件：按 handler 分组，每个 handler 只调用一次
+
+        参数:
+            events: 事件的可迭代对象（生成器也可以，会先转成列表）
+
+        返回:
+            dict: {handler: 本批分到的事件数}
+
+        某个 handler 抛出异常时，异常直接向上传播：
+        已经成功返回的 handler 的事件已计数，抛异常的 handler 和
+        排在它之后、还没调用的 handler 的事件都不计数，也不记录耗时。
+        """
+        events = list(events)
+        table_get = self._table.get
+        default = self._default
+        key = self._key
+        groups = {}  # {handler: (事件列表, status 列表)}
+
+        if key:
+            for event in events:
+                status = key(event)
+                handler = table_get(status, default)
+                group = groups.get(handler)
+                if group is None:
+                    groups[handler] = group = ([], [])
+                group[0].append(event)
+                group[1].append(status)
+        else:
+            for status in events:
+                handler = table_get(status, default)
+                group = groups.get(handler)
+                if group is None:
+                    groups[handler] = group = ([], None)
+                group[0].append(status)
+
+        for handler, (batch, statuses) in groups.items():
+            start = time.perf_counter()
+            handler(batch)
+            elapsed = time.perf_counter() - start
+            self.counts.update(batch if statuses is None else statuses)
+            hist = self.latency.get(handler)
+            if hist is None:
+                self.latency[handler] = hist = LatencyHistogram()
+            hist.record(elapsed)
+
+        return {handler: len(batch) for handler, (batch, _) in groups.items()}
+
+    def stats(self):
+        """返回计数和耗时统计；耗时按 handler 对象区分，同名的 handler 不会合并"""
+        return {
+            "counts": dict(self.counts),
+            "latency": {handler: h.summary() for handler, h in self.latency.items()},
+        }
+
+
+if __name__ == "__main__":
+    import random
+
+    print("=" * 60)
+    print("1. 注册路由并分发一批事件")
+    print("=" * 60)
+
+    def on_unknown(events):
+        print(f"  未知状态: {len(events)} 个")
+
+    router = EventRouter(default=on_unknown)
+
+    @router.route("success")
+    def on_success(events):
+        print(f"  操作成功: {len(events)} 个")
+
+    @router.route("error", "timeout")
+    def on_error(events):
+        print(f"  操作失败: {len(events)} 个")
+
+    @router.route("pending")
+    def on_pending(events):
+        print(f"  操作进行中: {len(events)} 个")
+
+    router.dispatch_batch(["success", "error", "pending", "timeout", "success", "???"])
+    print(f"  计数: {dict(router.counts)}")
+
+    print()
+
+    print("=" * 60)
+    print("2. 性能对比：逐个 match vs 批量分发")
+    print("=" * 60)
+
+    statuses = ["success", "error", "pending", "timeout", "unknown"]
+    events = [{"status": random.choice(statuses), "id": i} for i in range(1_000_000)]
+    sink = Counter()
+
+    def handle_one(status):
+        sink[status] += 1
+
+    start = time.perf_counter()
+    for event in events:
+        match event["status"]:
+            case "success":
+                handle_one("success")
+            case "error" | "timeout":
+                handle_one("error")
+            case "pending":
+                handle_one("pending")
+            case _:
+                handle_one("unknown")
+    print(f"  逐个 match + 调用: {time.perf_counter() - start:.3f}s")
+
+    def make_handler(name):
+        def handler(batch):
+            sink[name] += len(batch)
+        handler.__name__ = name
+        return handler
+
+    fast = EventRouter(default=make_handler("unknown"), key=lambda e: e["status"])
+    fast.add_route("success", make_handler("success"))
+    fast.add_route("error", fast.add_route("timeout", make_handler("error")))
+    fast.add_route("pending", make_handler("pending"))
+
+    start = time.perf_counter()
+    for i in range(0, len(events), 10_000):
+        fast.dispatch_batch(events[i:i + 10_000])
+    print(f"  批量分发（每批 1 万）: {time.perf_counter() - start:.3f}s")
+
+    for handler, summary in fast.stats()["latency"].items():
+        print(f"  {handler.__name__}: 调用 {summary['count']} 次, p99 {summary['p99'] * 1e6:.0f}µs")
+
+    print()
+    print("=" * 60)
+    print("事件路由演示完成！")
+    print("=" * 60)
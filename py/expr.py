@@ -0,0 +1,369 @@
+"""
+============================================================================
+表达式编译（Expression DSL）- 把 lambda 组合编译成一个函数，列式数据交给 NumPy
+============================================================================
+
+📚 核心总结：
+-----------
+func.py 把很多小 lambda 传给高阶函数：
+
+   apply_operation(2, 3, lambda x, y: x ** y)
+   process_students(students, filter_func=lambda s: s["score"] >= 80,
+                    sort_func=lambda s: s["score"])
+
+每处理一个元素都要调用一次 lambda；把几个 lambda 组合起来
+（lambda s: is_pass(s) and is_young(s)）还要再多几层调用。
+
+本模块用运算符重载搭出表达式树，再生成 Python 源码，用 compile() 编译成一个函数：
+
+   col("score") >= 80                        →  row["score"] >= 80
+   (col("score") >= 60) & (col("age") < 20)  →  (row["score"] >= 60) and (row["age"] < 20)
+   arg(0) ** arg(1)                          →  def f(a0, a1): return a0 ** a1
+
+1. 整个组合只有一次函数调用，字段读取、比较、常量都内联在同一个 code 对象里
+2. filter() / map() 更进一步：把循环也生成进去（列表推导式），每个元素零次函数调用
+3. evaluate(columns)：数据是列式的（{"score": 数组}）时生成 NumPy 版本，
+   & | ~ 变成 np.logical_and / np.logical_or / np.logical_not，abs 变成 np.abs
+4. 生成的 code 对象按源码缓存，同样的表达式重复构造时不会重复编译
+
+🔑 用法：
+-------
+   from expr import col, arg
+
+   passed = (col("score") >= 60) & (col("age") < 20)
+   passed.filter(students)               # [s for s in students if ...]，没有逐元素调用
+   col("score").map(students)            # [s["score"] for s in students]
+   students.sort(key=col("score").function())
+   process_students(students, filter_func=passed)   # 也可以直接当函数用
+
+   power = (arg(0) ** arg(1)).function()  # def f(a0, a1): return a0 ** a1
+   apply_operation(2, 3, power)
+
+   mask = passed.evaluate({"score": scores, "age": ages})   # NumPy 布尔数组
+   print(passed.source())                 # 查看生成的代码
+
+⚠️ 注意：
+--------
+1. 组合条件要用 & | ~，不能用 and / or / not（Python 不允许重载它们）；
+   & 的优先级比 >= 高，每个比较都要加括号
+2. col() 和 arg() 不能出现在同一个表达式里
+3. NumPy 版本使用 NumPy 自己的运算规则（整数溢出回绕、除以 0 得到 inf），
+   需要和 Python 完全一致的整数运算时用 arith_kernel.evaluate
+4. 依赖 NumPy 的只有 evaluate()；其它功能只用标准库
+
+============================================================================
+"""
+
+import math
+
+from lazy_import import lazy_import
+
+np = lazy_import("numpy")
+
+_BINARY = ("+", "-", "*", "/", "//", "%", "**")
+_COMPARE = ("==", "!=", "<", "<=", ">", ">=")
+_LOGICAL = {
+    # 运算: (逐行版本, NumPy 版本)
+    "and": ("({} and {})", "np.logical_and({}, {})"),
+    "or": ("({} or {})", "np.logical_or({}, {})"),
+    "not": ("(not {})", "np.logical_not({})"),
+    "neg": ("(-{})", "(-{})"),
+    "abs": ("abs({})", "np.abs({})"),
+}
+
+_CODE_CACHE = {}  # 生成的源码 -> code 对象
+
+
+def _wrap(value):
+    return value if isinstance(value, Expr) else Expr("const", value)
+
+
+def _binary(op, reverse=False):
+    def method(self, other):
+        other = _wrap(other)
+        return Expr(op, other, self) if reverse else Expr(op, self, other)
+    return method
+
+
+class Expr:
+    """表达式树的节点；用 col() / arg() / lit() 和运算符组合出来"""
+
+    __slots__ = ("op", "args", "_compiled")
+
+    def __init__(self, op, *args):
+        self.op = op
+        self.args = args
+        self._compiled = {}
+
+    # ----- 运算符重载 -----
+
+    __add__, __radd__ = _binary("+"), _binary("+", True)
+    __sub__, __rsub__ = _binary("-"), _binary("-", True)
+    __mul__, __rmul__ = _binary("*"), _binary("*", True)
+    __truediv__, __rtruediv__ = _binary("/"), _binary("/", True)
+    __floordiv__, __rfloordiv__ = _binary("//"), _binary("//", True)
+    __mod__, __rmod__ = _binary("%"), _binary("%", True)
+    __pow__, __rpow__ = _binary("**"), _binary("**", True)
+    __eq__, __ne__ = _binary("=="), _binary("!=")
+    __lt__, __le__ = _binary("<"), _binary("<=")
+    __gt__, __ge__ = _binary(">"), _binary(">=")
+    __and__, __rand__ = _binary("and"), _binary("and", True)
+    __or__, __ror__ = _binary("or"), _binary("or", True)
+    __hash__ = object.__hash__
+
+    def __invert__(self):
+        return Expr("not", self)
+
+    def __neg__(self):
+        return Expr("neg", self)
+
+    def __abs__(self):
+        return Expr("abs", self)
+
+    def __bool__(self):
+        raise TypeError("表达式不能直接当作布尔值；组合条件请用 & | ~，并给每个比较加括号")
+
+    def __repr__(self):
+        return self._emit(_Context("repr"))
+
+    # ----- 代码生成 -----
+
+    def _emit(self, ctx):
+        op, args = self.op, self.args
+        if op == "col":
+            return ctx.field(args[0])
+        if op == "arg":
+            return ctx.arg(args[0])
+        if op == "const":
+            return ctx.const(args[0])
+        if op in _BINARY or op in _COMPARE:
+            return f"({args[0]._emit(ctx)} {op} {args[1]._emit(ctx)})"
+        row, array = _LOGICAL[op]
+        template = array if ctx.mode == "array" else row
+        if ctx.mode == "repr":
+            template = {"and": "({} & {})", "or": "({} | {})", "not": "~{}"}.get(op, template)
+        return template.format(*(a._emit(ctx) for a in args))
+
+    def _build(self, mode, kind):
+        """生成源码并编译，返回 (函数, 源码, 字段名列表)；结果缓存在节点上"""
+        cached = self._compiled.get((mode, kind))
+        if cached is not None:
+            return cached
+        ctx = _Context(mode)
+        body = self._emit(ctx)
+        if ctx.fields and ctx.args:
+            raise ValueError("col() 和 arg() 不能出现在同一个表达式里")
+
+        params = ", ".join(f"a{i}" for i in range(max(ctx.args) + 1)) if ctx.args else ""
+        if mode == "array":
+            name = "_kernel"
+            params = params or ", ".join(ctx.fields.values())
+            source = f"def _kernel({params}):\n    return {body}\n"
+        elif ctx.args:
+            name = "_expr"
+            source = f"def _expr({params}):\n    return {body}\n"
+        elif kind == "filter":
+            name = "_filter"
+            source = f"def _filter(rows):\n    return [row for row in rows if {body}]\n"
+        elif kind == "map":
+            name = "_map"
+            source = f"def _map(rows):\n    return [{body} for row in rows]\n"
+        else:
+            name = "_expr"
+            source = f"def _expr(row):\n    return {body}\n"
+
+        code = _CODE_CACHE.get(source)
+        if code is None:
+            code = _CODE_CACHE[source] = compile(source, f"<expr {self!r}>", "exec")
+        namespace = {"np": np, **ctx.constants}
+        exec(code, namespace)
+        cached = self._compiled[(mode, kind)] = (namespace[name], source, list(ctx.fields))
+        return cached
+
+    # ----- 逐行执行 -----
+
+    def function(self):
+        """编译后的函数：用了 col() 时是 f(row)，用了 arg() 时是 f(a0, a1, ...)"""
+        return self._build("row", "function")[0]
+
+    def __call__(self, *args):
+        return self.function()(*args)
+
+    def filter(self, rows):
+        """返回满足条件的行（循环在生成的代码里，不逐行调用函数）"""
+        return self._build("row", "filter")[0](rows)
+
+    def map(self, rows):
+        """对每一行求值，返回列表"""
+        return self._build("row", "map")[0](rows)
+
+    def source(self, mode="row", kind="function"):
+        """生成的源码，mode 为 "row" 或 "array"，kind 为 "function"、"filter" 或 "map\""""
+        return self._build(mode, kind)[1]
+
+    # ----- 列式执行（NumPy） -----
+
+    def evaluate(self, columns):
+        """
+        对列式数据整体求值
+
+        参数:
+            columns: {字段名: 数组或列表}（col() 表达式），或者数组的列表（arg() 表达式）
+
+        返回:
+            NumPy 数组（条件表达式得到布尔数组，可以直接当掩码）
+        """
+        if np is None:
+            raise ImportError("evaluate() 依赖 NumPy，请先运行: pip install numpy")
+        kernel, _, fields = self._build("array", "function")
+        if isinstance(columns, dict):
+            return kernel(*(np.asarray(columns[name]) for name in fields))
+        return kernel(*(np.asarray(column) for column in columns))
+
+    def filter_columns(self, columns):
+        """返回满足条件的行组成的新列：{字段名: 过滤后的数组}"""
+        mask = self.evaluate(columns)
+        return {name: np.asarray(values)[mask] for name, values in columns.items()}
+
+
+class _Context:
+    """一次代码生成的状态：用到的字段、参数和常量"""
+
+    def __init__(self, mode):
+        self.mode = mode
+        self.fields = {}  # 字段名 -> 变量名（NumPy 版本的参数）
+        self.args = set()
+        self.constants = {}
+
+    def field(self, name):
+        if self.mode == "repr":
+            return f"col({name!r})"
+        if self.mode == "array":
+            if name not in self.fields:
+                self.fields[name] = f"c{len(self.fields)}"
+            return self.fields[name]
+        self.fields.setdefault(name, None)
+        if isinstance(name, (str, int)) and not isinstance(name, bool):
+            return f"row[{name!r}]"
+        return f"row[{self.const(name)}]"
+
+    def arg(self, index):
+        if self.mode == "repr":
+            return f"arg({index})"
+        self.args.add(index)
+        return f"a{index}"
+
+    def const(self, value):
+        # 字面量直接写进源码（编译器可以常量折叠），其它对象放进命名空间
+        if value is None or isinstance(value, (bool, str)):
+            return repr(value)
+        if isinstance(value, int) or (isinstance(value, float) and math.isfinite(value)):
+            # 负数要加括号：-5 ** a0 会被解析成 -(5 ** a0)；-0.0 同理
+            return f"({value!r})" if math.copysign(1, value) < 0 else repr(value)
+        if self.mode == "repr":
+            return repr(value)
+        name = f"_k{len(self.constants)}"
+        self.constants[name] = value
+        return name
+
+
+def col(name):
+    """读取一行中的字段：row[name]"""
+    return Expr("col", name)
+
+
+def arg(index):
+    """函数的第 index 个位置参数"""
+    return Expr("arg", index)
+
+
+def lit(value):
+    """常量"""
+    return Expr("const", value)
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    from demo_runner import load
+
+    func = load("func")
+
+    def timed(f, *args, repeat=5):
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = f(*args)
+            best = min(best, time.perf_counter() - start)
+        return result, best
+
+    rng = random.Random(0)
+    students = [{"name": f"学生{i}", "score": rng.randint(0, 100), "age": rng.randint(17, 23)}
+                for i in range(1_000_000)]
+
+    print("=" * 60)
+    print("1. process_students：lambda vs 编译后的表达式（100 万个学生）")
+    print("=" * 60)
+
+    high = col("score") >= 80
+    print(high.source(kind="filter"))
+
+    expected, lam = timed(lambda: func.process_students(
+        students, filter_func=lambda s: s["score"] >= 80, sort_func=lambda s: s["score"]))
+    _, compiled = timed(lambda: func.process_students(
+        students, filter_func=high.function(), sort_func=col("score").function()))
+    result, fused = timed(lambda: sorted(high.filter(students), key=col("score").function()))
+    assert result == expected
+    print(f"  lambda:                         {lam * 1e3:.0f} ms")
+    print(f"  编译后的函数代替 lambda:        {compiled * 1e3:.0f} ms")
+    print(f"  filter() 融合循环 + 编译的 key: {fused * 1e3:.0f} ms")
+
+    print()
+
+    print("=" * 60)
+    print("2. 组合条件：嵌套 lambda vs 一个 code 对象")
+    print("=" * 60)
+
+    is_pass = lambda s: s["score"] >= 60
+    is_young = lambda s: s["age"] < 20
+    combined = lambda s: is_pass(s) and is_young(s)
+    expr = (col("score") >= 60) & (col("age") < 20)
+
+    expected, nested = timed(lambda: [s for s in students if combined(s)])
+    expr_func = expr.function()
+    _, compiled = timed(lambda: [s for s in students if expr_func(s)])
+    result, fused = timed(expr.filter, students)
+    assert result == expected
+    print(f"  嵌套 lambda（每个元素 3 次调用）: {nested * 1e3:.0f} ms")
+    print(f"  编译后的函数（每个元素 1 次调用）: {compiled * 1e3:.0f} ms")
+    print(f"  filter() 融合（每个元素 0 次调用）: {fused * 1e3:.0f} ms")
+
+    print()
+
+    print("=" * 60)
+    print("3. apply_operation：arg(0) ** arg(1)")
+    print("=" * 60)
+
+    power = (arg(0) ** arg(1)).function()
+    print(f"  apply_operation(2, 10, power) = {func.apply_operation(2, 10, power)}")
+    print((arg(0) ** arg(1)).source())
+
+    print("=" * 60)
+    print("4. 列式数据：同一个表达式生成 NumPy 版本")
+    print("=" * 60)
+
+    columns = {"score": np.array([s["score"] for s in students]),
+               "age": np.array([s["age"] for s in students])}
+    print(expr.source("array"))
+    mask, vectorized = timed(expr.evaluate, columns)
+    assert int(mask.sum()) == len(expected)
+    print(f"  NumPy: {vectorized * 1e3:.1f} ms（{int(mask.sum())} 人满足条件），"
+          f"比 filter() 快 {fused / vectorized:.0f} 倍")
+    curve = (col("score") * 0.6 + 40).evaluate(columns)
+    print(f"  (score * 0.6 + 40) 平均值: {curve.mean():.2f}")
+
+    print()
+    print("=" * 60)
+    print("表达式编译演示完成！")
+    print("=" * 60)
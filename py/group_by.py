@@ -0,0 +1,402 @@
+"""
+============================================================================
+分组聚合（Group By）- 键编码成整数 + np.bincount 向量化聚合，可分块流式处理
+============================================================================
+
+📚 核心总结：
+-----------
+func.py 里的学生字典、for.py 里的 person 字典都带有可以分组的字段（age、city）。
+"每个年龄的平均分""每个城市的人数"用纯 Python 写是这样：
+
+   totals = {}
+   for s in students:
+       totals.setdefault(s["age"], []).append(s["score"])
+
+几千万条记录时，每条记录都要做几次字典查找和方法调用，非常慢。
+
+分组聚合分两步：
+1. 编码（factorize）：把分组键变成 0..G-1 的整数编号
+   - 字符串等对象：哈希表（dict）编码，只在不同的键第一次出现时分配编号
+   - 范围不大的整数（年龄、班级号）：直接减去最小值当作编号，O(n)
+   - 其它数值：np.unique
+   - 多个键 (city, age)：每个字段分别编码，再组合成一个整数；
+     各字段不同值个数的乘积超过 int64 时，每合并一个字段就重新编码一次，避免回绕
+2. 聚合：有了编号，每种聚合都是一次向量化运算
+   - count：np.bincount(codes)
+   - sum：np.bincount(codes, weights=values)
+   - min / max：np.minimum.at / np.maximum.at
+   - mean = sum / count
+
+流式处理：数据按块（chunk）送进来，每块先在块内聚合，再按分组键累加到全局结果。
+分组键到编号的映射是全局的，内存只和"分组数"有关，和记录数无关。
+两个 GroupBy（例如两个进程各处理一半数据）可以用 merge() 合并。
+
+🔑 用法：
+-------
+   from group_by import GroupBy, group_by
+
+   g = GroupBy("age", value="score")
+   g.update({"age": ages, "score": scores})       # 列式数据（数组或列表）
+   g.update(students)                             # 也可以是字典列表
+   g.result()            # {18: {"count": ..., "sum": ..., "mean": ..., "min": ..., "max": ...}}
+
+   g = group_by(read_records(), ["city", "age"], "score", chunk_size=100_000)  # 流式
+   total = part1.merge(part2)
+
+⚠️ 注意：
+--------
+1. 数值统一按 float64 累加；没有 value 字段时只统计 count
+2. np.minimum.at 在 NumPy 1.25 之前很慢，建议使用较新的 NumPy
+3. result() 排序时 NaN、None 排在最后（键里混有 None 也能排序）；
+   键的类型不能互相比较（例如 1 和 "a"）时保持第一次出现的顺序
+4. 列表里的值类型不一致（例如 [1, "a"]）时按对象哈希编码，不会被 NumPy 统一转成字符串
+5. 所有 NaN 都算作同一个分组（包括分布在不同块里的 NaN）
+6. 依赖 NumPy
+
+============================================================================
+"""
+
+import math
+from itertools import islice
+
+from lazy_import import lazy_import
+
+np = lazy_import("numpy")
+if np is None:
+    raise ImportError("group_by 依赖 NumPy，请先运行: pip install numpy")
+
+DENSE_LIMIT = 1 << 20  # 整数键的取值范围不超过它时，直接用"值 - 最小值"当编号
+_INT64_LIMIT = 2 ** 63  # 组合编号的上限
+_NAN = float("nan")  # 所有 NaN 键都换成这一个对象：nan != nan，但 dict 查找先比较身份
+_ARRAY_TYPES = (int, float, bool)  # 列表里只有其中一种类型时才交给 NumPy 编码
+
+
+def _canonical(key):
+    """NaN 换成 _NAN（元组键逐个字段处理）"""
+    if isinstance(key, float) and key != key:
+        return _NAN
+    if isinstance(key, tuple):
+        return tuple(map(_canonical, key))
+    return key
+
+
+def _sort_key(key):
+    """result() 排序用：NaN、None 排在最后，不和其它值比较（元组键逐个字段处理）"""
+    if isinstance(key, tuple):
+        return tuple(_sort_key(part) for part in key)
+    if key is None:
+        return (2,)
+    if isinstance(key, float) and key != key:
+        return (1,)
+    return (0, key)
+
+
+def factorize(values):
+    """
+    把一列值编码成整数编号
+
+    返回:
+        (uniques, codes)：uniques 是不同的值（列表），codes[i] 是 values[i] 在 uniques 中的下标
+    """
+    if isinstance(values, np.ndarray):
+        array = values
+    else:
+        # 只有一种 int/float/bool 类型时才转成数组；混合类型（[1, "a"]）会被 NumPy 统一成
+        # 字符串，字符串列表也不必先转成数组
+        array = None
+        if len(values) and type(values[0]) in _ARRAY_TYPES:
+            types = set(map(type, values))
+            if len(types) == 1:
+                array = np.asarray(values)
+
+    if array is not None and array.dtype.kind in "iu" and len(array):
+        low, high = int(array.min()), int(array.max())
+        if high - low < max(DENSE_LIMIT, 2 * len(array)):
+            offset = array.astype(np.int64) - low
+            present = np.flatnonzero(np.bincount(offset))
+            lookup = np.empty(high - low + 1, np.int64)
+            lookup[present] = np.arange(len(present))
+            return (present + low).tolist(), lookup[offset]
+    if array is not None and array.dtype.kind in "iufb":
+        uniques, codes = np.unique(array, return_inverse=True)
+        return uniques.tolist(), codes.reshape(-1)
+
+    # 字符串、元组、超出 int64 的整数等对象：哈希表编码
+    items = array.tolist() if array is not None else values
+    table = {}
+    setdefault = table.setdefault
+    codes = np.fromiter((setdefault(v, len(table)) for v in items), np.int64, len(items))
+    uniques = list(table)
+    nans = [i for i, v in enumerate(uniques) if isinstance(v, float) and v != v]
+    if len(nans) > 1:
+        # 每个 NaN 对象都分到了自己的编号：合并成一个（只处理不同的值，不逐行检查）
+        remap = np.arange(len(uniques))
+        remap[nans] = nans[0]
+        keep = np.ones(len(uniques), bool)
+        keep[nans[1:]] = False
+        remap = (np.cumsum(keep) - 1)[remap]
+        uniques = [v for v, k in zip(uniques, keep) if k]
+        codes = remap[codes]
+    return uniques, codes
+
+
+class GroupBy:
+    """按一个或多个字段分组，累计 count/sum/mean/min/max"""
+
+    def __init__(self, keys, value=None):
+        """
+        参数:
+            keys: 分组字段名，或字段名列表（例如 ["city", "age"]）
+            value: 要聚合的数值字段；None 表示只计数
+        """
+        self.keys = (keys,) if isinstance(keys, str) else tuple(keys)
+        self.value = value
+        self.groups = []  # 编号 -> 分组键
+        self._index = {}  # 分组键 -> 编号
+        self.count = np.zeros(0, np.int64)
+        self.sum = np.zeros(0)
+        self.min = np.zeros(0)
+        self.max = np.zeros(0)
+
+    def __len__(self):
+        return len(self.groups)
+
+    def _codes_for(self, groups):
+        """把一批分组键映射到全局编号（新出现的键分配新编号），返回编号数组"""
+        index = self._index
+        codes = np.empty(len(groups), np.int64)
+        for i, group in enumerate(groups):
+            group = _canonical(group)
+            code = index.get(group)
+            if code is None:
+                code = index[group] = len(self.groups)
+                self.groups.append(group)
+            codes[i] = code
+        grow = len(self.groups) - len(self.count)
+        if grow:
+            self.count = np.concatenate([self.count, np.zeros(grow, np.int64)])
+            self.sum = np.concatenate([self.sum, np.zeros(grow)])
+            self.min = np.concatenate([self.min, np.full(grow, np.inf)])
+            self.max = np.concatenate([self.max, np.full(grow, -np.inf)])
+        return codes
+
+    def _local_groups(self, columns):
+        """块内编码：返回 (块内的分组键列表, 每行的块内编号)"""
+        if len(self.keys) == 1:
+            return factorize(columns[self.keys[0]])
+        fields = [factorize(columns[name]) for name in self.keys]
+        if math.prod(len(uniques) for uniques, _ in fields) >= _INT64_LIMIT:
+            return self._local_groups_pairwise(fields)
+        combined = np.zeros(len(fields[0][1]), np.int64)
+        for uniques, codes in fields:
+            combined = combined * len(uniques) + codes
+        present, codes = factorize(combined)
+        # 组合编号拆回各个字段的值
+        groups = []
+        for value in present:
+            parts = []
+            for uniques, _ in reversed(fields):
+                value, position = divmod(value, len(uniques))
+                parts.append(uniques[position])
+            groups.append(tuple(reversed(parts)))
+        return groups, codes
+
+    @staticmethod
+    def _local_groups_pairwise(fields):
+        """
+        不同值太多、组合编号会超出 int64 时：每合并一个字段就重新编码，
+        编号始终小于块内行数，乘积不会超过 行数 ** 2
+        """
+        uniques, codes = fields[0]
+        groups = [(value,) for value in uniques]
+        for uniques, field_codes in fields[1:]:
+            size = len(uniques)
+            present, codes = factorize(codes * size + field_codes)
+            groups = [groups[value // size] + (uniques[value % size],) for value in present]
+        return groups, codes
+
+    def update(self, data):
+        """
+        累加一块数据
+
+        参数:
+            data: 列式数据 {字段名: 数组或列表}，或者记录列表 [{字段名: 值}, ...]
+        """
+        if not isinstance(data, dict):
+            names = self.keys + ((self.value,) if self.value else ())
+            data = {name: [record[name] for record in data] for name in names}
+        local_groups, codes = self._local_groups(data)
+        if not len(codes):
+            return self
+        targets = self._codes_for(local_groups)
+        size = len(local_groups)
+
+        # 先在块内聚合（编号范围小），再按映射累加到全局数组
+        self.count[targets] += np.bincount(codes, minlength=size)
+        if self.value:
+            values = np.asarray(data[self.value], dtype=np.float64)
+            self.sum[targets] += np.bincount(codes, weights=values, minlength=size)
+            low = np.full(size, np.inf)
+            high = np.full(size, -np.inf)
+            np.minimum.at(low, codes, values)
+            np.maximum.at(high, codes, values)
+            self.min[targets] = np.minimum(self.min[targets], low)
+            self.max[targets] = np.maximum(self.max[targets], high)
+        return self
+
+    def update_records(self, records, chunk_size=100_000):
+        """从记录的迭代器中按块读取并累加，内存只占一块数据"""
+        records = iter(records)
+        while True:
+            chunk = list(islice(records, chunk_size))
+            if not chunk:
+                return self
+            self.update(chunk)
+
+    def merge(self, other):
+        """把另一个 GroupBy（相同的分组字段）的结果合并进来，返回 self"""
+        if (other.keys, other.value) != (self.keys, self.value):
+            raise ValueError("只能合并分组字段和数值字段都相同的 GroupBy")
+        if not len(other):
+            return self
+        targets = self._codes_for(other.groups)
+        self.count[targets] += other.count
+        self.sum[targets] += other.sum
+        self.min[targets] = np.minimum(self.min[targets], other.min)
+        self.max[targets] = np.maximum(self.max[targets], other.max)
+        return self
+
+    def result(self, sort=True):
+        """
+        返回:
+            dict: {分组键: {"count", "sum", "mean", "min", "max"}}；
+                  单个分组字段时分组键是值本身，多个字段时是元组
+        """
+        order = range(len(self.groups))
+        if sort:
+            try:
+                order = sorted(order, key=lambda i: _sort_key(self.groups[i]))
+            except TypeError:
+                pass  # 键的类型不能互相比较：保持第一次出现的顺序
+        counts = self.count.tolist()
+        sums, lows, highs = self.sum.tolist(), self.min.tolist(), self.max.tolist()
+        result = {}
+        for i in order:
+            key = self.groups[i]
+            if not self.value:
+                result[key] = {"count": counts[i]}
+                continue
+            result[key] = {"count": counts[i], "sum": sums[i], "mean": sums[i] / counts[i],
+                           "min": lows[i], "max": highs[i]}
+        return result
+
+
+def group_by(data, keys, value=None, chunk_size=100_000):
+    """
+    一次完成分组聚合
+
+    参数:
+        data: 列式数据 {字段名: 数组}，或记录（字典）的可迭代对象（按 chunk_size 分块读取）
+    """
+    g = GroupBy(keys, value)
+    if isinstance(data, dict):
+        return g.update(data)
+    return g.update_records(data, chunk_size)
+
+
+if __name__ == "__main__":
+    import time
+
+    CITIES = ["北京", "上海", "广州", "深圳", "杭州", "成都", "武汉", "南京"]
+    rng = np.random.default_rng(0)
+
+    def make_students(n, seed):
+        """和 func.py 里一样的学生字典"""
+        r = np.random.default_rng(seed)
+        ages = r.integers(17, 24, n).tolist()
+        cities = r.choice(CITIES, n).tolist()
+        scores = r.integers(0, 101, n).tolist()
+        return [{"name": f"学生{i}", "age": a, "city": c, "score": s}
+                for i, (a, c, s) in enumerate(zip(ages, cities, scores))]
+
+    print("=" * 60)
+    print("1. 每个年龄的平均分（100 万个学生字典）")
+    print("=" * 60)
+
+    students = make_students(1_000_000, 1)
+
+    start = time.perf_counter()
+    totals = {}
+    for s in students:
+        entry = totals.get(s["age"])
+        if entry is None:
+            entry = totals[s["age"]] = [0, 0]
+        entry[0] += 1
+        entry[1] += s["score"]
+    python_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    by_age = group_by(students, "age", "score")
+    engine_time = time.perf_counter() - start
+
+    for age, stats in by_age.result().items():
+        assert stats["count"] == totals[age][0]
+        print(f"  {age} 岁: {stats['count']:>7} 人，平均 {stats['mean']:.2f}，"
+              f"最低 {stats['min']:.0f}，最高 {stats['max']:.0f}")
+    print(f"  纯 Python 循环: {python_time * 1e3:.0f} ms（只算 count/sum）")
+    print(f"  GroupBy（字典列表，含取字段）: {engine_time * 1e3:.0f} ms")
+
+    print()
+
+    print("=" * 60)
+    print("2. 列式数据：2000 万条记录，按城市和 (城市, 年龄) 分组")
+    print("=" * 60)
+
+    n = 20_000_000
+    columns = {
+        "age": rng.integers(17, 24, n, dtype=np.int8),
+        "city": rng.integers(0, len(CITIES), n, dtype=np.int8),
+        "score": rng.integers(0, 101, n, dtype=np.int16),
+    }
+    start = time.perf_counter()
+    by_city = group_by(columns, "city", "score")
+    print(f"  按城市: {len(by_city)} 组，{(time.perf_counter() - start) * 1e3:.0f} ms")
+    start = time.perf_counter()
+    by_city_age = group_by(columns, ["city", "age"], "score")
+    print(f"  按 (城市, 年龄): {len(by_city_age)} 组，{(time.perf_counter() - start) * 1e3:.0f} ms")
+    start = time.perf_counter()
+    city_names = np.array(CITIES, dtype=object)[columns["city"][:2_000_000]]
+    by_name = group_by({"city": city_names}, "city")
+    print(f"  按城市名（字符串，200 万条，哈希编码）: "
+          f"{(time.perf_counter() - start) * 1e3:.0f} ms，{by_name.result()['北京']}")
+
+    print()
+
+    print("=" * 60)
+    print("3. 流式读取 + 分块结果合并")
+    print("=" * 60)
+
+    def read_records(n, seed):
+        """模拟从文件或数据库逐条读取记录，不会一次性放进内存"""
+        r = np.random.default_rng(seed)
+        for start in range(0, n, 50_000):
+            size = min(50_000, n - start)
+            for a, c, s in zip(r.integers(17, 24, size).tolist(),
+                               r.choice(CITIES, size).tolist(),
+                               r.integers(0, 101, size).tolist()):
+                yield {"age": a, "city": c, "score": s}
+
+    # 比如两台机器各处理一半数据，最后合并
+    part1 = group_by(read_records(500_000, 2), ["city", "age"], "score")
+    part2 = group_by(read_records(500_000, 3), ["city", "age"], "score")
+    merged = part1.merge(part2).result()
+    whole = GroupBy(["city", "age"], "score")
+    whole.update_records(read_records(500_000, 2)).update_records(read_records(500_000, 3))
+    print(f"  合并后 {len(merged)} 组，与整体计算一致: {merged == whole.result()}")
+    key = ("北京", 18)
+    print(f"  {key}: {merged[key]}")
+
+    print()
+    print("=" * 60)
+    print("分组聚合演示完成！")
+    print("=" * 60)
@@ -0,0 +1,535 @@
+"""
+============================================================================
+HTTP 响应磁盘缓存（ResponseCache）- SQLite 索引 + 内容文件 + 条件请求
+============================================================================
+
+📚 核心总结：
+-----------
+install/test_requests.py 装好 requests 之后，每次运行脚本都会重新下载
+同样的资源。ResponseCache 把响应保存到磁盘，下次直接复用：
+
+1. 索引放在 SQLite（cache.sqlite3），响应体单独存成文件
+2. 缓存键 = 方法 + URL + Vary 指定的请求头的值
+   （Vary 要等第一次响应回来才知道，所以每个 URL 另存一份 Vary 头名单）
+3. 新鲜度按 Cache-Control: max-age 计算：
+   - 还新鲜：直接返回缓存，不发请求（命中）
+   - 过期了但有 ETag / Last-Modified：带 If-None-Match / If-Modified-Since
+     发条件请求，服务端回 304 就继续用缓存（重新验证），只传响应头
+   - no-store 的响应不缓存，no-cache 的响应每次都重新验证
+4. 总大小超过 max_bytes 时，按最近访问时间淘汰（LRU）
+5. 缓存的响应体用 mmap 映射，body 是 memoryview，读取、写出都不复制
+
+🔑 用法：
+-------
+   cache = ResponseCache("~/.cache/imber-http", max_bytes=256 * 2**20)
+   client = CachingClient(cache)          # 默认使用 http_client.HttpClient
+   response = client.get("https://example.com/data.json")
+   response.from_cache, response.status, response.body[:100]
+   response.write_to(f)                   # 直接把 mmap 写进文件，不复制
+   client.stats                           # {"hit": .., "revalidated": .., "miss": ..}
+
+🔑 基准测试（本地 http.server，支持 ETag 和 max-age）：
+---------------------------------------------------
+   python http_cache.py
+   python http_cache.py --requests 5000 --latency 20
+
+⚠️ 注意：
+--------
+1. 只缓存 GET 的 200 响应；比 max_bytes 还大的响应体不缓存（直接返回内存中的数据）
+2. 同一进程内多线程共用一个 ResponseCache 是安全的（SQLite 操作加锁）
+3. CachedResponse 用完应调用 close()（或用 with），释放 mmap
+
+============================================================================
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import sqlite3
+import threading
+import time
+from email.utils import formatdate, parsedate_to_datetime
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key           TEXT PRIMARY KEY,
+    method        TEXT NOT NULL,
+    url           TEXT NOT NULL,
+    status        INTEGER NOT NULL,
+    headers       TEXT NOT NULL,
+    etag          TEXT,
+    last_modified TEXT,
+    expires_at    REAL NOT NULL,
+    size          INTEGER NOT NULL,
+    last_access   REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_lru ON entries (last_access);
+CREATE TABLE IF NOT EXISTS vary (
+    method  TEXT NOT NULL,
+    url     TEXT NOT NULL,
+    names   TEXT NOT NULL,
+    PRIMARY KEY (method, url)
+);
+"""
+
+
+def _cache_control(headers):
+    """解析 Cache-Control，返回 {指令: 值或 True}"""
+    directives = {}
+    for part in headers.get("cache-control", "").split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"') if value else True
+    return directives
+
+
+def _lower(headers):
+    return {k.lower(): v for k, v in (headers or {}).items()}
+
+
+# iter_content 已经解压并去掉了分块编码，保存的是解码后的响应体，这些头不再适用
+_BODY_HEADERS = ("content-encoding", "content-length", "transfer-encoding")
+
+
+class CachedResponse:
+    """从缓存中取出的响应；body 是映射到内容文件的 memoryview"""
+
+    def __init__(self, status, headers, path, size, from_cache):
+        self.status = status
+        self.headers = headers
+        self.from_cache = from_cache
+        self._file = None
+        self._map = None
+        if size:
+            self._file = open(path, "rb")
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.body = memoryview(self._map)
+        else:
+            self.body = memoryview(b"")
+
+    @property
+    def content(self):
+        """响应体的 bytes 副本"""
+        return bytes(self.body)
+
+    def write_to(self, fileobj):
+        """把响应体写进文件对象（直接写 memoryview，不复制）"""
+        return fileobj.write(self.body)
+
+    def close(self):
+        self.body.release()
+        if self._map is not None:
+            self._map.close()
+            self._file.close()
+            self._map = self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ResponseCache:
+    """SQLite 索引 + 内容文件的 HTTP 响应缓存，总大小超出上限时按 LRU 淘汰"""
+
+    def __init__(self, directory, max_bytes=256 * 1024 * 1024):
+        self.directory = os.path.expanduser(directory)
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+        self._db = sqlite3.connect(os.path.join(self.directory, "cache.sqlite3"),
+                                   check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")  # 缓存丢了可以重新下载，不必每次提交都 fsync
+        self._db.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        self.evicted = 0
+
+    # ----- 键和路径 -----
+
+    def _vary_names(self, method, url):
+        row = self._db.execute("SELECT names FROM vary WHERE method = ? AND url = ?",
+                               (method, url)).fetchone()
+        return json.loads(row[0]) if row else []
+
+    @staticmethod
+    def _key(method, url, names, request_headers):
+        request_headers = _lower(request_headers)
+        parts = [method, url] + [f"{name}:{request_headers.get(name, '')}" for name in names]
+        return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key)
+
+    # ----- 查询 -----
+
+    def lookup(self, method, url, request_headers=None):
+        """
+        查找缓存条目
+
+        返回:
+            dict（包含 key、status、headers、etag、last_modified、expires_at、size），
+            没有缓存时返回 None
+        """
+        with self._lock:
+            key = self._key(method, url, self._vary_names(method, url), request_headers)
+            row = self._db.execute(
+                "SELECT status, headers, etag, last_modified, expires_at, size "
+                "FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None or not os.path.exists(self._path(key)):
+            return None
+        status, headers, etag, last_modified, expires_at, size = row
+        return {"key": key, "status": status, "headers": json.loads(headers), "etag": etag,
+                "last_modified": last_modified, "expires_at": expires_at, "size": size}
+
+    def open(self, entry):
+        """打开条目的响应体（mmap），同时刷新 LRU 访问时间"""
+        with self._lock:
+            self._db.execute("UPDATE entries SET last_access = ? WHERE key = ?",
+                             (time.time(), entry["key"]))
+        return CachedResponse(entry["status"], entry["headers"], self._path(entry["key"]),
+                              entry["size"], from_cache=True)
+
+    # ----- 写入 -----
+
+    @staticmethod
+    def freshness(headers, now=None):
+        """
+        根据响应头计算过期时间
+
+        返回:
+            过期时刻（time.time() 时间戳）；no-store 返回 None；no-cache 返回 0
+        """
+        headers = _lower(headers)
+        directives = _cache_control(headers)
+        if "no-store" in directives:
+            return None
+        if "no-cache" in directives:
+            return 0.0
+        now = time.time() if now is None else now
+        try:
+            return now + int(directives.get("max-age", 0))
+        except ValueError:
+            return now
+
+    def store(self, method, url, request_headers, status, headers, body):
+        """
+        保存一个响应
+
+        参数:
+            body: bytes 或可迭代的 bytes 块（不必一次性放进内存）
+
+        返回:
+            缓存条目 dict；不可缓存、或响应体超过 max_bytes 时返回 None
+        """
+        headers = _lower(headers)
+        expires_at = self.freshness(headers)
+        vary = sorted(name.strip().lower() for name in headers.get("vary", "").split(",")
+                      if name.strip())
+        if expires_at is None or "*" in vary:
+            return None
+
+        key = self._key(method, url, vary, request_headers)
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        size = 0
+        with open(tmp, "wb") as f:
+            for block in ([body] if isinstance(body, (bytes, bytearray, memoryview)) else body):
+                size += f.write(block)
+        if size > self.max_bytes:
+            # 存进去也会被 _evict 立即淘汰，还会把其它条目一起清空
+            os.remove(tmp)
+            return None
+        os.replace(tmp, path)
+
+        entry = {"key": key, "status": status, "headers": headers, "etag": headers.get("etag"),
+                 "last_modified": headers.get("last-modified"), "expires_at": expires_at,
+                 "size": size}
+        with self._lock:
+            self._db.execute("BEGIN")
+            self._db.execute("INSERT OR REPLACE INTO vary VALUES (?, ?, ?)",
+                             (method, url, json.dumps(vary)))
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, method, url, status, json.dumps(headers), entry["etag"],
+                 entry["last_modified"], expires_at, size, time.time()))
+            self._db.execute("COMMIT")
+            self._evict()
+        return entry
+
+    def refresh(self, entry, headers):
+        """收到 304 后，用新的响应头更新条目的过期时间和验证器"""
+        headers = {k: v for k, v in _lower(headers).items() if k not in _BODY_HEADERS}
+        merged = dict(entry["headers"], **headers)
+        expires_at = self.freshness(merged)
+        with self._lock:
+            self._db.execute(
+                "UPDATE entries SET headers = ?, etag = ?, last_modified = ?, expires_at = ? "
+                "WHERE key = ?",
+                (json.dumps(merged), merged.get("etag"), merged.get("last-modified"),
+                 expires_at or 0.0, entry["key"]))
+        entry.update(headers=merged, etag=merged.get("etag"),
+                     last_modified=merged.get("last-modified"), expires_at=expires_at or 0.0)
+        return entry
+
+    def _evict(self):
+        """总大小超过 max_bytes 时删除最久没有访问的条目（调用方持有锁）"""
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._db.execute("SELECT key, size FROM entries ORDER BY last_access").fetchall()
+        victims = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            victims.append(key)
+            total -= size
+        self._db.executemany("DELETE FROM entries WHERE key = ?", [(k,) for k in victims])
+        for key in victims:
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+        self.evicted += len(victims)
+
+    def total_bytes(self):
+        with self._lock:
+            return self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def close(self):
+        self._db.close()
+
+
+class CachingClient:
+    """在 HTTP 客户端前面加一层 ResponseCache，只缓存 GET"""
+
+    def __init__(self, cache, client=None):
+        """
+        参数:
+            cache: ResponseCache
+            client: 有 request(method, url, headers=..., stream=...) 方法、返回
+                    requests.Response 的对象；默认新建一个 http_client.HttpClient
+        """
+        if client is None:
+            from http_client import HttpClient
+            client = HttpClient()
+        self.cache = cache
+        self.client = client
+        self.stats = {"hit": 0, "revalidated": 0, "miss": 0}
+
+    def get(self, url, headers=None):
+        """
+        GET 一个 URL，尽量使用缓存
+
+        返回:
+            CachedResponse；响应不可缓存时 from_cache=False，body 是内存中的数据
+        """
+        headers = dict(headers or {})
+        entry = self.cache.lookup("GET", url, headers)
+        if entry is not None and entry["expires_at"] > time.time():
+            self.stats["hit"] += 1
+            return self.cache.open(entry)
+
+        conditional = dict(headers)
+        if entry is not None:
+            if entry["etag"]:
+                conditional["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                conditional["If-Modified-Since"] = entry["last_modified"]
+
+        response = self.client.request("GET", url, headers=conditional, stream=True)
+        try:
+            if response.status_code == 304 and entry is not None:
+                self.stats["revalidated"] += 1
+                self.cache.refresh(entry, response.headers)
+                return self.cache.open(entry)
+
+            self.stats["miss"] += 1
+            if response.status_code == 200:
+                length = response.headers.get("Content-Length")
+                encoded = response.headers.get("Content-Encoding", "identity") != "identity"
+                if length is None or encoded or int(length) <= self.cache.max_bytes:
+                    # 长度未知（或解压后长度未知）时边存边留一份：
+                    # 响应体超过 max_bytes 不会被缓存，但已经从连接上读走了
+                    keep = length is None or encoded
+                    received = bytearray()
+                    consumed = False
+
+                    def blocks():
+                        nonlocal consumed
+                        consumed = True
+                        for block in response.iter_content(64 * 1024):
+                            if keep:
+                                received.extend(block)
+                            yield block
+
+                    stored_headers = {k: v for k, v in response.headers.items()
+                                      if k.lower() not in _BODY_HEADERS}
+                    stored = self.cache.store("GET", url, headers, 200, stored_headers, blocks())
+                    if stored is not None:
+                        cached = self.cache.open(stored)
+                        cached.from_cache = False
+                        return cached
+                    if consumed:
+                        uncached = CachedResponse(200, _lower(stored_headers), None, 0,
+                                                  from_cache=False)
+                        uncached.body = memoryview(bytes(received))
+                        return uncached
+            uncached = CachedResponse(response.status_code, _lower(response.headers), None, 0,
+                                      from_cache=False)
+            uncached.body = memoryview(response.content)
+            return uncached
+        finally:
+            response.close()
+
+    def hit_rate(self):
+        """不需要下载响应体的请求占比（新鲜命中 + 304 重新验证）"""
+        total = sum(self.stats.values())
+        return (self.stats["hit"] + self.stats["revalidated"]) / total if total else 0.0
+
+
+# ========== 基准测试 ==========
+
+def start_stub_server(latency=0.0, body_size=32 * 1024, max_age=60):
+    """
+    本地 HTTP 服务，支持 ETag / Last-Modified 条件请求
+
+    路径:
+        /fresh/N   Cache-Control: max-age=<max_age>
+        /etag/N    Cache-Control: no-cache（每次都要重新验证）
+        /nostore/N Cache-Control: no-store
+
+    返回:
+        (server, base_url, counts)；counts 统计 200 / 304 次数和发送的字节数
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    last_modified = formatdate(time.time() - 3600, usegmt=True)
+    counts = {"200": 0, "304": 0, "bytes": 0}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            kind, _, name = self.path.strip("/").partition("/")
+            etag = '"%s"' % hashlib.md5(self.path.encode()).hexdigest()
+            policy = {"fresh": f"max-age={max_age}", "etag": "no-cache",
+                      "nostore": "no-store"}.get(kind, "no-cache")
+            if latency:
+                time.sleep(latency)
+
+            not_modified = self.headers.get("If-None-Match") == etag
+            since = self.headers.get("If-Modified-Since")
+            if since and not self.headers.get("If-None-Match"):
+                not_modified = parsedate_to_datetime(since) >= parsedate_to_datetime(last_modified)
+            if not_modified:
+                self.send_response(304)
+                body = b""
+            else:
+                self.send_response(200)
+                body = (self.path.encode() * (body_size // len(self.path) + 1))[:body_size]
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", last_modified)
+            self.send_header("Cache-Control", policy)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            with lock:
+                counts["304" if not_modified else "200"] += 1
+                counts["bytes"] += len(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}", counts
+
+
+def _workload(base, n, resources, seed=0):
+    """按 Zipf 分布生成请求：少数热门资源被反复访问"""
+    import random
+
+    def kind(i):
+        # 每 10 个资源里 1 个 no-store，其余一半 max-age、一半每次重新验证
+        if i % 10 == 9:
+            return "nostore"
+        return "fresh" if i % 2 == 0 else "etag"
+
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(resources)]
+    return [f"{base}/{kind(i)}/{i}" for i in rng.choices(range(resources), weights, k=n)]
+
+
+def main(argv=None):
+    import tempfile
+
+    from http_client import HttpClient
+
+    parser = argparse.ArgumentParser(description="HTTP 响应缓存基准测试（本地 http.server）")
+    parser.add_argument("--requests", type=int, default=2000, help="请求数（默认 2000）")
+    parser.add_argument("--resources", type=int, default=300, help="不同资源数（默认 300）")
+    parser.add_argument("--latency", type=float, default=5.0, help="服务端延迟（毫秒，默认 5）")
+    parser.add_argument("--size", type=int, default=64 * 1024, help="响应体大小（默认 64 KiB）")
+    parser.add_argument("--max-mb", type=float, default=8.0, help="缓存上限（MiB，默认 8）")
+    args = parser.parse_args(argv)
+
+    print("=" * 60)
+    print(f"HTTP 响应缓存：{args.requests} 个请求，{args.resources} 个资源（Zipf 分布）")
+    print("=" * 60)
+
+    server, base, counts = start_stub_server(args.latency / 1000, args.size)
+    urls = _workload(base, args.requests, args.resources)
+    try:
+        with HttpClient(pool_size=1) as http:
+            start = time.perf_counter()
+            for url in urls:
+                http.get(url).content
+            plain = time.perf_counter() - start
+            plain_bytes = counts["bytes"]
+
+            counts.update({"200": 0, "304": 0, "bytes": 0})
+            with tempfile.TemporaryDirectory() as tmp:
+                cache = ResponseCache(tmp, max_bytes=int(args.max_mb * 2 ** 20))
+                client = CachingClient(cache, http)
+                start = time.perf_counter()
+                for url in urls:
+                    with client.get(url) as response:
+                        assert len(response.body) == args.size
+                cached = time.perf_counter() - start
+                print(f"  缓存后服务端: 200 x {counts['200']}，304 x {counts['304']}")
+                print(f"  命中 {client.stats['hit']}，304 重新验证 {client.stats['revalidated']}，"
+                      f"未命中 {client.stats['miss']}，淘汰 {cache.evicted}")
+                print(f"  命中率（无需下载响应体）: {client.hit_rate():.1%}")
+                print(f"  缓存占用: {cache.total_bytes() / 2 ** 20:.1f} MiB / {args.max_mb} MiB，"
+                      f"{len(cache)} 个条目")
+                cache.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    print()
+    print(f"  {'方式':<12}{'总耗时':>10}{'平均延迟':>12}{'下载量':>12}")
+    for label, seconds, size in [("不使用缓存", plain, plain_bytes),
+                                 ("ResponseCache", cached, counts["bytes"])]:
+        print(f"  {label:<12}{seconds:>9.2f}s{seconds / len(urls) * 1e3:>10.2f}ms"
+              f"{size / 2 ** 20:>9.1f} MiB")
+
+    print()
+    print("=" * 60)
+    print("HTTP 响应缓存演示完成！")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
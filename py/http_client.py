@@ -0,0 +1,401 @@
+"""
+============================================================================
+连接池 HTTP 客户端（HttpClient）- requests.Session + 线程池 + 重试
+============================================================================
+
+📚 核心总结：
+-----------
+install/test_requests.py 只验证 requests 能导入。
+实际使用时如果每次都调用 requests.get(url)，每个请求都会新建一个 TCP 连接
+（HTTPS 还要再做一次 TLS 握手），几千个小请求的大部分时间都花在建连上。
+
+HttpClient 的做法：
+1. 复用连接：所有请求共享一个 HTTPAdapter（内部是 urllib3 连接池），
+   keep-alive 的连接用完放回池里，下一个请求直接复用
+2. 每个主机的连接池大小可配置（pool_size，以及按主机覆盖的 host_pool_sizes）
+3. fetch_many 用线程池并发请求，结果按输入顺序返回
+4. 连接错误、超时、429/5xx 自动重试，退避时间按 backoff * 2^n 增长，
+   服务端返回 Retry-After 时优先使用它；
+   默认只重试幂等方法（GET/HEAD/PUT/DELETE/OPTIONS，与 urllib3 的 allowed_methods 一致）
+
+🔑 用法：
+-------
+   with HttpClient(pool_size=20, retries=3) as client:
+       response = client.get("https://example.com/api")
+       results = client.fetch_many(urls, workers=16)
+       for r in results:
+           print(r.url, r.status, len(r.content or b""))
+
+🔑 基准测试（本地 http.server 作为服务端）：
+----------------------------------------
+   python http_client.py                              # 1000 个请求
+   python http_client.py --requests 2000 --workers 16 --latency 5
+
+⚠️ 注意：
+--------
+1. requests.Session 本身不保证线程安全（cookie 等状态会被并发修改），
+   这里每个线程一个 Session，但它们挂载同一个 HTTPAdapter，共享连接池
+2. 只有读完响应体的连接才能放回池里；fetch_many 总是读取完整响应体
+3. POST、PATCH 不是幂等的：请求可能已经在服务端生效、只是响应丢了，
+   重试会重复下单、重复扣款，所以默认不重试；确认接口幂等时
+   可以传 retry_methods 把它们加进去（retry_methods=None 表示所有方法都重试）
+4. 依赖 requests（pip install requests）
+
+============================================================================
+"""
+
+import argparse
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+
+from lazy_import import lazy_import
+
+requests = lazy_import("requests")  # 第一次发请求时才加载
+if requests is None:
+    raise ImportError("http_client 依赖 requests，请先运行: pip install requests")
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+RETRY_METHODS = ("GET", "HEAD", "PUT", "DELETE", "OPTIONS")  # 幂等方法
+
+
+@dataclass
+class FetchResult:
+    """fetch_many 中单个请求的结果"""
+
+    url: str
+    status: int = None
+    content: bytes = None
+    elapsed: float = 0.0
+    attempts: int = 0
+    error: Exception = None
+
+    @property
+    def ok(self):
+        return self.error is None and self.status is not None and self.status < 400
+
+
+class HttpClient:
+    """带连接池、重试和并发抓取的 HTTP 客户端"""
+
+    def __init__(self, pool_size=10, max_hosts=10, host_pool_sizes=None, timeout=10.0,
+                 retries=3, backoff=0.1, max_backoff=10.0, retry_statuses=RETRY_STATUSES,
+                 retry_methods=RETRY_METHODS, headers=None):
+        """
+        参数:
+            pool_size: 每个主机最多保持的连接数
+            max_hosts: 最多为多少个主机缓存连接池
+            host_pool_sizes: {"host[:port]": 连接数}，按主机覆盖 pool_size
+            timeout: 单次请求超时（秒）
+            retries: 失败后最多重试几次（0 表示不重试）
+            backoff: 第一次重试前等待的秒数，之后每次翻倍
+            max_backoff: 单次等待的上限（秒）
+            retry_statuses: 需要重试的 HTTP 状态码
+            retry_methods: 允许重试的 HTTP 方法；None 表示所有方法都重试
+            headers: 每个请求都带上的请求头
+        """
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.retry_statuses = frozenset(retry_statuses)
+        self.retry_methods = None if retry_methods is None else frozenset(
+            m.upper() for m in retry_methods)
+        self.headers = dict(headers or {})
+
+        adapters = requests.adapters
+        # pool_block=True：连接数达到上限时等待空闲连接，而不是临时建一个用完就丢的连接
+        self._mounts = [("", adapters.HTTPAdapter(
+            pool_connections=max_hosts, pool_maxsize=pool_size, pool_block=True))]
+        for host, size in (host_pool_sizes or {}).items():
+            adapter = adapters.HTTPAdapter(pool_connections=1, pool_maxsize=size, pool_block=True)
+            self._mounts += [(f"http://{host}", adapter), (f"https://{host}", adapter)]
+        self._local = threading.local()
+        self._sessions = []
+        self._lock = threading.Lock()
+
+    def _session(self):
+        """当前线程的 Session；所有 Session 挂载同一组 HTTPAdapter（共享连接池）"""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(self.headers)
+            for prefix, adapter in self._mounts:
+                if prefix:
+                    session.mount(prefix, adapter)
+                else:
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+            self._local.session = session
+            with self._lock:
+                self._sessions.append(session)
+        return session
+
+    def _delay(self, attempt, response=None):
+        """第 attempt 次重试前等待的秒数"""
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after:
+                try:
+                    wait = float(retry_after)
+                    # 负数按 0 处理，nan、inf 当作没有 Retry-After（time.sleep 不接受负数和 nan）
+                    if math.isfinite(wait):
+                        return min(max(wait, 0.0), self.max_backoff)
+                except ValueError:
+                    from email.utils import parsedate_to_datetime  # HTTP 日期格式，较少用到
+                    try:
+                        wait = parsedate_to_datetime(retry_after).timestamp() - time.time()
+                        return min(max(wait, 0.0), self.max_backoff)
+                    except (TypeError, ValueError):
+                        pass
+        return min(self.backoff * 2 ** (attempt - 1), self.max_backoff)
+
+    def _retries_for(self, method):
+        """method 允许的重试次数：不在 retry_methods 里的方法不重试"""
+        if self.retry_methods is None or method.upper() in self.retry_methods:
+            return self.retries
+        return 0
+
+    def request(self, method, url, **kwargs):
+        """
+        发送一个请求，失败时按退避策略重试（只重试 retry_methods 里的方法）
+
+        返回:
+            requests.Response（重试用完后返回最后一次的响应）
+
+        异常:
+            重试用完后仍然连接失败或超时，抛出最后一次的 requests 异常
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        session = self._session()
+        retries = self._retries_for(method)
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                response = session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt > retries:
+                    raise
+                time.sleep(self._delay(attempt))
+                continue
+            if response.status_code not in self.retry_statuses or attempt > retries:
+                response.attempts = attempt
+                return response
+            delay = self._delay(attempt, response)
+            response.close()  # 读完/释放连接，放回连接池
+            time.sleep(delay)
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def _fetch(self, method, url, kwargs):
+        start = time.perf_counter()
+        try:
+            response = self.request(method, url, **kwargs)
+            return FetchResult(url, response.status_code, response.content,
+                               time.perf_counter() - start, response.attempts)
+        except requests.RequestException as e:
+            return FetchResult(url, elapsed=time.perf_counter() - start,
+                               attempts=self._retries_for(method) + 1, error=e)
+
+    def fetch_many(self, urls, workers=None, method="GET", **kwargs):
+        """
+        用线程池并发抓取多个 URL
+
+        参数:
+            urls: URL 列表
+            workers: 线程数，默认等于 pool_size（线程比连接多只会排队等连接）
+            method: HTTP 方法
+            **kwargs: 传给 requests 的其它参数（params、headers 等）
+
+        返回:
+            list[FetchResult]，与 urls 顺序一致；单个请求失败不会抛异常，
+            错误记录在 FetchResult.error 中
+        """
+        urls = list(urls)
+        if workers is None:
+            workers = self.pool_size
+        if workers <= 1 or len(urls) <= 1:
+            return [self._fetch(method, url, kwargs) for url in urls]
+        sessions = []  # 本次线程池的线程各自创建的 Session
+        try:
+            with ThreadPoolExecutor(max_workers=workers,
+                                    initializer=lambda: sessions.append(self._session())) as pool:
+                return list(pool.map(lambda url: self._fetch(method, url, kwargs), urls))
+        finally:
+            self._forget(sessions)
+
+    def _forget(self, sessions):
+        """
+        线程池的线程退出后，丢掉它们的 Session，否则每次 fetch_many 都会让 _sessions 变长；
+        不调用 session.close()：那会关闭所有线程共享的 HTTPAdapter 连接池
+        """
+        done = {id(session) for session in sessions}
+        with self._lock:
+            self._sessions = [s for s in self._sessions if id(s) not in done]
+
+    def close(self):
+        with self._lock:
+            sessions, self._sessions = self._sessions, []
+        for session in sessions:
+            session.close()
+        self._local = threading.local()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def host_of(url):
+    """URL 的 host[:port] 部分，可作为 host_pool_sizes 的键"""
+    return urlsplit(url).netloc
+
+
+# ========== 基准测试 ==========
+
+def start_stub_server(latency=0.0, body=b"ok" * 64):
+    """
+    在后台线程启动一个本地 HTTP/1.1 服务（支持 keep-alive）
+
+    路径:
+        /           返回 body，每个请求先等待 latency 秒
+        /flaky/N    同一路径的前 N 次请求返回 503，之后返回 200（GET、POST 共用计数）
+
+    返回:
+        (server, base_url)；用完调用 server.shutdown()
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    hits = {}
+    hits_lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # 默认的 HTTP/1.0 每个请求后都会断开连接
+        # 响应头和响应体分两次写出；不关闭 Nagle 算法时，keep-alive 连接上的
+        # 第二次写会等客户端的延迟 ACK（约 40ms），复用连接反而更慢
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            if length:
+                self.rfile.read(length)  # 读掉请求体，keep-alive 连接才能继续用
+            status = 200
+            if self.path.startswith("/flaky/"):
+                with hits_lock:
+                    hits[self.path] = hits.get(self.path, 0) + 1
+                    count = hits[self.path]
+                if count <= int(self.path.rsplit("/", 1)[1]):
+                    status = 503
+            if latency:
+                time.sleep(latency)
+            self.send_response(status)
+            if status == 503:
+                self.send_header("Retry-After", "0")
+            self.send_header("Content-Type", "text/plain")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        do_POST = do_GET
+
+        def log_message(self, format, *args):
+            pass  # 不打印访问日志
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def run_benchmark(n=1000, workers=8, latency=0.0):
+    """
+    比较三种方式完成 n 个请求的吞吐量
+
+    返回:
+        list: [(方式, 耗时秒, 每秒请求数), ...]
+    """
+    server, base = start_stub_server(latency)
+    url = base + "/"
+    results = []
+    try:
+        def timed(label, func):
+            start = time.perf_counter()
+            func()
+            seconds = time.perf_counter() - start
+            results.append((label, seconds, n / seconds))
+
+        def unpooled():
+            for _ in range(n):
+                response = requests.get(url, timeout=10)
+                response.raise_for_status()
+
+        def pooled():
+            with HttpClient(pool_size=1) as client:
+                for _ in range(n):
+                    client.get(url).raise_for_status()
+
+        def concurrent():
+            with HttpClient(pool_size=workers) as client:
+                results = client.fetch_many([url] * n, workers=workers)
+                assert all(r.ok for r in results)
+
+        timed("不复用连接 requests.get", unpooled)
+        timed("连接池（单线程）", pooled)
+        timed(f"连接池 + {workers} 线程", concurrent)
+    finally:
+        server.shutdown()
+        server.server_close()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="HTTP 连接池基准测试（本地 http.server）")
+    parser.add_argument("--requests", type=int, default=1000, help="请求数（默认 1000）")
+    parser.add_argument("--workers", type=int, default=8, help="并发线程数（默认 8）")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="服务端每个请求的模拟延迟（毫秒，默认 0）")
+    args = parser.parse_args(argv)
+
+    print("=" * 60)
+    print("1. 重试与退避：/flaky/2 前两次返回 503")
+    print("=" * 60)
+
+    server, base = start_stub_server()
+    try:
+        with HttpClient(retries=3, backoff=0.01) as client:
+            response = client.get(base + "/flaky/2")
+            print(f"  状态码 {response.status_code}，共尝试 {response.attempts} 次")
+        with HttpClient(retries=1, backoff=0.01) as client:
+            response = client.get(base + "/flaky/5")
+            print(f"  retries=1: 状态码 {response.status_code}，共尝试 {response.attempts} 次")
+            response = client.request("POST", base + "/flaky/1", data=b"order")
+            print(f"  POST（非幂等，不重试）: 状态码 {response.status_code}，"
+                  f"共尝试 {response.attempts} 次")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    print()
+
+    print("=" * 60)
+    print(f"2. 吞吐量对比：{args.requests} 个请求，服务端延迟 {args.latency} ms")
+    print("=" * 60)
+
+    for label, seconds, rate in run_benchmark(args.requests, args.workers, args.latency / 1000):
+        print(f"  {label:<24}{seconds:>8.3f}s{rate:>10.0f} 请求/秒")
+
+    print()
+    print("=" * 60)
+    print("HTTP 连接池演示完成！")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -140,6 +140,14 @@ Python 的条件判断语法与 JS/TS 类似，但有几个重要区别：
 3. 检查 None 用 is None，不是 == None
 4. 布尔值首字母大写：True/False，不是 true/false
 
+▶️ 运行方式：
+-----------
+   python if.py                      # 按顺序运行全部 15 个小节
+   python demo_runner.py if 3        # 只运行第 3 小节
+   每个小节都是一个函数（section_1 ... section_15），
+   import 本模块只会定义函数，不会运行任何演示、也不会打印。
+   （if 是关键字，需要用 importlib.import_module("if") 导入）
+
 ============================================================================
 """
 
@@ -147,301 +155,353 @@ Python 的条件判断语法与 JS/TS 类似，但有几个重要区别：
 
 # ===== Python 条件判断 vs JavaScript/TypeScript =====
 
+
 # ========== 1. 基本的 if 语句 ==========
 
-print("=" * 60)
-print("1. 基本的 if 语句")
-print("=" * 60)
 
-age = 18
+def section_1():
+    """1. 基本的 if 语句"""
+    print("=" * 60)
+    print("1. 基本的 if 语句")
+    print("=" * 60)
+
+    age = 18
 
-if age >= 18:
-    print("  你已经成年了！")
+    if age >= 18:
+        print("  你已经成年了！")
 
-# 对比 JS/TS:
-# if (age >= 18) {
-#   console.log("你已经成年了！");
-# }
+    # 对比 JS/TS:
+    # if (age >= 18) {
+    #   console.log("你已经成年了！");
+    # }
+
+    print()
 
-print()
 
 # ========== 2. if...else 语句 ==========
 
-print("=" * 60)
-print("2. if...else 语句")
-print("=" * 60)
 
-score = 85
+def section_2():
+    """2. if...else 语句"""
+    print("=" * 60)
+    print("2. if...else 语句")
+    print("=" * 60)
+
+    score = 85
 
-if score >= 60:
-    print("  及格了！")
-else:
-    print("  不及格")
+    if score >= 60:
+        print("  及格了！")
+    else:
+        print("  不及格")
 
-# 对比 JS/TS:
-# if (score >= 60) {
-#   console.log("及格了！");
-# } else {
-#   console.log("不及格");
-# }
+    # 对比 JS/TS:
+    # if (score >= 60) {
+    #   console.log("及格了！");
+    # } else {
+    #   console.log("不及格");
+    # }
+
+    print()
 
-print()
 
 # ========== 3. if...elif...else 语句（多条件判断） ==========
 
-print("=" * 60)
-print("3. if...elif...else（多条件判断，类似 switch）")
-print("=" * 60)
 
-score = 92
+def get_grade(score):
+    """if...elif...else：按分数评级"""
+    if score >= 90:
+        return "优秀"
+    elif score >= 80:
+        return "良好"
+    elif score >= 60:
+        return "及格"
+    else:
+        return "不及格"
 
-if score >= 90:
-    grade = "优秀"
-    print(f"  成绩: {score}, 等级: {grade}")
-elif score >= 80:
-    grade = "良好"
-    print(f"  成绩: {score}, 等级: {grade}")
-elif score >= 60:
-    grade = "及格"
-    print(f"  成绩: {score}, 等级: {grade}")
-else:
-    grade = "不及格"
+
+def section_3():
+    """3. if...elif...else（多条件判断，类似 switch）"""
+    print("=" * 60)
+    print("3. if...elif...else（多条件判断，类似 switch）")
+    print("=" * 60)
+
+    score = 92
+
+    grade = get_grade(score)
     print(f"  成绩: {score}, 等级: {grade}")
 
-# 对比 JS/TS:
-# if (score >= 90) {
-#   grade = "优秀";
-# } else if (score >= 80) {
-#   grade = "良好";
-# } else if (score >= 60) {
-#   grade = "及格";
-# } else {
-#   grade = "不及格";
-# }
+    # 对比 JS/TS:
+    # if (score >= 90) {
+    #   grade = "优秀";
+    # } else if (score >= 80) {
+    #   grade = "良好";
+    # } else if (score >= 60) {
+    #   grade = "及格";
+    # } else {
+    #   grade = "不及格";
+    # }
+
+    # 💡 大批量评级（整届考生）时，可以用 grading.py 中的 ThresholdClassifier，
+    #    单个分数走 bisect，数组走 np.digitize
+
+    print()
 
-print()
 
 # ========== 4. 比较运算符 ==========
 
-print("=" * 60)
-print("4. 比较运算符（与 JS/TS 相同）")
-print("=" * 60)
 
-a, b = 10, 20
+def section_4():
+    """4. 比较运算符（与 JS/TS 相同）"""
+    print("=" * 60)
+    print("4. 比较运算符（与 JS/TS 相同）")
+    print("=" * 60)
 
-print(f"  a = {a}, b = {b}")
-print(f"  a == b (等于): {a == b}")
-print(f"  a != b (不等于): {a != b}")
-print(f"  a < b (小于): {a < b}")
-print(f"  a > b (大于): {a > b}")
-print(f"  a <= b (小于等于): {a <= b}")
-print(f"  a >= b (大于等于): {a >= b}")
+    a, b = 10, 20
 
-# 注意：Python 使用 == 比较值，is 比较身份（类似 ===）
-# Python 没有 ===，用 == 即可比较值
+    print(f"  a = {a}, b = {b}")
+    print(f"  a == b (等于): {a == b}")
+    print(f"  a != b (不等于): {a != b}")
+    print(f"  a < b (小于): {a < b}")
+    print(f"  a > b (大于): {a > b}")
+    print(f"  a <= b (小于等于): {a <= b}")
+    print(f"  a >= b (大于等于): {a >= b}")
+
+    # 注意：Python 使用 == 比较值，is 比较身份（类似 ===）
+    # Python 没有 ===，用 == 即可比较值
+
+    print()
 
-print()
 
 # ========== 5. 逻辑运算符 ==========
 
-print("=" * 60)
-print("5. 逻辑运算符（注意：Python 用 and/or/not，不是 &&/||/!）")
-print("=" * 60)
 
-age = 25
-has_license = True
+def section_5():
+    """5. 逻辑运算符（注意：Python 用 and/or/not，不是 &&/||/!）"""
+    print("=" * 60)
+    print("5. 逻辑运算符（注意：Python 用 and/or/not，不是 &&/||/!）")
+    print("=" * 60)
 
-# and（类似 JS 的 &&）
-if age >= 18 and has_license:
-    print("  可以开车")
+    age = 25
+    has_license = True
 
-# 对比 JS/TS:
-# if (age >= 18 && hasLicense) {
-#   console.log("可以开车");
-# }
+    # and（类似 JS 的 &&）
+    if age >= 18 and has_license:
+        print("  可以开车")
 
-# or（类似 JS 的 ||）
-if age < 18 or age > 65:
-    print("  需要特殊照顾")
+    # 对比 JS/TS:
+    # if (age >= 18 && hasLicense) {
+    #   console.log("可以开车");
+    # }
 
-# 对比 JS/TS:
-# if (age < 18 || age > 65) {
-#   console.log("需要特殊照顾");
-# }
+    # or（类似 JS 的 ||）
+    if age < 18 or age > 65:
+        print("  需要特殊照顾")
 
-# not（类似 JS 的 !）
-if not has_license:
-    print("  没有驾照")
-else:
-    print("  有驾照")
+    # 对比 JS/TS:
+    # if (age < 18 || age > 65) {
+    #   console.log("需要特殊照顾");
+    # }
 
-# 对比 JS/TS:
-# if (!hasLicense) {
-#   console.log("没有驾照");
-# } else {
-#   console.log("有驾照");
-# }
+    # not（类似 JS 的 !）
+    if not has_license:
+        print("  没有驾照")
+    else:
+        print("  有驾照")
+
+    # 对比 JS/TS:
+    # if (!hasLicense) {
+    #   console.log("没有驾照");
+    # } else {
+    #   console.log("有驾照");
+    # }
+
+    print()
 
-print()
 
 # ========== 6. 成员运算符（in 和 not in） ==========
 
-print("=" * 60)
-print("6. 成员运算符（in/not in，类似 JS 的 includes）")
-print("=" * 60)
 
-fruits = ["苹果", "香蕉", "橙子"]
-favorite = "苹果"
+def section_6():
+    """6. 成员运算符（in/not in，类似 JS 的 includes）"""
+    print("=" * 60)
+    print("6. 成员运算符（in/not in，类似 JS 的 includes）")
+    print("=" * 60)
+
+    fruits = ["苹果", "香蕉", "橙子"]
+    favorite = "苹果"
+
+    if favorite in fruits:
+        print(f"  {favorite} 在水果列表中")
+
+    # 对比 JS/TS:
+    # if (fruits.includes(favorite)) {
+    #   console.log(`${favorite} 在水果列表中`);
+    # }
+
+    if "西瓜" not in fruits:
+        print("  西瓜不在水果列表中")
 
-if favorite in fruits:
-    print(f"  {favorite} 在水果列表中")
+    # 💡 列表的 in 是线性扫描；几百万条的白名单/黑名单请用 membership.py
+    #    （frozenset 精确索引，或内存更省的 BloomFilter）
 
-# 对比 JS/TS:
-# if (fruits.includes(favorite)) {
-#   console.log(`${favorite} 在水果列表中`);
-# }
+    print()
 
-if "西瓜" not in fruits:
-    print("  西瓜不在水果列表中")
+    # 字符串检查
+    text = "Hello Python"
+    if "Python" in text:
+        print(f"  'Python' 在字符串 '{text}' 中")
 
-print()
+    # 对比 JS/TS:
+    # if (text.includes("Python")) {
+    #   console.log(`'Python' 在字符串 '${text}' 中`);
+    # }
 
-# 字符串检查
-text = "Hello Python"
-if "Python" in text:
-    print(f"  'Python' 在字符串 '{text}' 中")
+    # 💡 一篇文本要检查成千上万个关键词时，逐个 in 太慢，
+    #    可以用 keyword_search.py 的 KeywordMatcher 一次扫描全部命中
 
-# 对比 JS/TS:
-# if (text.includes("Python")) {
-#   console.log(`'Python' 在字符串 '${text}' 中`);
-# }
+    print()
 
-print()
 
 # ========== 7. 身份运算符（is 和 is not） ==========
 
-print("=" * 60)
-print("7. 身份运算符（is/is not，比较对象身份，类似 JS 的 ===）")
-print("=" * 60)
 
-a = [1, 2, 3]
-b = [1, 2, 3]
-c = a
+def section_7():
+    """7. 身份运算符（is/is not，比较对象身份，类似 JS 的 ===）"""
+    print("=" * 60)
+    print("7. 身份运算符（is/is not，比较对象身份，类似 JS 的 ===）")
+    print("=" * 60)
 
-print(f"  a = {a}")
-print(f"  b = {b}")
-print(f"  c = a")
+    a = [1, 2, 3]
+    b = [1, 2, 3]
+    c = a
 
-# == 比较值
-print(f"  a == b (值相等): {a == b}")  # True，值相同
+    print(f"  a = {a}")
+    print(f"  b = {b}")
+    print(f"  c = a")
 
-# is 比较身份（是否是同一个对象）
-print(f"  a is b (同一个对象): {a is b}")  # False，不同对象
-print(f"  a is c (同一个对象): {a is c}")  # True，同一个对象
+    # == 比较值
+    print(f"  a == b (值相等): {a == b}")  # True，值相同
 
-# None 的判断应该用 is，不是 ==
-value = None
-if value is None:
-    print("  value 是 None（推荐用 is None）")
+    # is 比较身份（是否是同一个对象）
+    print(f"  a is b (同一个对象): {a is b}")  # False，不同对象
+    print(f"  a is c (同一个对象): {a is c}")  # True，同一个对象
 
-# 对比 JS/TS:
-# const a = [1, 2, 3];
-# const b = [1, 2, 3];
-# console.log(a === b); // false（引用不同）
-# if (value === null) { ... }
+    # None 的判断应该用 is，不是 ==
+    value = None
+    if value is None:
+        print("  value 是 None（推荐用 is None）")
+
+    # 对比 JS/TS:
+    # const a = [1, 2, 3];
+    # const b = [1, 2, 3];
+    # console.log(a === b); // false（引用不同）
+    # if (value === null) { ... }
+
+    print()
 
-print()
 
 # ========== 8. 三元运算符（条件表达式） ==========
 
-print("=" * 60)
-print("8. 三元运算符（Python 的语法不同）")
-print("=" * 60)
 
-age = 20
+def section_8():
+    """8. 三元运算符（Python 的语法不同）"""
+    print("=" * 60)
+    print("8. 三元运算符（Python 的语法不同）")
+    print("=" * 60)
+
+    age = 20
+
+    # Python 三元运算符：x if condition else y
+    status = "成年" if age >= 18 else "未成年"
+    print(f"  年龄 {age}: {status}")
 
-# Python 三元运算符：x if condition else y
-status = "成年" if age >= 18 else "未成年"
-print(f"  年龄 {age}: {status}")
+    # 对比 JS/TS:
+    # const status = age >= 18 ? "成年" : "未成年";
 
-# 对比 JS/TS:
-# const status = age >= 18 ? "成年" : "未成年";
+    # 可以嵌套，但不推荐
+    score = 85
+    result = "优秀" if score >= 90 else "良好" if score >= 80 else "及格" if score >= 60 else "不及格"
+    print(f"  分数 {score}: {result}")
 
-# 可以嵌套，但不推荐
-score = 85
-result = "优秀" if score >= 90 else "良好" if score >= 80 else "及格" if score >= 60 else "不及格"
-print(f"  分数 {score}: {result}")
+    print()
 
-print()
 
 # ========== 9. 布尔值判断（Python 的 Truthy/Falsy） ==========
 
-print("=" * 60)
-print("9. 布尔值判断（Python 的 Truthy/Falsy 值）")
-print("=" * 60)
 
-# Python 中为 False 的值：
-# - False, None, 0, 0.0, "", [], {}, ()
+def section_9():
+    """9. 布尔值判断（Python 的 Truthy/Falsy 值）"""
+    print("=" * 60)
+    print("9. 布尔值判断（Python 的 Truthy/Falsy 值）")
+    print("=" * 60)
 
-# 检查列表是否为空
-my_list = []
+    # Python 中为 False 的值：
+    # - False, None, 0, 0.0, "", [], {}, ()
 
-# 推荐写法（Pythonic）
-if not my_list:
-    print("  列表为空")
+    # 检查列表是否为空
+    my_list = []
 
-# 对比 JS/TS:
-# if (myList.length === 0) { ... }
-# 或 if (!myList.length) { ... }
+    # 推荐写法（Pythonic）
+    if not my_list:
+        print("  列表为空")
 
-# 检查字符串是否为空
-name = ""
-if not name:
-    print("  姓名为空")
+    # 对比 JS/TS:
+    # if (myList.length === 0) { ... }
+    # 或 if (!myList.length) { ... }
 
-# 检查变量是否为 None
-value = None
-if value is None:
-    print("  value 是 None")
+    # 检查字符串是否为空
+    name = ""
+    if not name:
+        print("  姓名为空")
+
+    # 检查变量是否为 None
+    value = None
+    if value is None:
+        print("  value 是 None")
+
+    # 检查数字是否为 0
+    count = 0
+    if count:
+        print("  count 不为 0")
+    else:
+        print("  count 为 0")
 
-# 检查数字是否为 0
-count = 0
-if count:
-    print("  count 不为 0")
-else:
-    print("  count 为 0")
+    print()
 
-print()
 
 # ========== 10. 链式比较（Python 特有！） ==========
 
-print("=" * 60)
-print("10. 链式比较（Python 特有语法）")
-print("=" * 60)
 
-x = 15
+def section_10():
+    """10. 链式比较（Python 特有语法）"""
+    print("=" * 60)
+    print("10. 链式比较（Python 特有语法）")
+    print("=" * 60)
 
-# Python 支持链式比较
-if 10 <= x <= 20:
-    print(f"  {x} 在 10 到 20 之间")
+    x = 15
 
-# 对比 JS/TS（需要分开写）:
-# if (x >= 10 && x <= 20) {
-#   console.log(`${x} 在 10 到 20 之间`);
-# }
+    # Python 支持链式比较
+    if 10 <= x <= 20:
+        print(f"  {x} 在 10 到 20 之间")
 
-if 0 < x < 10:
-    print(f"  {x} 在 0 到 10 之间")
-else:
-    print(f"  {x} 不在 0 到 10 之间")
+    # 对比 JS/TS（需要分开写）:
+    # if (x >= 10 && x <= 20) {
+    #   console.log(`${x} 在 10 到 20 之间`);
+    # }
+
+    # 💡 反过来问"x 落在几十万个区间里的哪些"时，逐个链式比较是 O(n)，
+    #    可以用 intervals.py 的 IntervalIndex（区间树，O(log n + 命中数)）
+
+    if 0 < x < 10:
+        print(f"  {x} 在 0 到 10 之间")
+    else:
+        print(f"  {x} 不在 0 到 10 之间")
+
+    print()
 
-print()
 
 # ========== 11. 多条件判断示例 ==========
 
-print("=" * 60)
-print("11. 实际应用示例：多条件判断")
-print("=" * 60)
 
 def check_weather(temp, is_sunny, is_weekend):
     """根据多个条件判断天气"""
@@ -456,134 +516,209 @@ def check_weather(temp, is_sunny, is_weekend):
     else:
         return "天气一般"
 
-result1 = check_weather(25, True, True)
-print(f"  结果1: {result1}")
 
-result2 = check_weather(12, False, False)
-print(f"  结果2: {result2}")
+def section_11():
+    """11. 实际应用示例：多条件判断"""
+    print("=" * 60)
+    print("11. 实际应用示例：多条件判断")
+    print("=" * 60)
 
-print()
+    result1 = check_weather(25, True, True)
+    print(f"  结果1: {result1}")
 
-# ========== 12. 嵌套 if 语句 ==========
+    result2 = check_weather(12, False, False)
+    print(f"  结果2: {result2}")
 
-print("=" * 60)
-print("12. 嵌套 if 语句")
-print("=" * 60)
+    print()
 
-age = 20
-has_ticket = True
-has_id = True
 
-if age >= 18:
-    print("  年龄符合要求")
-    if has_ticket:
-        print("    有门票")
-        if has_id:
-            print("      可以进入")
+# ========== 12. 嵌套 if 语句 ==========
+
+
+def section_12():
+    """12. 嵌套 if 语句"""
+    print("=" * 60)
+    print("12. 嵌套 if 语句")
+    print("=" * 60)
+
+    age = 20
+    has_ticket = True
+    has_id = True
+
+    if age >= 18:
+        print("  年龄符合要求")
+        if has_ticket:
+            print("    有门票")
+            if has_id:
+                print("      可以进入")
+            else:
+                print("      需要身份证")
         else:
-            print("      需要身份证")
+            print("    需要门票")
     else:
-        print("    需要门票")
-else:
-    print("  年龄不符合要求")
+        print("  年龄不符合要求")
+
+    print()
 
-print()
 
 # ========== 13. 使用 all() 和 any() ==========
 
-print("=" * 60)
-print("13. all() 和 any() 函数（类似 JS 的 every/some）")
-print("=" * 60)
 
-scores = [85, 90, 78, 92, 88]
+def all_passed(scores):
+    """all()：所有成绩都及格"""
+    return all(score >= 60 for score in scores)
+
+
+def any_excellent(scores):
+    """any()：至少一个优秀成绩"""
+    return any(score >= 90 for score in scores)
+
 
-# all() - 所有条件都为 True
-if all(score >= 60 for score in scores):
-    print("  所有成绩都及格了")
+def section_13():
+    """13. all() 和 any() 函数（类似 JS 的 every/some）"""
+    print("=" * 60)
+    print("13. all() 和 any() 函数（类似 JS 的 every/some）")
+    print("=" * 60)
 
-# 对比 JS/TS:
-# if (scores.every(score => score >= 60)) {
-#   console.log("所有成绩都及格了");
-# }
+    scores = [85, 90, 78, 92, 88]
 
-# any() - 至少一个条件为 True
-if any(score >= 90 for score in scores):
-    print("  至少有一个优秀成绩")
+    # all() - 所有条件都为 True：all(score >= 60 for score in scores)
+    if all_passed(scores):
+        print("  所有成绩都及格了")
 
-# 对比 JS/TS:
-# if (scores.some(score => score >= 90)) {
-#   console.log("至少有一个优秀成绩");
-# }
+    # 对比 JS/TS:
+    # if (scores.every(score => score >= 60)) {
+    #   console.log("所有成绩都及格了");
+    # }
+
+    # any() - 至少一个条件为 True：any(score >= 90 for score in scores)
+    if any_excellent(scores):
+        print("  至少有一个优秀成绩")
+
+    # 对比 JS/TS:
+    # if (scores.some(score => score >= 90)) {
+    #   console.log("至少有一个优秀成绩");
+    # }
+
+    # 💡 数据量达到几十亿、分散在多个文件时，可以用 parallel_check.py 的
+    #    all_of/any_of：按块向量化判断、多进程并行，结果确定后立即停止
+
+    print()
 
-print()
 
 # ========== 14. match...case（Python 3.10+，类似 switch） ==========
 
-print("=" * 60)
-print("14. match...case（Python 3.10+，类似 JS 的 switch）")
-print("=" * 60)
-
-status = "success"
-
-match status:
-    case "success":
-        print("  操作成功")
-    case "error":
-        print("  操作失败")
-    case "pending":
-        print("  操作进行中")
-    case _:  # 默认情况（类似 default）
-        print("  未知状态")
-
-# 对比 JS/TS:
-# switch (status) {
-#   case "success":
-#     console.log("操作成功");
-#     break;
-#   case "error":
-#     console.log("操作失败");
-#     break;
-#   default:
-#     console.log("未知状态");
-# }
-
-print()
 
-# ========== 15. 条件判断最佳实践 ==========
+def section_14():
+    """14. match...case（Python 3.10+，类似 JS 的 switch）"""
+    print("=" * 60)
+    print("14. match...case（Python 3.10+，类似 JS 的 switch）")
+    print("=" * 60)
 
-print("=" * 60)
-print("15. 条件判断最佳实践")
-print("=" * 60)
+    status = "success"
 
-# ✅ 好的写法：直接判断布尔值
-is_valid = True
-if is_valid:
-    print("  ✅ 推荐：直接判断布尔值")
+    match status:
+        case "success":
+            print("  操作成功")
+        case "error":
+            print("  操作失败")
+        case "pending":
+            print("  操作进行中")
+        case _:  # 默认情况（类似 default）
+            print("  未知状态")
 
-# ❌ 不好的写法
-if is_valid == True:
-    print("  ❌ 不推荐：不需要 == True")
+    # 对比 JS/TS:
+    # switch (status) {
+    #   case "success":
+    #     console.log("操作成功");
+    #     break;
+    #   case "error":
+    #     console.log("操作失败");
+    #     break;
+    #   default:
+    #     console.log("未知状态");
+    # }
 
-# ✅ 检查 None 用 is
-value = None
-if value is None:
-    print("  ✅ 推荐：用 is None 检查")
+    # 💡 高频批量事件路由（每秒百万级）可以用 event_router.py 的 EventRouter：
+    #    字典分发表 + 按 handler 分组，每批每个 handler 只调用一次
 
-# ❌ 不好的写法
-if value == None:
-    print("  ❌ 不推荐：用 == None（虽然能工作，但不推荐）")
+    print()
 
-# ✅ 检查空列表/字符串
-items = []
-if not items:
-    print("  ✅ 推荐：直接判断是否为空")
 
-# ❌ 不好的写法
-if len(items) == 0:
-    print("  ❌ 不推荐：用 len() == 0")
+# ========== 15. 条件判断最佳实践 ==========
 
-print()
-print("=" * 60)
-print("if 条件判断演示完成！")
-print("=" * 60)
 
+def section_15():
+    """15. 条件判断最佳实践"""
+    print("=" * 60)
+    print("15. 条件判断最佳实践")
+    print("=" * 60)
+
+    # ✅ 好的写法：直接判断布尔值
+    is_valid = True
+    if is_valid:
+        print("  ✅ 推荐：直接判断布尔值")
+
+    # ❌ 不好的写法
+    if is_valid == True:
+        print("  ❌ 不推荐：不需要 == True")
+
+    # ✅ 检查 None 用 is
+    value = None
+    if value is None:
+        print("  ✅ 推荐：用 is None 检查")
+
+    # ❌ 不好的写法
+    if value == None:
+        print("  ❌ 不推荐：用 == None（虽然能工作，但不推荐）")
+
+    # ✅ 检查空列表/字符串
+    items = []
+    if not items:
+        print("  ✅ 推荐：直接判断是否为空")
+
+    # ❌ 不好的写法
+    if len(items) == 0:
+        print("  ❌ 不推荐：用 len() == 0")
+
+    print()
+
+
+SECTIONS = [
+    section_1,
+    section_2,
+    section_3,
+    section_4,
+    section_5,
+    section_6,
+    section_7,
+    section_8,
+    section_9,
+    section_10,
+    section_11,
+    section_12,
+    section_13,
+    section_14,
+    section_15,
+]
+
+
+def main():
+    """按顺序运行所有演示小节"""
+    for section in SECTIONS:
+        section()
+    finish()
+
+
+def finish():
+    """结尾横幅（parallel_runner 在最后一个小节之后也会调用）"""
+    print("=" * 60)
+    print("if 条件判断演示完成！")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    from output_sink import install
+
+    with install():  # 输出到文件、管道时按大块缓冲
+        main()
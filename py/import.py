@@ -1,3 +1,24 @@
 import math
 
-print(math.sqrt(16))
\ No newline at end of file
+
+def show_sqrt():
+    """调用导入的模块"""
+    print(math.sqrt(16))
+
+
+SECTIONS = [
+    show_sqrt,
+]
+
+
+def main():
+    """按顺序运行所有演示"""
+    for section in SECTIONS:
+        section()
+
+
+if __name__ == "__main__":
+    from output_sink import install
+
+    with install():  # 输出到文件、管道时按大块缓冲
+        main()
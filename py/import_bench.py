@@ -0,0 +1,253 @@
+"""
+============================================================================
+启动开销基准测试（python -X importtime）
+============================================================================
+
+📚 核心总结：
+-----------
+演示模块改成"每个小节一个函数 + if __name__ == "__main__""之后，
+import 它们只需要定义函数，不再运行几百行演示、也不再打印。
+
+本脚本在独立的子进程里用 `python -X importtime` 导入每个演示模块，
+读取 stderr 中该模块的 cumulative 耗时，同时统计导入期间写到 stdout
+的字节数（应该是 0），并与完整运行 main() 的耗时对比。
+改造之前 import 一个演示模块就等于运行一遍 main()，
+所以 main() 这一列也就是改造前 import 至少要付出的代价。
+
+py/ 下的工具模块（grading、intervals 等）通过 lazy_import 延迟加载
+NumPy；表格的"重依赖"一列列出导入期间真正加载了的 NumPy / requests，
+正常情况下应该为空。
+
+🔑 用法：
+-------
+   python import_bench.py                   # 演示模块，表格输出
+   python import_bench.py --all             # py/ 下的所有模块
+   python import_bench.py --json            # JSON 输出
+   python import_bench.py --repeat 5        # 每个模块测 5 次取中位数
+   python import_bench.py --profile grading # 导入树中每个模块的耗时
+   python import_bench.py --all --budget-ms 50
+                                            # 任何模块超出预算时退出码为 1
+
+⚠️ 注意：
+--------
+tests/test_import_bench.py 用 BUDGET_MS 对 py/ 下的所有模块跑同样的检查，
+导入变慢或重新在导入时加载 NumPy / requests 会让测试套件失败
+
+============================================================================
+"""
+
+import argparse
+import glob
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from demo_runner import DEMO_MODULES
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# 导入期间不应该被加载的重量级依赖
+HEAVY_MODULES = ("numpy", "requests")
+
+# 测试套件使用的导入预算（毫秒）：留出余量，避免负载高的 CI 机器上误报
+BUDGET_MS = 100
+
+
+def all_modules():
+    """py/ 目录下的所有模块名"""
+    return sorted(os.path.splitext(os.path.basename(p))[0]
+                  for p in glob.glob(os.path.join(HERE, "*.py")))
+
+
+def _run(code, importtime=False):
+    cmd = [sys.executable]
+    if importtime:
+        cmd += ["-X", "importtime"]
+    cmd += ["-c", code]
+    # 服务启动时通常有 .pyc 缓存；允许写字节码，避免把编译时间算进导入开销
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    return subprocess.run(cmd, cwd=HERE, env=env, capture_output=True, text=True, check=True)
+
+
+def parse_importtime(stderr):
+    """
+    解析 -X importtime 的输出
+
+    返回:
+        list: [(模块名, self 微秒, cumulative 微秒, 缩进层级), ...]，按输出顺序
+    """
+    entries = []
+    for line in stderr.splitlines():
+        # 格式: "import time: self [us] | cumulative | imported package"
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # 表头
+        name = parts[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append((name.strip(), int(parts[0]), int(parts[1]), depth))
+    return entries
+
+
+def _trace(module_name):
+    # 用 __import__ 而不是 importlib.import_module：后者不会出现在 -X importtime 输出中
+    proc = _run(f"__import__({module_name!r})", importtime=True)
+    return parse_importtime(proc.stderr), proc.stdout
+
+
+def _subtree(entries, module_name):
+    """取出 module_name 自己的导入树（-X importtime 先输出子模块，再输出父模块）"""
+    for end in range(len(entries) - 1, -1, -1):
+        name, _, _, depth = entries[end]
+        if name == module_name and depth == 0:
+            break
+    else:
+        raise RuntimeError(f"没有在 -X importtime 输出中找到 {module_name}")
+    start = end
+    while start > 0 and entries[start - 1][3] > 0:
+        start -= 1
+    return entries[start:end + 1]
+
+
+def import_cost(module_name):
+    """
+    在子进程中导入模块
+
+    返回:
+        (cumulative 微秒, 导入期间 stdout 字节数, 导入期间加载的重依赖列表)
+    """
+    entries, stdout = _trace(module_name)
+    tree = _subtree(entries, module_name)
+    heavy = sorted({name for name, _, _, _ in tree if name in HEAVY_MODULES})
+    return tree[-1][2], len(stdout.encode()), heavy
+
+
+def profile(module_name):
+    """
+    导入一个模块，返回其导入树中每个模块的耗时（按 cumulative 从大到小）
+
+    返回:
+        list: [{"module", "self_us", "cumulative_us", "depth"}, ...]
+    """
+    import_cost(module_name)  # 预热：生成 .pyc
+    entries, _ = _trace(module_name)
+    rows = [{"module": name, "self_us": self_us, "cumulative_us": cumulative, "depth": depth}
+            for name, self_us, cumulative, depth in _subtree(entries, module_name)]
+    return sorted(rows, key=lambda row: row["cumulative_us"], reverse=True)
+
+
+def run_cost(module_name):
+    """在子进程中完整运行 main()，返回耗时（微秒）"""
+    code = (
+        "import importlib, io, contextlib, time\n"
+        f"m = importlib.import_module({module_name!r})\n"
+        "start = time.perf_counter()\n"
+        "with contextlib.redirect_stdout(io.StringIO()):\n"
+        "    m.main()\n"
+        "print(int((time.perf_counter() - start) * 1e6))\n"
+    )
+    return int(_run(code).stdout.strip().splitlines()[-1])
+
+
+def measure(modules=DEMO_MODULES, repeat=3):
+    """
+    测量每个模块的导入开销（取中位数）；
+    演示模块还会测量完整运行 main() 的开销，其它模块的 main_us 为 None
+    """
+    report = []
+    for module_name in modules:
+        import_cost(module_name)  # 预热：生成 .pyc
+        imports = [import_cost(module_name) for _ in range(repeat)]
+        runs = [run_cost(module_name) for _ in range(repeat)] if module_name in DEMO_MODULES else None
+        report.append({
+            "module": module_name,
+            "import_us": statistics.median(cost for cost, _, _ in imports),
+            "import_stdout_bytes": max(size for _, size, _ in imports),
+            "heavy_imports": sorted({name for _, _, heavy in imports for name in heavy}),
+            "main_us": statistics.median(runs) if runs else None,
+        })
+    return report
+
+
+def check_budget(report, budget_ms):
+    """
+    --budget-ms 的检查：导入超出预算，或导入期间加载了重依赖
+
+    返回:
+        list: [(模块名, 原因), ...]，全部通过时为空列表
+    """
+    failures = []
+    for row in report:
+        if row["import_us"] > budget_ms * 1000:
+            failures.append((row["module"], f"{row['import_us'] / 1000:.1f} ms > {budget_ms} ms"))
+        elif row["heavy_imports"]:
+            failures.append((row["module"], f"加载了 {', '.join(row['heavy_imports'])}"))
+    return failures
+
+
+def print_profile(module_name, rows, top=20):
+    print("=" * 60)
+    print(f"{module_name} 的导入树（按 cumulative 排序，前 {top} 项）")
+    print("=" * 60)
+    print(f"  {'cumulative (µs)':>16}{'self (µs)':>12}  模块")
+    for row in rows[:top]:
+        indent = "  " * row["depth"]
+        print(f"  {row['cumulative_us']:>16}{row['self_us']:>12}  {indent}{row['module']}")
+
+
+def print_report(report):
+    print("=" * 60)
+    print("模块启动开销（python -X importtime，中位数）")
+    print("=" * 60)
+    print(f"  {'模块':<18}{'import (µs)':>12}{'import 输出':>12}{'main() (µs)':>14}  重依赖")
+    for row in report:
+        main_us = f"{row['main_us']:>14.0f}" if row["main_us"] is not None else f"{'-':>14}"
+        heavy = ", ".join(row["heavy_imports"]) or "-"
+        print(f"  {row['module'] + '.py':<18}{row['import_us']:>12.0f}"
+              f"{row['import_stdout_bytes']:>10} B{main_us}  {heavy}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="py/ 模块的启动开销")
+    parser.add_argument("--repeat", type=int, default=3, help="每个模块重复次数（默认 3）")
+    parser.add_argument("--all", action="store_true", help="测量 py/ 下的所有模块，而不只是演示模块")
+    parser.add_argument("--profile", metavar="MODULE", help="列出导入 MODULE 时每个模块的耗时")
+    parser.add_argument("--top", type=int, default=20, help="--profile 显示的行数（默认 20）")
+    parser.add_argument("--budget-ms", type=float,
+                        help="导入预算（毫秒）：任何模块超出预算，或导入期间加载了重依赖，退出码为 1")
+    parser.add_argument("--json", action="store_true", help="输出 JSON")
+    args = parser.parse_args(argv)
+
+    if args.profile:
+        rows = profile(args.profile)
+        if args.json:
+            print(json.dumps(rows, ensure_ascii=False, indent=2))
+        else:
+            print_profile(args.profile, rows, args.top)
+        return 0
+
+    report = measure(all_modules() if args.all else DEMO_MODULES, repeat=args.repeat)
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print_report(report)
+
+    if args.budget_ms is None:
+        return 0
+    failures = check_budget(report, args.budget_ms)
+    if not args.json:
+        print()
+        if failures:
+            for module_name, reason in failures:
+                print(f"  ❌ {module_name}.py: {reason}")
+        else:
+            print(f"  ✅ 所有模块的导入耗时都在 {args.budget_ms} ms 以内")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,21 @@
 # 创建一个测试文件 test_requests.py
-import requests
+import importlib.util
 import sys
 
-print("requests 版本:", requests.__version__)
-print("Python 路径:", sys.executable)
-print("模块路径:", requests.__file__)
\ No newline at end of file
+
+def main():
+    if importlib.util.find_spec("requests") is None:
+        print("未安装 requests，请先运行: pip install requests")
+        return 1
+
+    # 在函数里导入：被其它模块导入（或被 pytest 收集）时不会加载 requests
+    import requests
+
+    print("requests 版本:", requests.__version__)
+    print("Python 路径:", sys.executable)
+    print("模块路径:", requests.__file__)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
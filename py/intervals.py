@@ -0,0 +1,333 @@
+"""
+============================================================================
+区间索引（Interval Index）- 批量版的链式比较 10 <= x <= 20
+============================================================================
+
+📚 核心总结：
+-----------
+if.py 第 10 节用 `10 <= x <= 20` 判断一个值是否落在一个区间里。
+实际业务里常见的是反过来的问题："x 落在 50 万个配置区间里的哪些？"
+（价格档位、温度告警阈值……），每个事件都要回答一次。
+逐个区间做链式比较是 O(区间数)，太慢。
+
+IntervalIndex 用"中心区间树"（centered interval tree）回答这种
+穿刺查询（stabbing query）：
+1. 取所有区间起点的中位数作为中心点 center
+2. 完全在 center 左边的区间放左子树，完全在右边的放右子树，
+   跨过 center 的区间留在当前节点，并分别按起点、终点排好序
+3. 查询 x 时每层只走一边，当前节点用二分查找直接切出命中的区间
+   查询代价 O(log n + 命中数)
+
+增量插入/删除：新插入的区间先放在一个小缓冲区里线性检查，
+删除用"墓碑"标记；缓冲区和墓碑累积到一定比例时整体重建树。
+
+🔑 用法：
+-------
+   index = IntervalIndex([(10, 20, "中档"), (0, 9, "低档")])
+   index.stab(15)              # ['中档']
+   key = index.insert(12, 30, "促销")
+   index.delete(key)
+   index.stab_many([5, 15])    # [['低档'], ['中档']]
+
+⚠️ 注意：
+--------
+1. 区间是闭区间 [lo, hi]，与 lo <= x <= hi 一致
+2. stab() 返回结果的顺序不固定
+3. stab_many() 有 NumPy 时用 np.searchsorted 批量处理，否则逐个查询；
+   所有节点的 NumPy 数组在第一次批量查询时一次性创建并缓存（多占一份起点、终点的内存）
+
+============================================================================
+"""
+
+from bisect import bisect_left, bisect_right
+from itertools import chain
+
+from lazy_import import lazy_import
+
+np = lazy_import("numpy")  # NumPy 是可选依赖，第一次用到时才加载
+
+
+class _Node:
+    """中心区间树的一个节点"""
+
+    __slots__ = ("center", "left", "right", "starts", "start_keys", "ends", "end_keys",
+                 "start_values", "end_values", "arrays")
+
+    def __init__(self, center, overlapping, left, right):
+        self.center = center
+        self.left = left
+        self.right = right
+        by_start = overlapping  # _build 传进来时已经按起点排好序
+        by_end = sorted(overlapping, key=lambda item: item[2])
+        self.starts = [item[1] for item in by_start]
+        self.start_keys = [item[0] for item in by_start]
+        self.start_values = [item[3] for item in by_start]
+        self.ends = [item[2] for item in by_end]
+        self.end_keys = [item[0] for item in by_end]
+        self.end_values = [item[3] for item in by_end]
+        self.arrays = None  # (starts, ends) 的 NumPy 版本，见 IntervalIndex._prepare_arrays
+
+    def hits(self, x):
+        """当前节点上包含 x 的区间 key"""
+        if x < self.center:
+            # 所有区间都跨过 center（hi >= center > x），只需 lo <= x
+            return self.start_keys[:bisect_right(self.starts, x)]
+        # 所有区间都满足 lo <= center <= x，只需 hi >= x
+        return self.end_keys[bisect_left(self.ends, x):]
+
+
+def _build(items):
+    """items: 按起点排好序的 [(key, lo, hi, value), ...]，划分后子列表仍然有序"""
+    if not items:
+        return None
+    # 取起点的中位数作为中心：这个区间自身一定跨过 center，保证递归能结束
+    center = items[len(items) // 2][1]
+    left, right, overlapping = [], [], []
+    for item in items:
+        if item[2] < center:
+            left.append(item)
+        elif item[1] > center:
+            right.append(item)
+        else:
+            overlapping.append(item)
+    return _Node(center, overlapping, _build(left), _build(right))
+
+
+class IntervalIndex:
+    """支持穿刺查询、批量查询和增量插入/删除的区间索引"""
+
+    def __init__(self, intervals=(), rebuild_ratio=0.1):
+        """
+        参数:
+            intervals: [(lo, hi, value), ...]
+            rebuild_ratio: 缓冲区 + 墓碑超过总数的这个比例时重建树
+        """
+        self.rebuild_ratio = rebuild_ratio
+        self._intervals = {}    # key -> (lo, hi, value)
+        self._next_key = 0
+        self._root = None
+        self._pending = {}      # 尚未进树的新区间：key -> (lo, hi)
+        self._deleted = set()   # 树里已删除的 key
+        for lo, hi, value in intervals:
+            self._add(lo, hi, value)
+        self.rebuild()
+
+    def _add(self, lo, hi, value):
+        if lo > hi:
+            raise ValueError(f"区间下界不能大于上界: [{lo}, {hi}]")
+        key = self._next_key
+        self._next_key += 1
+        self._intervals[key] = (lo, hi, value)
+        return key
+
+    def __len__(self):
+        return len(self._intervals)
+
+    def rebuild(self):
+        """用当前所有区间重建树，清空缓冲区和墓碑"""
+        items = sorted(
+            ((key, lo, hi, value) for key, (lo, hi, value) in self._intervals.items()),
+            key=lambda item: item[1],
+        )
+        # 递归深度约为 log2(n)，不会触发递归上限
+        self._root = _build(items)
+        self._arrays_ready = False
+        self._pending.clear()
+        self._deleted.clear()
+
+    def _prepare_arrays(self):
+        """
+        给每个节点准备 NumPy 版本的 starts / ends（stab_many 第一次调用时执行一次）
+
+        列表每次传给 searchsorted 都要重新转换；节点很多、每个节点的区间很少，
+        所以一次性把所有节点拼成两个大数组再转换，每个节点只拿一个切片视图
+        """
+        nodes = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if node is not None:
+                nodes.append(node)
+                stack += (node.left, node.right)
+        starts = np.asarray(list(chain.from_iterable(node.starts for node in nodes)))
+        ends = np.asarray(list(chain.from_iterable(node.ends for node in nodes)))
+        offset = 0
+        for node in nodes:
+            stop = offset + len(node.starts)
+            node.arrays = (starts[offset:stop], ends[offset:stop])
+            offset = stop
+        self._arrays_ready = True
+
+    def _maybe_rebuild(self):
+        dirty = len(self._pending) + len(self._deleted)
+        if dirty > 64 and dirty > self.rebuild_ratio * len(self._intervals):
+            self.rebuild()
+
+    def insert(self, lo, hi, value):
+        """插入一个区间，返回可用于 delete() 的 key"""
+        key = self._add(lo, hi, value)
+        self._pending[key] = (lo, hi)
+        self._maybe_rebuild()
+        return key
+
+    def delete(self, key):
+        """按 key 删除区间"""
+        del self._intervals[key]
+        if self._pending.pop(key, None) is None:
+            self._deleted.add(key)
+        self._maybe_rebuild()
+
+    def _stab_keys(self, x):
+        keys = []
+        node = self._root
+        while node is not None:
+            keys.extend(node.hits(x))
+            if x < node.center:
+                node = node.left
+            elif x > node.center:
+                node = node.right
+            else:
+                break
+        if self._deleted:
+            deleted = self._deleted
+            keys = [k for k in keys if k not in deleted]
+        for key, (lo, hi) in self._pending.items():
+            if lo <= x <= hi:
+                keys.append(key)
+        return keys
+
+    def stab(self, x):
+        """返回所有满足 lo <= x <= hi 的区间的 value"""
+        intervals = self._intervals
+        return [intervals[k][2] for k in self._stab_keys(x)]
+
+    def stab_many(self, xs):
+        """
+        批量穿刺查询
+
+        参数:
+            xs: 查询值数组
+
+        返回:
+            list: 与 xs 等长，每个元素是该值命中的 value 列表
+        """
+        if np is None:
+            return [self.stab(x) for x in xs]
+
+        xs = np.asarray(xs)
+        if not self._arrays_ready:
+            self._prepare_arrays()
+        results = [[] for _ in range(len(xs))]
+        # 没有墓碑时直接收集节点上的 value，省掉每个命中一次的 key -> value 查找；
+        # 有墓碑时先收集 key，过滤掉已删除的再换成 value
+        by_key = bool(self._deleted)
+        # 每个节点只处理走到它的那部分查询，用 searchsorted 一次算出所有切点
+        stack = [(self._root, np.arange(len(xs)))]
+        while stack:
+            node, idx = stack.pop()
+            if node is None or not len(idx):
+                continue
+            values = xs[idx]
+            go_left = values < node.center
+            go_right = values > node.center
+
+            starts, ends = node.arrays
+            lidx = idx[go_left]
+            if len(lidx) and node.starts:
+                hits = node.start_keys if by_key else node.start_values
+                cuts = np.searchsorted(starts, values[go_left], side="right")
+                for i, cut in zip(lidx.tolist(), cuts.tolist()):
+                    results[i] += hits[:cut]
+            ridx = idx[~go_left]
+            if len(ridx) and node.ends:
+                hits = node.end_keys if by_key else node.end_values
+                cuts = np.searchsorted(ends, values[~go_left], side="left")
+                for i, cut in zip(ridx.tolist(), cuts.tolist()):
+                    results[i] += hits[cut:]
+
+            stack.append((node.left, lidx))
+            stack.append((node.right, idx[go_right]))
+
+        intervals = self._intervals
+        deleted = self._deleted
+        pending = [(lo, hi, intervals[k][2]) for k, (lo, hi) in self._pending.items()]
+        if by_key:
+            results = [[intervals[k][2] for k in keys if k not in deleted] for keys in results]
+        if pending:
+            for x, hits in zip(xs.tolist(), results):
+                hits.extend(value for lo, hi, value in pending if lo <= x <= hi)
+        return results
+
+
+def linear_stab(intervals, x):
+    """对照组：逐个区间做链式比较"""
+    return [value for lo, hi, value in intervals if lo <= x <= hi]
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    print("=" * 60)
+    print("1. 穿刺查询：x 落在哪些区间里")
+    print("=" * 60)
+
+    bands = [(0, 9, "低档"), (10, 20, "中档"), (15, 40, "高档"), (100, 200, "豪华")]
+    index = IntervalIndex(bands)
+    for x in [5, 15, 50]:
+        print(f"  x = {x}: {index.stab(x)}")
+
+    print()
+
+    print("=" * 60)
+    print("2. 增量插入和删除")
+    print("=" * 60)
+
+    key = index.insert(12, 30, "促销")
+    print(f"  插入 [12, 30] 后 stab(15): {index.stab(15)}")
+    index.delete(key)
+    print(f"  删除后 stab(15): {index.stab(15)}")
+    print(f"  stab_many([5, 15, 150]): {index.stab_many([5, 15, 150])}")
+
+    print()
+
+    print("=" * 60)
+    print("3. 性能对比：链式比较线性扫描 vs 区间索引")
+    print("=" * 60)
+
+    rng = random.Random(0)
+    n = 500_000
+    ranges = []
+    for i in range(n):
+        lo = rng.uniform(0, 1_000_000)
+        ranges.append((lo, lo + rng.uniform(0, 500), i))
+    queries = [rng.uniform(0, 1_000_000) for _ in range(200)]
+
+    start = time.perf_counter()
+    big = IntervalIndex(ranges)
+    print(f"  构建索引（{n:,} 个区间）: {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    expected = [sorted(linear_stab(ranges, x)) for x in queries]
+    print(f"  线性扫描 {len(queries)} 次:  {time.perf_counter() - start:.3f}s")
+
+    start = time.perf_counter()
+    got = [sorted(big.stab(x)) for x in queries]
+    print(f"  stab {len(queries)} 次:      {time.perf_counter() - start:.3f}s")
+    assert got == expected
+
+    many = [rng.uniform(0, 1_000_000) for _ in range(10_000)]
+    start = time.perf_counter()
+    expected = [big.stab(x) for x in many]
+    print(f"  stab 逐个 {len(many):,} 次:    {time.perf_counter() - start:.3f}s")
+
+    for label in ["首次，含准备数组", "再次"]:
+        start = time.perf_counter()
+        got = big.stab_many(many)
+        print(f"  stab_many 批量 {len(many):,} 个（{label}）: {time.perf_counter() - start:.3f}s")
+        assert [sorted(h) for h in got] == [sorted(h) for h in expected]
+
+    print()
+    print("=" * 60)
+    print("区间索引演示完成！")
+    print("=" * 60)
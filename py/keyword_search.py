@@ -0,0 +1,245 @@
+"""
+============================================================================
+多关键词匹配（Aho–Corasick）- 批量版的 "Python" in text
+============================================================================
+
+📚 核心总结：
+-----------
+if.py 第 6 节用 `"Python" in text` 检查一个关键词。
+如果每篇文档要检查几千个关键词，逐个 `kw in text` 的代价是
+O(关键词数 × 文本长度)。
+
+Aho–Corasick 自动机只需构建一次，之后每篇文本只扫描一遍：
+1. 把所有关键词插入一棵字典树（trie）
+2. 用 BFS 为每个节点计算失败指针（类似 KMP 的 next 数组）
+3. 扫描时逐字符转移状态，遇到终止节点就输出命中
+
+扫描代价是 O(文本长度 + 命中数)，与关键词个数无关。
+
+🔑 用法：
+-------
+   matcher = KeywordMatcher(["Python", "Java", "on"])
+   matcher.find_all("Hello Python")
+   # [(6, 'Python'), (10, 'on')]
+
+   # 分块流式扫描（关键词跨块也能命中）
+   scanner = matcher.scanner()
+   for chunk in chunks:
+       for pos, word in scanner.feed(chunk):
+           ...
+
+   # 持久化编译结果
+   matcher.save("keywords.json")
+   matcher = KeywordMatcher.load("keywords.json")
+
+⚠️ 注意：
+--------
+1. 匹配区分大小写；需要忽略大小写时，关键词和文本都先 .lower()
+2. 返回的是所有命中（包括重叠命中），位置是关键词起始下标
+
+============================================================================
+"""
+
+import json
+from collections import deque
+
+
+class KeywordMatcher:
+    """Aho–Corasick 多关键词匹配自动机"""
+
+    def __init__(self, keywords):
+        """
+        参数:
+            keywords: 关键词列表（重复和空字符串会被忽略）
+        """
+        self.keywords = list(dict.fromkeys(k for k in keywords if k))
+        self._build()
+
+    def _build(self):
+        goto = [{}]          # 每个状态的转移表：字符 -> 下一个状态
+        out = [[]]           # 每个状态命中的关键词下标
+
+        for index, word in enumerate(self.keywords):
+            state = 0
+            for char in word:
+                nxt = goto[state].get(char)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][char] = nxt
+                    goto.append({})
+                    out.append([])
+                state = nxt
+            out[state].append(index)
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and char not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(char, 0)
+                # 合并失败链上的输出，扫描时不用再沿失败指针回溯
+                out[nxt] = out[nxt] + out[fail[nxt]]
+
+        self._goto = goto
+        self._fail = fail
+        self._out = out
+
+    def _scan(self, text, state, offset):
+        """从给定状态扫描文本，返回 (命中列表, 结束状态)"""
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        keywords = self.keywords
+        hits = []
+        for i, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                end = offset + i + 1
+                for index in out[state]:
+                    word = keywords[index]
+                    hits.append((end - len(word), word))
+        return hits, state
+
+    def find_all(self, text):
+        """
+        扫描一段文本
+
+        返回:
+            list: [(起始位置, 关键词), ...]，按结束位置排序
+        """
+        hits, _ = self._scan(text, 0, 0)
+        return hits
+
+    def contains_any(self, text):
+        """文本中是否包含任意一个关键词（命中即停止）"""
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                return True
+        return False
+
+    def scanner(self):
+        """创建一个流式扫描器，用于分块输入"""
+        return StreamScanner(self)
+
+    def save(self, path):
+        """把编译好的自动机保存为 JSON 文件"""
+        data = {
+            "keywords": self.keywords,
+            "goto": self._goto,
+            "fail": self._fail,
+            "out": self._out,
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path):
+        """加载 save() 保存的自动机，不需要重新构建"""
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        matcher = cls.__new__(cls)
+        matcher.keywords = data["keywords"]
+        matcher._goto = data["goto"]
+        matcher._fail = data["fail"]
+        matcher._out = data["out"]
+        return matcher
+
+
+class StreamScanner:
+    """
+    流式扫描器：在多次 feed() 之间保留自动机状态，
+    因此跨越块边界的关键词也能被找到。位置是相对整个流的全局下标。
+    """
+
+    def __init__(self, matcher):
+        self.matcher = matcher
+        self.state = 0
+        self.offset = 0
+
+    def feed(self, chunk):
+        """扫描下一块文本，返回本块中结束的命中"""
+        hits, self.state = self.matcher._scan(chunk, self.state, self.offset)
+        self.offset += len(chunk)
+        return hits
+
+    def reset(self):
+        self.state = 0
+        self.offset = 0
+
+
+if __name__ == "__main__":
+    import os
+    import random
+    import tempfile
+    import time
+
+    print("=" * 60)
+    print("1. 一次扫描找出所有关键词")
+    print("=" * 60)
+
+    matcher = KeywordMatcher(["Python", "Java", "on", "Hello"])
+    text = "Hello Python"
+    for pos, word in matcher.find_all(text):
+        print(f"  位置 {pos}: '{word}'")
+
+    print()
+
+    print("=" * 60)
+    print("2. 分块流式扫描（关键词跨块）")
+    print("=" * 60)
+
+    scanner = matcher.scanner()
+    for chunk in ["Hello Py", "th", "on and Ja", "va"]:
+        for pos, word in scanner.feed(chunk):
+            print(f"  块 {chunk!r}: 位置 {pos} 命中 '{word}'")
+
+    print()
+
+    print("=" * 60)
+    print("3. 持久化自动机")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "keywords.json")
+        matcher.save(path)
+        loaded = KeywordMatcher.load(path)
+        print(f"  加载后结果一致: {loaded.find_all(text) == matcher.find_all(text)}")
+
+    print()
+
+    print("=" * 60)
+    print("4. 性能对比：逐个 in vs Aho–Corasick")
+    print("=" * 60)
+
+    rng = random.Random(0)
+    alphabet = "abcdefghijklmnopqrstuvwxyz"
+    keywords = ["".join(rng.choices(alphabet, k=rng.randint(5, 10))) for _ in range(2000)]
+    document = "".join(rng.choices(alphabet + " ", k=50_000)) + keywords[7]
+    big = KeywordMatcher(keywords)
+
+    start = time.perf_counter()
+    expected = {kw for kw in keywords if kw in document}
+    print(f"  逐个 in（{len(keywords)} 个关键词）: {time.perf_counter() - start:.4f}s")
+
+    start = time.perf_counter()
+    got = {word for _, word in big.find_all(document)}
+    print(f"  Aho–Corasick 一次扫描:       {time.perf_counter() - start:.4f}s")
+    assert got == expected
+
+    print()
+    print("=" * 60)
+    print("多关键词匹配演示完成！")
+    print("=" * 60)
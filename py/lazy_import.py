@@ -0,0 +1,145 @@
+"""
+============================================================================
+延迟导入（Lazy Import）- 用到时才真正加载重量级依赖
+============================================================================
+
+📚 核心总结：
+-----------
+import.py 在模块顶部 `import math`；math 很轻，没问题。
+但 NumPy、requests 这类依赖一导入就要几十到上百毫秒，
+而很多代码路径根本用不到它们（比如只对单个分数调用 grading.grade()）。
+
+lazy_import 基于标准库的 importlib.util.LazyLoader：
+1. 导入时只查找模块（find_spec），不执行模块代码
+2. 第一次访问模块属性（例如 np.asarray）时才真正执行导入
+3. 模块没有安装时返回 None，可以直接替换这种写法：
+
+   try:                                   np = lazy_import("numpy")
+       import numpy as np          ==>
+   except ImportError:
+       np = None
+
+🔑 用法：
+-------
+   from lazy_import import lazy_import, is_loaded
+
+   np = lazy_import("numpy")
+   is_loaded(np)      # False：还没有访问过任何属性
+   np.zeros(3)        # 这里才真正导入 NumPy
+   is_loaded(np)      # True
+
+⚠️ 注意：
+--------
+1. 模块里的语法错误、导入错误会推迟到第一次访问属性时才抛出
+2. isinstance(x, np.ndarray) 也会触发加载（因为访问了 np.ndarray）
+3. 已经导入过的模块直接从 sys.modules 返回
+4. 3.11 及以前标准库的 LazyLoader 不是线程安全的：多个线程同时第一次访问属性时，
+   其它线程可能拿到还没执行完的空模块（AttributeError）；
+   这里的 _LazyModule 在一把锁里完成加载，其它线程等加载结束再访问
+
+============================================================================
+"""
+
+import importlib.util
+import sys
+import threading
+import types
+
+
+class _LazyModule(types.ModuleType):
+    """第一次访问属性时在锁里执行模块代码，执行完才切换回普通模块"""
+
+    def __getattribute__(self, attr):
+        spec = object.__getattribute__(self, "__spec__")
+        state = spec.loader_state
+        with state["lock"]:
+            if object.__getattribute__(self, "__class__") is _LazyModule:
+                # 加载过程中同一线程的访问（模块执行时读写自己的属性）直接放行；
+                # 锁是 RLock，其它线程会一直等到加载完成
+                if state["loading"]:
+                    return types.ModuleType.__getattribute__(self, attr)
+                state["loading"] = True
+                namespace = types.ModuleType.__getattribute__(self, "__dict__")
+                before = state["__dict__"]
+                # 加载前就被外部修改过的属性，加载后要覆盖回去
+                updated = {key: value for key, value in namespace.items()
+                           if key not in before or before[key] is not value}
+                try:
+                    spec.loader.exec_module(self)
+                finally:
+                    state["loading"] = False
+                namespace.update(updated)
+                object.__setattr__(self, "__class__", types.ModuleType)
+        return getattr(self, attr)
+
+
+class _LazyLoader(importlib.util.LazyLoader):
+    """与标准库的 LazyLoader 相同，只是换成加锁的 _LazyModule"""
+
+    def exec_module(self, module):
+        module.__spec__.loader = self.loader
+        module.__loader__ = self.loader
+        module.__spec__.loader_state = {
+            "__dict__": module.__dict__.copy(),
+            "lock": threading.RLock(),
+            "loading": False,
+        }
+        module.__class__ = _LazyModule
+
+
+def lazy_import(name):
+    """
+    延迟导入一个模块
+
+    参数:
+        name: 模块名，例如 "numpy"
+
+    返回:
+        延迟加载的模块对象；模块没有安装时返回 None
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    try:
+        spec = importlib.util.find_spec(name)
+    except (ImportError, ValueError):
+        return None
+    if spec is None or spec.loader is None:
+        return None
+
+    loader = _LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+def is_loaded(module):
+    """模块是否已经真正执行过（延迟模块在第一次访问属性后才算加载）"""
+    if module is None:
+        return False
+    return not isinstance(module, _LazyModule)
+
+
+if __name__ == "__main__":
+    import time
+
+    print("=" * 60)
+    print("延迟导入演示")
+    print("=" * 60)
+
+    start = time.perf_counter()
+    np = lazy_import("numpy")
+    print(f"  lazy_import('numpy'): {(time.perf_counter() - start) * 1e3:.2f} ms, "
+          f"已加载: {is_loaded(np)}")
+
+    if np is None:
+        print("  未安装 NumPy")
+    else:
+        start = time.perf_counter()
+        np.zeros(3)
+        print(f"  第一次使用 np.zeros: {(time.perf_counter() - start) * 1e3:.2f} ms, "
+              f"已加载: {is_loaded(np)}")
+
+    print(f"  lazy_import('not_installed_pkg'): {lazy_import('not_installed_pkg')}")
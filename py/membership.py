@@ -0,0 +1,257 @@
+"""
+============================================================================
+成员索引（Membership Index）- 大集合上的 in 检查
+============================================================================
+
+📚 核心总结：
+-----------
+if.py 第 6 节用 `favorite in fruits` 检查一个元素是否在列表里。
+列表的 in 是线性扫描（O(n)），几百万条的白名单/黑名单每个请求都查一次，
+代价非常高。
+
+本模块提供两种索引：
+1. ExactIndex：基于 frozenset，哈希查找 O(1)，结果精确
+2. BloomFilter：布隆过滤器，占用内存只有集合的一小部分，
+   "不在"一定准确，"在"有可配置的误判率（false positive）；
+   可以保存到磁盘，并通过 mmap 加载，多个进程共享同一份页缓存
+
+🔑 选择建议：
+-----------
+   内存充足、需要精确结果    ->  ExactIndex（build_index 默认）
+   内存紧张的 worker         ->  BloomFilter，命中后再去精确数据源确认
+
+⚠️ 注意：
+--------
+1. BloomFilter 只接受 str/bytes（str 按 UTF-8 编码后哈希）
+2. BloomFilter 不支持删除元素
+3. 通过 mmap 加载的过滤器是只读的，不能再 add()
+
+============================================================================
+"""
+
+import hashlib
+import math
+import mmap
+import os
+import struct
+
+_MAGIC = b"BLM1"
+# 文件头：魔数、位数 m、哈希函数个数 k、已插入个数 n
+_HEADER = struct.Struct("<4sQQQ")
+
+
+class ExactIndex:
+    """基于 frozenset 的精确成员索引"""
+
+    def __init__(self, items):
+        self._items = frozenset(items)
+
+    def __contains__(self, item):
+        return item in self._items
+
+    def __len__(self):
+        return len(self._items)
+
+    def contains_many(self, items):
+        """批量检查，返回与输入顺序一致的布尔列表"""
+        lookup = self._items.__contains__
+        return [lookup(item) for item in items]
+
+
+class BloomFilter:
+    """
+    布隆过滤器
+
+    使用一次 blake2b 哈希得到两个 64 位整数 h1、h2，
+    再用 h1 + i * h2 生成 k 个位置（double hashing）。
+    步长 h2 取在 [1, m - 1] 之间：h2 为 0 或 m 的倍数时 k 个位置会落在同一位上。
+    """
+
+    def __init__(self, capacity, fp_rate=0.01):
+        """
+        参数:
+            capacity: 预计插入的元素个数
+            fp_rate: 期望误判率，例如 0.01 表示 1%
+        """
+        if capacity <= 0:
+            raise ValueError("capacity 必须大于 0")
+        if not 0 < fp_rate < 1:
+            raise ValueError("fp_rate 必须在 (0, 1) 之间")
+        m = math.ceil(-capacity * math.log(fp_rate) / (math.log(2) ** 2))
+        k = max(1, round(m / capacity * math.log(2)))
+        self._init(m, k, 0, bytearray((m + 7) // 8))
+
+    def _init(self, m, k, count, bits):
+        self.num_bits = m
+        self.num_hashes = k
+        self.count = count
+        self._bits = bits
+
+    @classmethod
+    def from_items(cls, items, fp_rate=0.01):
+        """根据一组元素直接构建过滤器"""
+        items = list(items)
+        bloom = cls(max(1, len(items)), fp_rate)
+        for item in items:
+            bloom.add(item)
+        return bloom
+
+    def _positions(self, item):
+        if isinstance(item, str):
+            item = item.encode("utf-8")
+        digest = hashlib.blake2b(item, digest_size=16).digest()
+        h1, h2 = struct.unpack("<QQ", digest)
+        m = self.num_bits
+        h2 = h2 % max(m - 1, 1) + 1
+        return [(h1 + i * h2) % m for i in range(self.num_hashes)]
+
+    def add(self, item):
+        bits = self._bits
+        for pos in self._positions(item):
+            bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        bits = self._bits
+        for pos in self._positions(item):
+            if not bits[pos >> 3] & (1 << (pos & 7)):
+                return False
+        return True
+
+    def __len__(self):
+        return self.count
+
+    def contains_many(self, items):
+        """批量检查，返回与输入顺序一致的布尔列表"""
+        return [item in self for item in items]
+
+    @property
+    def nbytes(self):
+        """位数组占用的字节数"""
+        return len(self._bits)
+
+    def save(self, path):
+        """保存到磁盘：文件头 + 原始位数组"""
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, self.num_bits, self.num_hashes, self.count))
+            f.write(self._bits)
+
+    @classmethod
+    def load(cls, path, use_mmap=True):
+        """
+        从磁盘加载
+
+        参数:
+            path: save() 写出的文件
+            use_mmap: True 时通过只读 mmap 映射位数组，不拷贝到进程内存
+
+        返回:
+            BloomFilter
+
+        异常:
+            ValueError: 不是 BloomFilter 文件，或者文件被截断
+        """
+        with open(path, "rb") as f:
+            header = f.read(_HEADER.size)
+            if len(header) != _HEADER.size:
+                raise ValueError(f"{path} 不是 BloomFilter 文件（文件头不完整）")
+            magic, m, k, count = _HEADER.unpack(header)
+            if magic != _MAGIC:
+                raise ValueError(f"{path} 不是 BloomFilter 文件")
+            if m == 0 or k == 0:
+                raise ValueError(f"{path} 的文件头无效: m={m}, k={k}")
+            size = os.fstat(f.fileno()).st_size - _HEADER.size
+            if size != (m + 7) // 8:
+                raise ValueError(f"{path} 的位数组长度为 {size} 字节，应为 {(m + 7) // 8} 字节")
+            if use_mmap:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                bits = memoryview(mapped)[_HEADER.size:]
+            else:
+                bits = bytearray(f.read())
+        bloom = cls.__new__(cls)
+        bloom._init(m, k, count, bits)
+        return bloom
+
+
+def build_index(items, bloom=False, fp_rate=0.01):
+    """
+    构建成员索引
+
+    参数:
+        items: 白名单/黑名单元素
+        bloom: True 时构建 BloomFilter，否则构建精确的 ExactIndex
+        fp_rate: BloomFilter 的误判率
+
+    返回:
+        ExactIndex 或 BloomFilter，都支持 in 和 contains_many()
+    """
+    if bloom:
+        return BloomFilter.from_items(items, fp_rate)
+    return ExactIndex(items)
+
+
+if __name__ == "__main__":
+    import sys
+    import tempfile
+    import time
+
+    print("=" * 60)
+    print("1. 精确索引（frozenset）")
+    print("=" * 60)
+
+    fruits = build_index(["苹果", "香蕉", "橙子"])
+    print(f"  '苹果' in fruits: {'苹果' in fruits}")
+    print(f"  contains_many(['西瓜', '香蕉']): {fruits.contains_many(['西瓜', '香蕉'])}")
+
+    print()
+
+    print("=" * 60)
+    print("2. 布隆过滤器：内存占用与误判率")
+    print("=" * 60)
+
+    n = 200_000
+    allowlist = [f"user-{i}" for i in range(n)]
+    exact = build_index(allowlist)
+    bloom = build_index(allowlist, bloom=True, fp_rate=0.01)
+
+    set_bytes = sys.getsizeof(exact._items)
+    print(f"  frozenset 大小（不含元素本身）: {set_bytes / 1024:.0f} KB")
+    print(f"  BloomFilter 位数组: {bloom.nbytes / 1024:.0f} KB, k = {bloom.num_hashes}")
+
+    probes = [f"other-{i}" for i in range(50_000)]
+    false_positives = sum(bloom.contains_many(probes))
+    print(f"  实测误判率: {false_positives / len(probes):.4f}（目标 0.01）")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "allowlist.bloom")
+        bloom.save(path)
+        loaded = BloomFilter.load(path)
+        assert all(loaded.contains_many(allowlist[:1000]))
+        print(f"  mmap 加载后检查 'user-42': {'user-42' in loaded}")
+        del loaded
+
+    print()
+
+    print("=" * 60)
+    print("3. 性能对比：list in vs frozenset vs BloomFilter")
+    print("=" * 60)
+
+    queries = [f"user-{i}" for i in range(n - 200, n)] + probes[:200]
+
+    start = time.perf_counter()
+    expected = [q in allowlist for q in queries]
+    print(f"  list in ({len(queries)} 次):     {time.perf_counter() - start:.4f}s")
+
+    start = time.perf_counter()
+    got = exact.contains_many(queries)
+    print(f"  frozenset:            {time.perf_counter() - start:.4f}s")
+    assert got == expected
+
+    start = time.perf_counter()
+    got = bloom.contains_many(queries)
+    print(f"  BloomFilter:          {time.perf_counter() - start:.4f}s")
+
+    print()
+    print("=" * 60)
+    print("成员索引演示完成！")
+    print("=" * 60)
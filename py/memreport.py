@@ -0,0 +1,255 @@
+"""
+============================================================================
+内存报告（memreport.py）- tracemalloc 快照对比 + 超线性增长检测
+============================================================================
+
+📚 核心总结：
+-----------
+for.py、func.py 的演示里构建了 squares、even_squares、high_scorers、
+profile 这样的列表和字典；数据只有几个元素时看不出内存代价，
+放大到几十万、几百万个元素时就很关键了。
+
+本模块在 tracemalloc 下运行代码，比较运行前后的快照：
+1. 峰值（peak）：运行过程中比运行前多占用的最大内存
+2. 保留（retained）：运行结束后仍然占着的内存（包括返回值）
+3. 按分配位置（文件:行号）分组，找出内存花在哪一行
+4. 同一个用例按多个输入规模运行，拟合 内存 ∝ size^k 中的指数 k；
+   k 明显大于 1 的用例会被标记为"超线性增长"
+
+两种模式：
+- 用例模式（默认）：使用 bench.py 中注册的用例（setup(size) 生成输入），
+  包括 for.squares、for.even_squares、func.process_students（high_scorers）、
+  func.create_profile 等，可以放大输入规模
+- 小节模式（--sections func）：逐个运行演示小节（输入是固定的），
+  看每个小节本身的内存占用
+
+🔑 用法：
+-------
+   python memreport.py                              # 全部用例，默认规模
+   python memreport.py -k squares -k profile --sizes 1000,100000,1000000
+   python memreport.py --sections func              # func.py 的每个小节
+   python memreport.py --json mem.json
+
+⚠️ 注意：
+--------
+1. tracemalloc 只跟踪 Python 分配器分配的内存，不包括 C 扩展自己 malloc 的内存
+2. 开启 tracemalloc 后代码会变慢好几倍，这里的耗时没有参考意义
+3. 小于 min_bytes（默认 64 KiB）的测量不参与增长拟合，避免常数开销干扰；
+   有效规模少于 3 个时不做判断，报告里标为"数据不足"
+4. 用例模式默认使用 MEMORY_SIZES 里的规模（比 bench.py 计时用的规模大，
+   保证内存随规模增长的用例至少有 3 个有效规模）；内存不随规模增长的用例
+   （all_any、max_loop 等）和受递归深度限制的 factorial 始终是"数据不足"
+
+============================================================================
+"""
+
+import argparse
+import contextlib
+import gc
+import json
+import math
+import os
+import tracemalloc
+
+from demo_runner import NullWriter
+
+SUPERLINEAR_EXPONENT = 1.15  # 拟合指数超过它就标记为超线性
+
+# 内存报告的默认规模：每个规模的峰值都超过 64 KiB；没有列出的用例使用 bench.py 的规模
+MEMORY_SIZES = {
+    "func.sum_numbers": (10_000, 100_000, 1_000_000),
+    "func.process_students": (20_000, 50_000, 200_000),
+    "func.create_profile": (1_000, 10_000, 100_000),
+    "if.grade_chain": (10_000, 100_000, 1_000_000),
+    "for.squares": (10_000, 100_000, 1_000_000),
+    "for.even_squares": (10_000, 100_000, 1_000_000),
+    "str.fstring": (1_000, 10_000, 100_000),
+    "str.format": (1_000, 10_000, 100_000),
+    "str.concat": (1_000, 10_000, 100_000),
+}
+
+
+def _site(trace):
+    frame = trace.traceback[0]
+    return f"{os.path.basename(frame.filename)}:{frame.lineno}"
+
+
+def trace_call(run, *args, top=5):
+    """
+    在 tracemalloc 下运行 run(*args)
+
+    返回:
+        dict: peak_bytes、retained_bytes、sites（[(分配位置, 保留字节, 块数), ...]）
+    """
+    gc.collect()
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        with contextlib.redirect_stdout(NullWriter()):
+            result = run(*args)
+        current, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+        del result
+    finally:
+        if started:
+            tracemalloc.stop()
+
+    # 去掉测量代码自身（快照、重定向 stdout）的分配
+    filters = [tracemalloc.Filter(False, path)
+               for path in (tracemalloc.__file__, contextlib.__file__, __file__)]
+    diff = after.filter_traces(filters).compare_to(before.filter_traces(filters), "lineno")
+    sites = [(_site(stat), stat.size_diff, stat.count_diff)
+             for stat in diff if stat.size_diff > 0]
+    return {
+        "peak_bytes": peak - base,
+        "retained_bytes": max(current - base, 0),
+        "sites": sites[:top],
+    }
+
+
+def growth_exponent(sizes, values, min_bytes=64 * 1024, min_points=3):
+    """
+    最小二乘拟合 log(value) = k * log(size) + c，返回 k
+
+    少于 min_points 个有效点（value >= min_bytes）时返回 None：
+    dict、list 按 2 的幂扩容，只用两个点拟合很容易把台阶误判成超线性
+    """
+    points = [(math.log(s), math.log(v)) for s, v in zip(sizes, values) if v >= min_bytes and s > 0]
+    if len(points) < min_points:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    var_x = sum((x - mean_x) ** 2 for x, _ in points)
+    if var_x == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / var_x
+
+
+def report_cases(cases, sizes=None, top=5, min_bytes=64 * 1024):
+    """
+    按多个规模运行 bench.py 的用例
+
+    参数:
+        sizes: 所有用例共用的规模；None 时按 MEMORY_SIZES，没有列出的用例用自带的规模
+
+    返回:
+        list: 每个用例一个 dict：name、runs（每个规模的 trace_call 结果）、
+              points（峰值 >= min_bytes 的规模数）、
+              exponent（峰值内存的增长指数，数据不足时为 None）、superlinear
+    """
+    report = []
+    for case in cases:
+        runs = []
+        for size in sizes or MEMORY_SIZES.get(case.name, case.sizes):
+            run, args = case.setup(size)
+            result = trace_call(run, *args, top=top)
+            result["size"] = size
+            runs.append(result)
+            del run, args
+        exponent = growth_exponent([r["size"] for r in runs], [r["peak_bytes"] for r in runs],
+                                   min_bytes)
+        report.append({
+            "name": case.name,
+            "runs": runs,
+            "points": sum(r["peak_bytes"] >= min_bytes for r in runs),
+            "exponent": exponent,
+            "superlinear": exponent is not None and exponent > SUPERLINEAR_EXPONENT,
+        })
+    return report
+
+
+def report_sections(module_name, top=5):
+    """逐个运行演示模块的小节，返回 [{name, title, peak_bytes, retained_bytes, sites}, ...]"""
+    import demo_runner
+
+    report = []
+    for number, title, func in demo_runner.discover(module_name):
+        result = trace_call(func, top=top)
+        result.update(name=f"{module_name}.{func.__name__}", title=title)
+        report.append(result)
+    return report
+
+
+def _kib(n):
+    return f"{n / 1024:,.1f}"
+
+
+def print_cases(report):
+    print(f"  {'用例':<22}{'size':>10}{'峰值 KiB':>14}{'保留 KiB':>14}  主要分配位置")
+    for item in report:
+        for run in item["runs"]:
+            site = run["sites"][0][0] if run["sites"] else "-"
+            print(f"  {item['name']:<22}{run['size']:>10}{_kib(run['peak_bytes']):>14}"
+                  f"{_kib(run['retained_bytes']):>14}  {site}")
+        if item["exponent"] is not None:
+            flag = "  ⚠️ 超线性增长" if item["superlinear"] else ""
+            print(f"  {'':<22}{'增长指数':>8} k = {item['exponent']:.2f}{flag}")
+        else:
+            print(f"  {'':<22}数据不足：{item['points']} 个规模的峰值达到 min_bytes"
+                  f"（至少需要 3 个），未判断")
+
+
+def print_sites(item):
+    largest = item["runs"][-1]
+    print(f"  {item['name']} (size={largest['size']}) 保留内存按分配位置:")
+    for site, size, count in largest["sites"]:
+        print(f"    {_kib(size):>12} KiB {count:>10} 块  {site}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="tracemalloc 内存报告")
+    parser.add_argument("-k", dest="keywords", action="append", help="只运行名字包含关键字的用例")
+    parser.add_argument("--sizes", help="逗号分隔的输入规模，默认使用用例自带的规模")
+    parser.add_argument("--sections", metavar="MODULE", help="改为逐个运行演示模块的小节")
+    parser.add_argument("--top", type=int, default=5, help="每次运行保留的分配位置数（默认 5）")
+    parser.add_argument("--min-bytes", type=int, default=64 * 1024,
+                        help="参与增长拟合的最小峰值（默认 65536）")
+    parser.add_argument("--json", metavar="PATH", help="把报告写入 JSON 文件")
+    args = parser.parse_args(argv)
+
+    print("=" * 60)
+    print("内存报告（tracemalloc）")
+    print("=" * 60)
+
+    if args.sections:
+        report = report_sections(args.sections, args.top)
+        print(f"  {'小节':<18}{'峰值 KiB':>12}{'保留 KiB':>12}  主要分配位置")
+        for item in report:
+            site = item["sites"][0][0] if item["sites"] else "-"
+            print(f"  {item['name']:<18}{_kib(item['peak_bytes']):>12}"
+                  f"{_kib(item['retained_bytes']):>12}  {site}")
+    else:
+        import bench
+
+        sizes = [int(s) for s in args.sizes.split(",")] if args.sizes else None
+        report = report_cases(bench.select(args.keywords), sizes, args.top, args.min_bytes)
+        print_cases(report)
+        print()
+        for item in report:
+            if item["runs"][-1]["sites"]:
+                print_sites(item)
+        flagged = [item["name"] for item in report if item["superlinear"]]
+        unknown = [item["name"] for item in report if item["exponent"] is None]
+        judged = len(report) - len(unknown)
+        print()
+        if flagged:
+            print(f"  ⚠️ 内存超线性增长（k > {SUPERLINEAR_EXPONENT}）: {', '.join(flagged)}")
+        elif judged:
+            scope = "所有" if not unknown else f"已判断的 {judged} 个"
+            print(f"  ✅ {scope}用例的内存都没有随输入规模超线性增长")
+        if unknown:
+            print(f"  ❔ 数据不足、未判断（{len(unknown)} 个）: {', '.join(unknown)}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print()
+        print(f"  报告已写入 {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,399 @@
+"""
+============================================================================
+函数埋点（Metrics）- 调用次数、耗时直方图、错误数 + Prometheus / JSON 导出
+============================================================================
+
+📚 核心总结：
+-----------
+process_students、check_weather、apply_operation 在服务里被调用时，
+我们看不到时间花在了哪里。本模块提供一个按需开启的埋点层：
+
+1. instrument(func) 包装一个函数，记录：
+   - 调用次数、抛出异常的次数
+   - 耗时直方图（复用 event_router.LatencyHistogram：按 2 的幂分桶，
+     记录开销固定，分位数相对误差不超过 2 倍，类似 HDR Histogram 的思路）
+   同一个线程里重入（递归）时只统计最外层的一次调用
+2. enable() 把 func.py / if.py 里的热点函数替换成包装版本；
+   disable() 换回原函数 —— 不开启时调用的就是原函数，没有任何额外开销
+   factorial 这样的自递归函数，递归调用直接走未包装的副本，不多占栈帧
+3. 导出方式：
+   - serve(port)：本地 HTTP 端点 /metrics，Prometheus 文本格式
+     （直方图的 le 桶固定为 256ns ~ 34s 的 2 的幂，再加 +Inf）
+   - dump_json(path) / dump_json_at_exit(path)：写成 JSON
+
+🔑 用法：
+-------
+   import metrics
+   metrics.enable()                    # 埋点 func.py / if.py 的默认函数
+   metrics.serve(9464)                 # curl http://127.0.0.1:9464/metrics
+   metrics.dump_json_at_exit("metrics.json")
+
+   @metrics.instrument                 # 也可以直接装饰自己的函数
+   def handle(request): ...
+
+   # 通过环境变量开启（demo_runner.py 启动时会读取）：
+   IMBER_METRICS=json:metrics.json python demo_runner.py func
+   IMBER_METRICS=http:9464 python demo_runner.py --all
+
+⚠️ 注意：
+--------
+1. enable() 替换的是模块里的全局名字：模块内部的其它函数调用它也会被统计；
+   但在 enable() 之前用 from func import factorial 拿到的引用不受影响
+2. 统计数据用一把锁保护，可以在多线程中使用
+3. 直接用 @instrument 装饰的递归函数，每层递归仍然多一个包装函数的栈帧
+   （只统计最外层），可用的递归深度减半
+
+============================================================================
+"""
+
+import atexit
+import dis
+import functools
+import json
+import os
+import threading
+import time
+import types
+
+from demo_runner import load
+from event_router import LatencyHistogram
+
+# enable() 默认埋点的函数：{模块名: [函数名, ...]}
+DEFAULT_TARGETS = {
+    "func": ["factorial", "sum_numbers", "apply_operation", "process_students"],
+    "if": ["check_weather"],
+}
+
+# Prometheus 直方图固定输出的桶：2**8 ns（256ns）到 2**35 ns（约 34s）
+PROMETHEUS_BUCKETS = range(8, 36)
+
+
+class FunctionStats:
+    """一个函数的调用统计"""
+
+    __slots__ = ("calls", "errors", "histogram")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.histogram = LatencyHistogram()
+
+    def to_dict(self):
+        return dict(calls=self.calls, errors=self.errors, **self.histogram.summary())
+
+
+class Registry:
+    """按函数名保存统计数据"""
+
+    def __init__(self):
+        self.stats = {}
+        self._lock = threading.Lock()
+
+    def get(self, name):
+        """取出（必要时创建）一个函数的统计对象"""
+        with self._lock:
+            stats = self.stats.get(name)
+            if stats is None:
+                stats = self.stats[name] = FunctionStats()
+            return stats
+
+    def record(self, name, seconds, failed):
+        stats = self.get(name)
+        with self._lock:
+            stats.calls += 1
+            stats.errors += failed
+            stats.histogram.record(seconds)
+
+    def snapshot(self):
+        """所有函数的统计摘要：{函数名: {calls, errors, count, mean, p50, p99, max}}"""
+        with self._lock:
+            return {name: stats.to_dict() for name, stats in sorted(self.stats.items())}
+
+    def reset(self):
+        """清零所有统计（已经包装好的函数继续使用原来的统计对象）"""
+        with self._lock:
+            for stats in self.stats.values():
+                stats.__init__()
+
+
+REGISTRY = Registry()
+
+
+def instrument(func=None, *, name=None, registry=REGISTRY):
+    """
+    包装函数，记录调用次数、耗时和异常次数
+
+    可以直接使用 @instrument，也可以 @instrument(name="自定义名字")
+    """
+    if func is None:
+        return functools.partial(instrument, name=name, registry=registry)
+
+    label = name or f"{func.__module__}.{func.__qualname__}"
+    # 包装时就取出统计对象和锁，每次调用省掉一次字典查找
+    stats = registry.get(label)
+    lock = registry._lock
+    clock = time.perf_counter
+    local = threading.local()  # 当前线程是否已经在这个函数里
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if getattr(local, "active", False):
+            return func(*args, **kwargs)  # 重入：只统计最外层
+        local.active = True
+        start = clock()
+        failed = True
+        try:
+            result = func(*args, **kwargs)
+            failed = False
+            return result
+        finally:
+            elapsed = clock() - start
+            local.active = False
+            with lock:
+                stats.calls += 1
+                stats.errors += failed
+                stats.histogram.record(elapsed)
+
+    wrapper.__instrumented__ = func
+    return wrapper
+
+
+_originals = {}  # (模块名, 函数名) -> 原函数
+
+
+def _hidden_name(attr):
+    return f"_{attr}__uninstrumented"
+
+
+def _recursive_copy(func, hidden):
+    """
+    复制一份函数，函数体里对自身名字的全局引用改成 hidden，
+    这样递归调用不经过包装函数；函数体里没有（或不只是以全局变量读取）自身名字时返回 None
+    """
+    code = func.__code__
+    name = func.__name__
+    if name not in code.co_names:
+        return None
+    for instruction in dis.get_instructions(code):
+        if instruction.argval == name and instruction.opname != "LOAD_GLOBAL":
+            return None  # 还当作属性名等使用，不能整体改名
+    names = tuple(hidden if n == name else n for n in code.co_names)
+    copy = types.FunctionType(code.replace(co_names=names), func.__globals__, name,
+                              func.__defaults__, func.__closure__)
+    copy.__kwdefaults__ = func.__kwdefaults__
+    return functools.update_wrapper(copy, func)
+
+
+def enable(targets=None, registry=REGISTRY):
+    """
+    把目标模块里的函数替换成带埋点的版本
+
+    参数:
+        targets: {模块名: [函数名, ...]}，默认 DEFAULT_TARGETS
+
+    返回:
+        被埋点的函数全名列表，例如 ["func.factorial", ...]
+    """
+    enabled = []
+    for module_name, names in (targets or DEFAULT_TARGETS).items():
+        module = load(module_name)
+        for attr in names:
+            key = (module_name, attr)
+            if key not in _originals:
+                original = getattr(module, attr)
+                _originals[key] = original
+                target = original
+                copy = _recursive_copy(original, _hidden_name(attr))
+                if copy is not None:
+                    setattr(module, _hidden_name(attr), copy)
+                    target = copy
+                setattr(module, attr, instrument(target, name=f"{module_name}.{attr}",
+                                                 registry=registry))
+            enabled.append(f"{module_name}.{attr}")
+    return enabled
+
+
+def disable():
+    """换回所有原函数"""
+    for (module_name, attr), original in _originals.items():
+        module = load(module_name)
+        setattr(module, attr, original)
+        module.__dict__.pop(_hidden_name(attr), None)
+    _originals.clear()
+
+
+def is_enabled():
+    return bool(_originals)
+
+
+# ========== 导出 ==========
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def to_prometheus(registry=REGISTRY):
+    """生成 Prometheus 文本格式（text/plain; version=0.0.4）"""
+    lines = [
+        "# HELP imber_function_calls_total Number of calls.",
+        "# TYPE imber_function_calls_total counter",
+    ]
+    with registry._lock:
+        items = sorted(registry.stats.items())
+        histograms = [(name, dict(stats.histogram.buckets), stats.histogram.count,
+                       stats.histogram.total) for name, stats in items]
+        for name, stats in items:
+            lines.append(f'imber_function_calls_total{{function="{_escape(name)}"}} {stats.calls}')
+        lines += ["# HELP imber_function_errors_total Number of calls that raised.",
+                  "# TYPE imber_function_errors_total counter"]
+        for name, stats in items:
+            lines.append(f'imber_function_errors_total{{function="{_escape(name)}"}} {stats.errors}')
+
+    lines += ["# HELP imber_function_duration_seconds Call latency.",
+              "# TYPE imber_function_duration_seconds histogram"]
+    for name, buckets, count, total in histograms:
+        label = f'function="{_escape(name)}"'
+        # 每个直方图都输出同一组桶（没有数据的桶也输出），不同函数、不同时刻的数据才能对齐
+        cumulative = sum(n for bucket, n in buckets.items() if bucket < PROMETHEUS_BUCKETS[0])
+        for bucket in PROMETHEUS_BUCKETS:
+            cumulative += buckets.get(bucket, 0)
+            # 第 bucket 个桶里的耗时都小于 2**bucket 纳秒
+            le = f"{(1 << bucket) / 1e9:.9g}"
+            lines.append(f'imber_function_duration_seconds_bucket{{{label},le="{le}"}} {cumulative}')
+        lines.append(f'imber_function_duration_seconds_bucket{{{label},le="+Inf"}} {count}')
+        lines.append(f"imber_function_duration_seconds_sum{{{label}}} {total:.9g}")
+        lines.append(f"imber_function_duration_seconds_count{{{label}}} {count}")
+    return "\n".join(lines) + "\n"
+
+
+def serve(port=9464, host="127.0.0.1", registry=REGISTRY):
+    """
+    在后台线程启动 /metrics 端点
+
+    返回:
+        ThreadingHTTPServer；停止时调用 server.shutdown()
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = to_prometheus(registry).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def dump_json(path, registry=REGISTRY):
+    """把统计摘要写成 JSON 文件"""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(registry.snapshot(), f, ensure_ascii=False, indent=2)
+
+
+def dump_json_at_exit(path, registry=REGISTRY):
+    """进程退出时把统计摘要写成 JSON 文件"""
+    atexit.register(dump_json, path, registry)
+
+
+def enable_from_env(variable="IMBER_METRICS"):
+    """
+    根据环境变量开启埋点：
+        "1"            只开启埋点
+        "json:PATH"    开启埋点，退出时写 JSON
+        "http:PORT"    开启埋点，并在 127.0.0.1:PORT/metrics 提供数据
+    多个设置用逗号分隔；没有设置时什么都不做
+    """
+    value = os.environ.get(variable, "").strip()
+    if not value or value == "0":
+        return False
+    enable()
+    for item in value.split(","):
+        kind, _, arg = item.partition(":")
+        if kind == "json" and arg:
+            dump_json_at_exit(arg)
+        elif kind == "http" and arg:
+            serve(int(arg))
+    return True
+
+
+if __name__ == "__main__":
+    import contextlib
+    import io
+    import urllib.request
+
+    func = load("func")
+    if_demo = load("if")
+
+    print("=" * 60)
+    print("1. 未开启 / 开启埋点时 apply_operation 的调用开销")
+    print("=" * 60)
+
+    def bench(n=200_000):
+        apply, op = func.apply_operation, func.add_op
+        start = time.perf_counter()
+        for i in range(n):
+            apply(i, 3, op)
+        return (time.perf_counter() - start) / n * 1e9
+
+    off = min(bench() for _ in range(3))
+    enable()
+    on = min(bench() for _ in range(3))
+    disable()
+    print(f"  未开启: {off:.0f} ns/次（调用的就是原函数）")
+    print(f"  已开启: {on:.0f} ns/次（每次额外 {on - off:.0f} ns）")
+
+    print()
+
+    print("=" * 60)
+    print("2. 运行 func.py / if.py 的热点函数，通过 HTTP 导出")
+    print("=" * 60)
+
+    REGISTRY.reset()
+    enable()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in range(1000):
+            func.factorial(i % 50)
+            if_demo.check_weather(i % 40 - 5, i % 2 == 0, i % 7 < 2)
+        students = [{"name": f"学生{i}", "score": i % 101} for i in range(10_000)]
+        func.process_students(students, lambda s: s["score"] >= 60, lambda s: s["score"])
+    try:
+        func.apply_operation(1, 0, lambda x, y: x / y)
+    except ZeroDivisionError:
+        pass
+
+    server = serve(0)
+    url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+    text = urllib.request.urlopen(url).read().decode()
+    server.shutdown()
+    server.server_close()
+    disable()
+
+    print(f"  GET {url}")
+    for line in text.splitlines():
+        if "calls_total{" in line or "errors_total{" in line or "_count{" in line:
+            print(f"    {line}")
+
+    print()
+    print(f"  {'函数':<24}{'调用':>8}{'错误':>6}{'p50':>12}{'p99':>12}")
+    for name, s in REGISTRY.snapshot().items():
+        if not s["calls"]:
+            continue
+        print(f"  {name:<24}{s['calls']:>8}{s['errors']:>6}"
+              f"{s['p50'] * 1e6:>10.1f}µs{s['p99'] * 1e6:>10.1f}µs")
+
+    print()
+    print("=" * 60)
+    print("函数埋点演示完成！")
+    print("=" * 60)
@@ -0,0 +1,274 @@
+"""
+============================================================================
+输出缓冲（Output Sink）- 终端按行缓冲，文件/管道按大块缓冲，可选后台线程写出
+============================================================================
+
+📚 核心总结：
+-----------
+for.py、func.py、if.py 的循环里每处理一项就 print 一次。
+输出量大、又被重定向到文件或管道时，时间主要花在 write 系统调用上：
+- sys.stdout 写文件/管道时只有 8 KiB 缓冲，每 8 KiB 一次系统调用
+- print(..., flush=True) 或终端的行缓冲：每一行一次系统调用
+
+本模块提供一个输出端（sink）：
+1. 终端（TTY）：按行缓冲，每行立即可见，和原来的体验一样
+2. 文件、管道：1 MiB 的大块缓冲，系统调用次数减少上百倍
+3. threaded=True：由后台线程执行 write 系统调用，主线程只负责格式化；
+   队列有上限，写出跟不上时主线程会等待（背压），内存不会无限增长
+
+sink 本身是标准的 io.TextIOWrapper（底层是 io.BufferedWriter），
+print、sys.stdout.write 的路径都在 C 里完成，没有额外的 Python 层开销。
+install() 把它换成 sys.stdout，教程脚本里的 print 不需要任何修改。
+
+🔑 用法：
+-------
+   from output_sink import install
+
+   with install():                       # 在这个范围内 print 都经过 sink
+       main()
+
+   with install(threaded=True): ...      # 由后台线程写出
+
+   sink = open_sink(fd)                  # 直接写某个文件描述符
+   sink.write(f"{i}\n")
+
+   python output_sink.py                             # 基准测试：1000 万行写入临时文件
+   python output_sink.py --target pipe --lines 1000000
+
+⚠️ 注意：
+--------
+1. 块缓冲下 stdout 和 stderr 的输出先后顺序可能和代码顺序不一致；
+   install() 退出时（包括异常退出）会先把缓冲写完，再打印异常
+2. sys.stdout 已经被替换成没有文件描述符的对象（例如 redirect_stdout(StringIO)）时，
+   install() 不做任何替换
+3. 后台线程写出失败（例如管道被关闭）时，下一次写入或关闭时抛出同样的 OSError
+4. 写本地文件时系统调用本身很便宜，print 自己的开销（转换参数、分两次写入
+   内容和换行）才是大头；热循环里直接 sink.write(f"...\n") 能再快一倍左右
+
+============================================================================
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import queue
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+DEFAULT_BUFFER_SIZE = 1 << 20  # 文件、管道的块缓冲大小：1 MiB
+
+
+def _write_all(fd, data):
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+class ThreadedWriter(io.RawIOBase):
+    """把写入交给后台线程执行的原始（raw）输出流"""
+
+    def __init__(self, fd, max_pending=8):
+        """
+        参数:
+            fd: 要写入的文件描述符（不会被关闭）
+            max_pending: 最多排队多少块数据，超过时 write 等待
+        """
+        self._fd = fd
+        self._queue = queue.Queue(max_pending)
+        self._error = None
+        self._thread = threading.Thread(target=self._drain, name="output-sink", daemon=True)
+        self._thread.start()
+
+    def writable(self):
+        return True
+
+    def fileno(self):
+        return self._fd
+
+    def write(self, data):
+        if self._error is not None:
+            raise self._error
+        # BufferedWriter 会复用传进来的内存，必须复制一份再交给线程
+        self._queue.put(bytes(data))
+        return len(data)
+
+    def _drain(self):
+        while True:
+            data = self._queue.get()
+            try:
+                if data is None:
+                    return
+                if self._error is None:
+                    _write_all(self._fd, data)
+            except OSError as e:
+                self._error = e
+            finally:
+                self._queue.task_done()
+
+    def flush(self):
+        """等待已经排队的数据全部写出"""
+        if not self.closed:
+            self._queue.join()
+        if self._error is not None:
+            raise self._error
+
+    def close(self):
+        if not self.closed:
+            self._queue.put(None)
+            self._thread.join()
+        super().close()
+        if self._error is not None:
+            raise self._error
+
+
+def open_sink(fd, line_buffering=None, buffer_size=None, threaded=False,
+              encoding="utf-8", errors="strict"):
+    """
+    在文件描述符上创建文本输出流（关闭它不会关闭 fd）
+
+    参数:
+        fd: 文件描述符，例如 sys.stdout.fileno()
+        line_buffering: 是否按行刷新；默认 fd 是终端时按行，否则按块
+        buffer_size: 缓冲大小；默认按行时 8 KiB，按块时 DEFAULT_BUFFER_SIZE
+        threaded: 是否由后台线程执行写入
+    """
+    if line_buffering is None:
+        line_buffering = os.isatty(fd)
+    if buffer_size is None:
+        buffer_size = io.DEFAULT_BUFFER_SIZE if line_buffering else DEFAULT_BUFFER_SIZE
+    raw = ThreadedWriter(fd) if threaded else io.FileIO(fd, "w", closefd=False)
+    buffered = io.BufferedWriter(raw, buffer_size)
+    return io.TextIOWrapper(buffered, encoding=encoding, errors=errors,
+                            line_buffering=line_buffering)
+
+
+@contextlib.contextmanager
+def install(**options):
+    """
+    在 with 范围内把 sys.stdout 换成 open_sink() 创建的输出流
+
+    参数与 open_sink 相同（fd、编码默认取自当前的 sys.stdout）
+    """
+    stdout = sys.stdout
+    try:
+        fd = stdout.fileno()
+    except (AttributeError, OSError, ValueError):
+        # 已经被重定向到内存（StringIO 等），保持原样
+        yield stdout
+        return
+
+    stdout.flush()
+    options.setdefault("encoding", getattr(stdout, "encoding", None) or "utf-8")
+    options.setdefault("errors", getattr(stdout, "errors", None) or "strict")
+    sink = open_sink(fd, **options)
+    sys.stdout = sink
+    try:
+        yield sink
+    finally:
+        sys.stdout = stdout
+        sink.close()
+
+
+# ========== 基准测试 ==========
+
+def _print_lines(n, flush=False):
+    for i in range(n):
+        print(i, flush=flush)
+
+
+def _write_lines(n):
+    write = sys.stdout.write
+    for i in range(n):
+        write(f"{i}\n")
+
+
+@contextlib.contextmanager
+def _target(kind):
+    """产生一个写入目标的文件描述符：临时文件、/dev/null 或者由子进程读取的管道"""
+    if kind == "file":
+        with tempfile.TemporaryFile() as f:
+            yield f.fileno()
+    elif kind == "devnull":
+        fd = os.open(os.devnull, os.O_WRONLY)
+        try:
+            yield fd
+        finally:
+            os.close(fd)
+    else:
+        reader = subprocess.Popen(
+            [sys.executable, "-c",
+             "import sys\nwhile sys.stdin.buffer.read1(1 << 20): pass"],
+            stdin=subprocess.PIPE)
+        try:
+            yield reader.stdin.fileno()
+        finally:
+            reader.stdin.close()
+            reader.wait()
+
+
+def _plain_stdout(fd):
+    """重定向到文件/管道时 Python 默认的 sys.stdout：8 KiB 缓冲"""
+    return open(fd, "w", encoding="utf-8", closefd=False)
+
+
+def benchmark(lines, kind, repeat=1):
+    """
+    比较写出 lines 行的耗时（每种方式取 repeat 次中最快的一次）
+
+    返回:
+        list: [(方式, 每行纳秒, 总耗时秒, 实际测量行数), ...]
+    """
+    variants = [
+        ("print（默认 sys.stdout，8 KiB 缓冲）", lambda fd: _plain_stdout(fd), _print_lines, 1),
+        ("print(flush=True)（逐行写出）", lambda fd: _plain_stdout(fd),
+         lambda n: _print_lines(n, flush=True), 10),
+        ("print → sink（1 MiB 块缓冲）", lambda fd: open_sink(fd, line_buffering=False),
+         _print_lines, 1),
+        ("print → sink（后台线程写出）",
+         lambda fd: open_sink(fd, line_buffering=False, threaded=True), _print_lines, 1),
+        ("sink.write(f\"{i}\\n\")", lambda fd: open_sink(fd, line_buffering=False),
+         _write_lines, 1),
+    ]
+    results = []
+    for name, make, emit, divisor in variants:
+        # 逐行写出太慢，只测量一部分行数再换算
+        n = max(lines // divisor, 1)
+        timings = []
+        for _ in range(repeat):
+            with _target(kind) as fd:
+                stream = make(fd)
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(stream):
+                    emit(n)
+                stream.close()  # 包括把缓冲写完（后台线程：等待写完）
+                timings.append(time.perf_counter() - start)
+        per_line = min(timings) / n
+        results.append((name, per_line * 1e9, per_line * lines, n))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="输出缓冲基准测试")
+    parser.add_argument("--lines", type=int, default=10_000_000, help="行数（默认 1000 万）")
+    parser.add_argument("--target", choices=["file", "pipe", "devnull"], default="file",
+                        help="写入目标（默认临时文件）")
+    parser.add_argument("--repeat", type=int, default=1, help="每种方式运行几次，取最快（默认 1）")
+    args = parser.parse_args(argv)
+
+    print("=" * 60)
+    print(f"写出 {args.lines:,} 行到 {args.target}")
+    print("=" * 60)
+    results = benchmark(args.lines, args.target, args.repeat)
+    base = results[0][2]
+    print(f"  {'方式':<34}{'ns/行':>8}{'总耗时':>10}{'相对 print':>12}")
+    for name, ns, total, measured in results:
+        note = "" if measured == args.lines else f"  （按 {measured:,} 行换算）"
+        print(f"  {name:<34}{ns:>8.0f}{total:>9.2f}s{base / total:>11.2f}x{note}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+"""
+============================================================================
+并行短路 all() / any() - 大数据量版本
+============================================================================
+
+📚 核心总结：
+-----------
+if.py 第 13 节用 `all(score >= 60 for score in scores)` 和
+`any(score >= 90 for score in scores)` 检查成绩。
+生成器表达式一次只处理一个元素、只用一个 CPU 核；
+数据有几十亿条、分散在多个文件里时就太慢了。
+
+all_of / any_of 的做法：
+1. 把数据切成块（chunk），每块用向量化谓词一次判断
+   （例如 lambda a: a >= 60，a 是 NumPy 数组）
+2. 多个块交给进程池并行计算
+3. 一旦结果确定（all 遇到 False / any 遇到 True），
+   取消还没开始的任务，不再提交新任务
+4. 返回结果的同时报告实际扫描了多少数据
+
+🔑 数据来源（sources）可以是：
+----------------------------
+   - 一个 NumPy 数组或列表
+   - 多个数组/列表组成的列表
+   - 多个 .npy 文件路径（用 mmap 方式打开，按块读取）
+
+⚠️ 注意：
+--------
+1. 使用进程池时，谓词必须能被 pickle（模块级函数，不能是 lambda）；
+   lambda 只能配合 executor="thread" 使用
+2. NumPy 的向量化运算会释放 GIL，所以线程池通常也能用满多核
+3. 已经在运行的块无法中途打断，只会丢弃它们的结果
+
+============================================================================
+"""
+
+import os
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from dataclasses import dataclass
+
+from lazy_import import is_loaded, lazy_import
+
+np = lazy_import("numpy")  # NumPy 是可选依赖，第一次用到时才加载
+
+
+@dataclass
+class CheckResult:
+    """all_of / any_of 的返回值，可以直接当布尔值用"""
+
+    value: bool
+    scanned: int        # 实际判断过的元素个数
+    total: int          # 数据总量
+    chunks: int         # 实际完成的块数
+
+    def __bool__(self):
+        return self.value
+
+    @property
+    def fraction(self):
+        """扫描比例"""
+        return self.scanned / self.total if self.total > 0 else 1.0
+
+
+def _load(source):
+    """.npy 路径用 mmap 打开，其它数据原样返回"""
+    if isinstance(source, (str, os.PathLike)):
+        if np is None:
+            raise ImportError("读取 .npy 文件需要 NumPy：pip install numpy")
+        return np.load(source, mmap_mode="r")
+    return source
+
+
+def _is_source(obj):
+    if isinstance(obj, (list, tuple, str, os.PathLike)):
+        return True
+    # 还没加载 NumPy 时参数不可能是 ndarray，不必为了 isinstance 触发加载
+    return is_loaded(np) and isinstance(obj, np.ndarray)
+
+
+def _normalize(sources):
+    """统一成"来源列表"：单个数组/列表/路径会被包成只有一个元素的列表"""
+    if is_loaded(np) and isinstance(sources, np.ndarray):
+        return [sources]
+    if isinstance(sources, (str, os.PathLike)):
+        return [sources]
+    sources = list(sources)
+    if sources and not _is_source(sources[0]):
+        return [sources]  # 单个普通列表
+    return sources
+
+
+def _tasks(sources, chunk_size):
+    """生成 (来源下标, 起始, 结束) 任务，同时统计总量"""
+    tasks = []
+    total = 0
+    for index, source in enumerate(sources):
+        n = len(_load(source))
+        total += n
+        for start in range(0, n, chunk_size):
+            tasks.append((index, start, min(start + chunk_size, n)))
+    return tasks, total
+
+
+def _run_chunk(source, start, stop, predicate, want):
+    """
+    在一个块上计算谓词
+
+    返回:
+        (块内是否出现了 want 值, 块大小)
+    """
+    data = _load(source)[start:stop]
+    if np is not None:
+        result = predicate(np.asarray(data))
+        if np.ndim(result) == 0:
+            hit = bool(result) == want
+        else:
+            hit = bool(result.any()) if want else not bool(result.all())
+    else:
+        flags = [predicate(x) for x in data]
+        hit = any(flags) if want else not all(flags)
+    return hit, stop - start
+
+
+def _search(sources, predicate, want, chunk_size, workers, executor):
+    sources = _normalize(sources)
+    tasks, total = _tasks(sources, chunk_size)
+    if not tasks:
+        return CheckResult(not want, 0, total, 0)
+
+    pool_cls = ProcessPoolExecutor if executor == "process" else ThreadPoolExecutor
+    workers = workers or os.cpu_count() or 1
+    scanned = 0
+    done_chunks = 0
+    found = False
+
+    with pool_cls(max_workers=workers) as pool:
+        pending = set()
+        queue = iter(tasks)
+
+        def submit_next():
+            task = next(queue, None)
+            if task is not None:
+                index, start, stop = task
+                source = sources[index]
+                if not isinstance(source, (str, os.PathLike)):
+                    # 内存数据只把当前块发给 worker，避免每次序列化整个数组
+                    source, start, stop = source[start:stop], 0, stop - start
+                pending.add(pool.submit(
+                    _run_chunk, source, start, stop, predicate, want
+                ))
+
+        # 只保持 workers * 2 个任务在途，结果确定后就不再提交
+        for _ in range(workers * 2):
+            submit_next()
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                hit, size = future.result()
+                scanned += size
+                done_chunks += 1
+                found = found or hit
+            if found:
+                for future in pending:
+                    future.cancel()
+                break
+            for _ in done:
+                submit_next()
+
+    value = found if want else not found
+    return CheckResult(value, scanned, total, done_chunks)
+
+
+def all_of(sources, predicate, chunk_size=1_000_000, workers=None, executor="process"):
+    """
+    并行版 all()：所有元素都满足谓词时返回真
+
+    参数:
+        sources: 数组 / 列表 / 多个数组或 .npy 文件路径
+        predicate: 向量化谓词，输入一个块，返回布尔数组
+        chunk_size: 每块元素个数
+        workers: 并行数，默认等于 CPU 核数
+        executor: "process"（进程池）或 "thread"（线程池）
+
+    返回:
+        CheckResult，可直接用于 if 判断，scanned 表示实际扫描量
+    """
+    return _search(sources, predicate, False, chunk_size, workers, executor)
+
+
+def any_of(sources, predicate, chunk_size=1_000_000, workers=None, executor="process"):
+    """并行版 any()：至少一个元素满足谓词时返回真，参数同 all_of"""
+    return _search(sources, predicate, True, chunk_size, workers, executor)
+
+
+def passed(scores):
+    """及格判断（模块级函数，可以在进程池中使用）"""
+    return scores >= 60
+
+
+def excellent(scores):
+    """优秀判断（模块级函数，可以在进程池中使用）"""
+    return scores >= 90
+
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    print("=" * 60)
+    print("1. 小数据：与 all()/any() 结果一致")
+    print("=" * 60)
+
+    scores = [85, 90, 78, 92, 88]
+    print(f"  all_of 及格: {bool(all_of(scores, passed, executor='thread'))}")
+    print(f"  any_of 优秀: {bool(any_of(scores, excellent, executor='thread'))}")
+
+    print()
+
+    if np is None:
+        print("  未安装 NumPy，跳过大数据演示")
+    else:
+        print("=" * 60)
+        print("2. 多个 .npy 文件 + 提前终止")
+        print("=" * 60)
+
+        rng = np.random.default_rng(0)
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = []
+            for i in range(4):
+                part = rng.integers(60, 90, size=5_000_000, dtype=np.int16)
+                if i == 1:
+                    part[123] = 95  # 第二个文件里有一个优秀成绩
+                path = os.path.join(tmp, f"scores-{i}.npy")
+                np.save(path, part)
+                paths.append(path)
+
+            start = time.perf_counter()
+            result = any_of(paths, excellent)
+            print(f"  any_of 优秀: {result.value}, 扫描 {result.scanned:,}/{result.total:,}"
+                  f"（{result.fraction:.0%}），耗时 {time.perf_counter() - start:.3f}s")
+
+            start = time.perf_counter()
+            result = all_of(paths, passed)
+            print(f"  all_of 及格: {result.value}, 扫描 {result.scanned:,}/{result.total:,}"
+                  f"（{result.fraction:.0%}），耗时 {time.perf_counter() - start:.3f}s")
+
+            big = np.concatenate([np.load(p) for p in paths])
+            start = time.perf_counter()
+            expected = all(score >= 60 for score in big[:2_000_000])
+            elapsed = time.perf_counter() - start
+            print(f"  对比：生成器 all() 只扫 200 万个就要 {elapsed:.3f}s（结果 {expected}）")
+
+    print()
+    print("=" * 60)
+    print("并行 all/any 演示完成！")
+    print("=" * 60)
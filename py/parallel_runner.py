@@ -0,0 +1,175 @@
+"""
+============================================================================
+并行小节运行器（Parallel Runner）- 多进程运行演示小节，输出顺序确定
+============================================================================
+
+📚 核心总结：
+-----------
+demo_runner.py 按顺序一个接一个地运行小节。每个小节都是独立的函数
+（只依赖模块级的定义），所以可以分给多个进程同时运行：
+
+1. 用 demo_runner.discover 找出所有模块的所有小节，每个小节是一个任务
+2. 任务提交到进程池（ProcessPoolExecutor），每个进程自己导入演示模块
+3. 每个小节的 stdout 单独捕获，不会和其它小节的输出交错
+4. 按"模块顺序 + 小节编号"依次打印：前面的小节一完成就立即打印，
+   每个模块的最后一个小节之后再打印它的结尾横幅（demo_runner.finish），
+   输出和串行运行（python for.py）完全相同，与进程的完成顺序无关
+5. 最后汇总每个小节的墙上时间和 CPU 时间、总墙上时间和相对串行的加速比
+
+🔑 用法：
+-------
+   python parallel_runner.py                    # 所有模块，进程数 = CPU 核数
+   python parallel_runner.py func if -j 4       # 只运行 func.py 和 if.py
+   python parallel_runner.py --repeat 2000 --quiet
+                                                # 每个小节重复 2000 次（放大工作量），只看汇总
+
+⚠️ 注意：
+--------
+1. 小节本身只需要几十微秒时，进程间通信的开销会超过并行的收益；
+   工作量放大（--repeat）之后，N 核上总耗时才会接近串行的 1/N
+2. 小节里修改的模块全局变量只在当前进程内生效，不会影响其它小节
+3. --repeat 大于 1 时只保留第一次运行的输出
+4. 进程数超过 CPU 核数没有收益：进程只是轮流占用 CPU，小节的墙上时间会变长
+
+============================================================================
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import demo_runner
+
+
+@dataclass
+class SectionResult:
+    """一个小节的运行结果"""
+
+    module: str
+    number: int
+    title: str
+    output: str
+    seconds: float  # 墙上时间
+    cpu: float  # 本进程的 CPU 时间
+    error: str = None
+
+
+def run_section(module_name, number, repeat=1):
+    """
+    运行一个小节并捕获输出（在工作进程中执行）
+
+    返回:
+        SectionResult；小节抛出异常时 error 是异常的 traceback 文本
+    """
+    _, title, func = demo_runner.discover(module_name)[number - 1]
+    buffer = io.StringIO()
+    error = None
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    try:
+        with contextlib.redirect_stdout(buffer):
+            func()
+        with contextlib.redirect_stdout(demo_runner.NullWriter()):
+            for _ in range(repeat - 1):
+                func()
+    except Exception:
+        error = traceback.format_exc()
+    seconds = time.perf_counter() - start
+    cpu = time.process_time() - cpu_start
+    return SectionResult(module_name, number, title, buffer.getvalue(), seconds, cpu, error)
+
+
+def units(modules=None):
+    """按确定的顺序列出所有任务：[(模块名, 小节编号), ...]"""
+    return [(module_name, number)
+            for module_name in (modules or demo_runner.DEMO_MODULES)
+            for number, _, _ in demo_runner.discover(module_name)]
+
+
+def run_parallel(tasks, jobs=None, repeat=1, on_result=None):
+    """
+    在进程池中运行任务，按任务顺序返回结果
+
+    参数:
+        tasks: [(模块名, 小节编号), ...]
+        jobs: 进程数，默认 os.cpu_count()；1 表示在当前进程中串行运行
+        repeat: 每个小节运行几次
+        on_result: 每得到一个"按顺序的下一个"结果时调用，用于边运行边打印
+    """
+    results = []
+    if jobs == 1:
+        for module_name, number in tasks:
+            result = run_section(module_name, number, repeat)
+            results.append(result)
+            if on_result:
+                on_result(result)
+        return results
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(run_section, module_name, number, repeat)
+                   for module_name, number in tasks]
+        # 按提交顺序等待：后面的小节先完成也要等前面的打印完，输出顺序因此是确定的
+        for future in futures:
+            result = future.result()
+            results.append(result)
+            if on_result:
+                on_result(result)
+    return results
+
+
+def print_summary(results, wall):
+    print("=" * 60)
+    print("并行运行汇总")
+    print("=" * 60)
+    print(f"  {'小节':<16}{'墙上 (ms)':>12}{'CPU (ms)':>12}  标题")
+    for r in results:
+        mark = "❌ " if r.error else ""
+        print(f"  {r.module + '.' + str(r.number):<16}{r.seconds * 1e3:>12.2f}"
+              f"{r.cpu * 1e3:>12.2f}  {mark}{r.title}")
+    # 进程数多于 CPU 核数时，各小节的墙上时间包含了等待 CPU 的时间，
+    # 所以用 CPU 时间之和估算串行运行需要多久
+    serial = sum(r.cpu for r in results)
+    print()
+    print(f"  小节 CPU 时间合计（≈ 串行耗时）: {serial:.3f}s，墙上时间: {wall:.3f}s，"
+          f"加速比: {serial / wall:.2f}x（{os.cpu_count()} 核）")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="多进程运行演示小节")
+    parser.add_argument("modules", nargs="*", help="演示模块（var/for/if/func/import），默认全部")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(),
+                        help="进程数（默认 CPU 核数；1 表示串行）")
+    parser.add_argument("--repeat", type=int, default=1, help="每个小节运行几次（默认 1）")
+    parser.add_argument("--quiet", action="store_true", help="不打印小节输出，只打印汇总")
+    args = parser.parse_args(argv)
+    unknown = [m for m in args.modules if m not in demo_runner.DEMO_MODULES]
+    if unknown:
+        parser.error(f"未知的演示模块: {', '.join(unknown)}")
+
+    tasks = units(args.modules)
+    last = {module_name: number for module_name, number in tasks}  # 每个模块的最后一个小节
+
+    def show(result):
+        if not args.quiet:
+            sys.stdout.write(result.output)
+        if result.error:
+            sys.stdout.write(f"[{result.module}.{result.number} 出错]\n{result.error}")
+        if not args.quiet and result.number == last[result.module]:
+            demo_runner.finish(result.module)  # main() 在所有小节之后打印的结尾横幅
+
+    start = time.perf_counter()
+    results = run_parallel(tasks, args.jobs, args.repeat, on_result=show)
+    wall = time.perf_counter() - start
+
+    print_summary(results, wall)
+    return 1 if any(r.error for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,256 @@
+"""
+============================================================================
+批量数字解析（Bulk Number Parser）- 整列版的 int(str_num) / float(str_num)
+============================================================================
+
+📚 核心总结：
+-----------
+var.py 第 7 节用 int("123")、float("123") 转换单个字符串。
+导入 CSV 时一列有几亿个数字字符串，逐个调用 int()/float()，
+再用 try/except 处理非法值，加载时间几乎都花在这里。
+
+parse_column 一次处理整列：
+1. 快速路径：按块（默认 65536 行）用 map(float, chunk) 直接填进
+   类型化数组（np.fromiter / array.array），全部合法时没有逐行 Python 代码
+2. 只有某一块转换失败时才处理这一块：仍然用 map(int/float, ...) 在 C 循环里转换，
+   追加进 array.array；遇到非法值时 extend 停在那一行，array 的长度就是非法行的下标，
+   补一个占位值后从下一行继续。每个非法值只有一次异常，合法行不会逐行 try/except
+   （是否合法完全由 int()/float() 判断，超出 int64 的整数由 array 的 OverflowError 发现）
+3. 非法值按配置处理：
+   - on_invalid="nan"      填 NaN（整数列会提升为 float64）
+   - on_invalid="sentinel" 填指定的哨兵值
+   - on_invalid="raise"    抛出 ValueError，附带前几个非法行
+   无论哪种模式，返回值里都有非法行的 (行号, 原始值) 列表
+
+🔑 输入可以是：
+-------------
+   - 字符串列表：["1", "2", "x"]
+   - 原始字节缓冲区：b"1\\n2\\nx\\n"（按 sep 切分，默认换行；
+     bytearray / memoryview 直接切分，不先复制成一整块 bytes）
+
+⚠️ 注意：
+--------
+1. 接受的写法就是 int()/float() 接受的写法：首尾空白、正负号、数字间的下划线；
+   浮点数还接受科学计数法和 inf/nan
+2. 没有安装 NumPy 时结果是标准库 array.array
+3. 结果是紧凑的 8 字节/值数组，比 list[float] 省约 4 倍内存
+4. 超出 int64 范围的整数视为非法值
+5. 速度与手写的 float() + try/except 循环相当（解析本身占大头），
+   好处是结果直接是紧凑的数组
+
+============================================================================
+"""
+
+import re
+from array import array
+from dataclasses import dataclass, field
+
+from lazy_import import lazy_import
+
+np = lazy_import("numpy")  # NumPy 是可选依赖，第一次用到时才加载
+
+_INT64_MIN, _INT64_MAX = -(2 ** 63), 2 ** 63 - 1
+
+
+@dataclass
+class ParseResult:
+    """parse_column 的返回值"""
+
+    values: object                               # np.ndarray 或 array.array
+    errors: list = field(default_factory=list)   # [(行号, 原始值), ...]
+
+    @property
+    def ok(self):
+        return not self.errors
+
+
+def split_buffer(buffer, sep=b"\n"):
+    """把原始字节缓冲区切成一列 bytes，忽略末尾多余的分隔符"""
+    if isinstance(buffer, bytes):
+        rows = buffer.split(sep)
+    else:
+        # bytes(buffer) 会先复制整个缓冲区；re 可以直接在 bytearray / memoryview 上切分
+        rows = re.split(re.escape(sep), buffer)
+    if rows and rows[-1] == b"":
+        rows.pop()
+    return rows
+
+
+_TYPECODES = {"int64": "q", "float64": "d"}
+_CONVERTERS = {"int64": int, "float64": float}
+
+
+def _convert_rows(rows, dtype, placeholder):
+    """
+    转换快速路径失败的块：array.extend 遇到非法值时停在那一行，补上占位值后继续
+
+    返回:
+        (values, invalid)：values 是 array.array，非法行填 placeholder，invalid 是非法行的下标
+    """
+    values = array(_TYPECODES[dtype])
+    converted = map(_CONVERTERS[dtype], rows)  # 出错后 map 从下一行继续
+    invalid = []
+    while True:
+        try:
+            values.extend(converted)
+            return values, invalid
+        except (ValueError, OverflowError):  # 非法字符串，或者整数超出 int64
+            invalid.append(len(values))
+            values.append(placeholder)
+
+
+def _to_array(values, dtype, count):
+    if np is not None:
+        return np.fromiter(values, dtype, count=count)
+    return array(_TYPECODES[dtype], values)
+
+
+def parse_column(column, dtype="float64", on_invalid="nan", sentinel=0, sep=b"\n",
+                 chunk_size=65536):
+    """
+    把一列数字字符串解析成类型化数组
+
+    参数:
+        column: 字符串/bytes 列表，或者原始字节缓冲区（bytes/bytearray/memoryview）
+        dtype: "int64" 或 "float64"
+        on_invalid: 非法值处理方式 "nan" / "sentinel" / "raise"
+        sentinel: on_invalid="sentinel" 时填入的值
+        sep: column 是字节缓冲区时的分隔符
+        chunk_size: 每块行数；含非法值的块改用 array.extend 转换（见 _convert_rows）
+
+    返回:
+        ParseResult(values, errors)，有 NumPy 时 values 是 np.ndarray，
+        否则是 array.array
+    """
+    if dtype not in _CONVERTERS:
+        raise ValueError(f"不支持的 dtype: {dtype}（可选 int64 / float64）")
+    if on_invalid not in ("nan", "sentinel", "raise"):
+        raise ValueError(f"不支持的 on_invalid: {on_invalid}")
+
+    if isinstance(column, (bytes, bytearray, memoryview)):
+        rows = split_buffer(column, sep)
+    else:
+        rows = column if isinstance(column, list) else list(column)
+
+    convert = _CONVERTERS[dtype]
+    placeholder = sentinel if on_invalid == "sentinel" else 0
+    parts = []
+    invalid = []
+    fast = True  # 上一块含非法值时，下一块直接走 array 路径，免得同一块转换两次
+
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        if fast:
+            try:
+                # 快速路径：整块一次转换，C 循环里完成，没有逐行 Python 代码
+                parts.append(_to_array(map(convert, chunk), dtype, len(chunk)))
+                continue
+            except (ValueError, OverflowError):
+                pass
+        # 含非法值的块：仍然在 C 循环里转换，每个非法值只多一次异常
+        values, bad = _convert_rows(chunk, dtype, placeholder)
+        parts.append(np.frombuffer(values, dtype) if np is not None else values)
+        invalid.extend(start + i for i in bad)
+        fast = not bad
+
+    errors = [(i, rows[i]) for i in invalid]
+    if errors and on_invalid == "raise":
+        preview = ", ".join(f"第 {i} 行 {v!r}" for i, v in errors[:5])
+        raise ValueError(f"{len(errors)} 个非法值: {preview}")
+
+    if np is not None:
+        values = np.concatenate(parts) if parts else np.empty(0, dtype)
+    else:
+        values = array(_TYPECODES[dtype])
+        for part in parts:
+            values.extend(part)
+
+    if errors and on_invalid == "nan":
+        # 整数列没有 NaN，提升为 float64
+        if dtype == "int64":
+            values = values.astype("float64") if np is not None else array("d", values)
+        for i in invalid:
+            values[i] = float("nan")
+    return ParseResult(values, errors)
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    print("=" * 60)
+    print("1. 整列解析（全部合法，走快速路径）")
+    print("=" * 60)
+
+    result = parse_column(["123", " 45 ", "-6", "1_000"], dtype="int64")
+    print(f"  int64: {result.values}, 非法值: {result.errors}")
+
+    result = parse_column(b"3.14\n2.5e3\n-inf\n", dtype="float64")
+    print(f"  float64（字节缓冲区）: {result.values}")
+
+    print()
+
+    print("=" * 60)
+    print("2. 非法值处理")
+    print("=" * 60)
+
+    dirty = ["12", "abc", "7", "", "99999999999999999999"]
+    print(f"  nan:      {parse_column(dirty, 'int64', 'nan').values}")
+    result = parse_column(dirty, "int64", "sentinel", sentinel=-1)
+    print(f"  sentinel: {result.values}")
+    print(f"  错误列表: {result.errors}")
+    try:
+        parse_column(dirty, "int64", "raise")
+    except ValueError as e:
+        print(f"  raise:    {e}")
+
+    print()
+
+    print("=" * 60)
+    print("3. 逐个 float() + try/except vs parse_column")
+    print("=" * 60)
+
+    n = 1_000_000
+    strings = [f"{random.uniform(-1e6, 1e6):.4f}" for _ in range(n)]
+
+    def per_value(column):
+        out = []
+        for s in column:
+            try:
+                out.append(float(s))
+            except ValueError:
+                out.append(float("nan"))
+        return out
+
+    def timed(func, *args):
+        start = time.perf_counter()
+        result = func(*args)
+        return result, time.perf_counter() - start
+
+    dirty = list(strings)
+    dirty[n // 2] = "N/A"  # 只有一块含非法值
+    scattered = list(strings)
+    for i in range(0, n, 50_000):
+        scattered[i] = "N/A"  # 每一块都含非法值
+
+    print(f"  {'数据':<16}{'逐个 float()':>14}{'parse_column':>14}")
+    for label, column in [("全部合法", strings), ("1 个非法值", dirty),
+                          ("每 5 万行 1 个", scattered)]:
+        floats, naive = timed(per_value, column)
+        result, bulk = timed(parse_column, column)
+        print(f"  {label:<16}{naive:>13.3f}s{bulk:>13.3f}s")
+
+    buffer = "\n".join(strings).encode()
+    result, bulk = timed(parse_column, buffer)
+    print(f"  字节缓冲区（含切分）{bulk:>24.3f}s")
+    print("  float() 本身的解析占了大头，速度提升有限；主要收益是下面的内存和数组类型")
+
+    import sys
+    list_bytes = sys.getsizeof(floats) + sum(sys.getsizeof(x) for x in floats)
+    print(f"  内存：list[float] {list_bytes / 2**20:.1f} MB"
+          f" vs 类型化数组 {result.values.nbytes / 2**20:.1f} MB")
+
+    print()
+    print("=" * 60)
+    print("批量数字解析演示完成！")
+    print("=" * 60)
@@ -0,0 +1,279 @@
+"""
+============================================================================
+采样分析器（Sampling Profiler）- 折叠栈（火焰图）+ 自身耗时表
+============================================================================
+
+📚 核心总结：
+-----------
+cProfile 会在每次函数调用、返回时都记录一次，调用越密集开销越大
+（factorial 这类递归、小函数可以慢好几倍），测出来的比例也会失真。
+
+采样分析器换一种思路：每隔固定时间看一眼"现在正在执行哪条调用栈"，
+并把这条栈计数加一。被采样到的次数越多，说明花的时间越多。
+开销只和采样频率有关，与函数调用次数无关。
+
+两种采样方式：
+1. signal（默认，Linux/macOS）：setitimer(ITIMER_PROF) 按 CPU 时间定时
+   发送 SIGPROF，信号处理函数拿到被打断的栈帧，沿 f_back 走一遍调用栈
+2. thread（Windows，或者要分析的代码不在主线程）：后台线程定时
+   调用 sys._current_frames() 读取目标线程的栈帧（按墙上时间采样）
+
+输出：
+- 折叠栈（collapsed stacks）："main;section_3;factorial;factorial 42"，
+  可以直接交给 flamegraph.pl、speedscope、inferno 生成火焰图
+- 自身耗时表：每个函数作为栈顶（自身在执行）和出现在栈中（含子调用）的时间
+
+🔑 用法：
+-------
+   python profiler.py func --repeat 2000         # 分析 func.py 的全部小节（重复 2000 次）
+   python profiler.py if 11 14 --repeat 5000     # 只分析 if.py 的第 11、14 小节
+   python profiler.py --case if.grade_chain --size 1000000 --repeat 20
+   python profiler.py --case func.factorial --size 500 --hz 2000 --out stacks.txt
+   python profiler.py --case for.max_loop --overhead   # 测量分析器本身的开销
+
+   with Profiler(hz=1000) as prof:
+       work()
+   prof.write_collapsed("stacks.txt")
+   prof.print_table()
+
+⚠️ 注意：
+--------
+1. signal 模式只能在主线程中使用，只采样主线程
+2. 采样是统计估计：运行时间太短（采样数少于几百）时结果不可靠
+3. 演示小节会大量 print，分析时 stdout 被重定向到空设备
+
+============================================================================
+"""
+
+import argparse
+import contextlib
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+
+from demo_runner import NullWriter
+
+HAS_SIGPROF = hasattr(signal, "SIGPROF") and hasattr(signal, "setitimer")
+
+
+def _label(code):
+    """栈帧的显示名：函数名 (文件名:行号)；分号是折叠栈的分隔符，需要替换掉"""
+    name = getattr(code, "co_qualname", code.co_name)
+    label = f"{name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+    return label.replace(";", ":")
+
+
+class Profiler:
+    """按固定频率采样调用栈"""
+
+    def __init__(self, hz=1000, mode=None, max_depth=256):
+        """
+        参数:
+            hz: 每秒采样次数
+            mode: "signal" 或 "thread"；默认有 SIGPROF 时用 signal
+            max_depth: 每条栈最多记录多少层（太深的递归只保留最内层）
+        """
+        if mode is None:
+            mode = "signal" if HAS_SIGPROF else "thread"
+        if mode == "signal" and not HAS_SIGPROF:
+            raise ValueError("当前平台不支持 SIGPROF，请使用 mode='thread'")
+        self.interval = 1.0 / hz
+        self.mode = mode
+        self.max_depth = max_depth
+        self.stacks = Counter()
+        self.samples = 0
+        self.elapsed = 0.0
+        self._labels = {}
+        self._stop = None
+        self._stop_frame = None
+
+    def _record(self, frame):
+        labels = self._labels
+        stack = []
+        depth = 0
+        while frame is not None and depth < self.max_depth:
+            if frame is self._stop_frame:
+                break  # 只记录 start() 之后进入的栈帧
+            code = frame.f_code
+            label = labels.get(code)
+            if label is None:
+                label = labels[code] = _label(code)
+            stack.append(label)
+            frame = frame.f_back
+            depth += 1
+        if stack:
+            self.stacks[tuple(reversed(stack))] += 1
+            self.samples += 1
+
+    def _on_signal(self, signum, frame):
+        self._record(frame)
+
+    def _sample_thread(self, target):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(target)
+            if frame is not None:
+                self._record(frame)
+
+    def start(self):
+        # 调用 start() 的栈帧及其外层不属于被分析的代码
+        self._stop_frame = sys._getframe(1)
+        self._started = time.perf_counter()
+        if self.mode == "signal":
+            self._previous = signal.signal(signal.SIGPROF, self._on_signal)
+            signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+        else:
+            self._stop = threading.Event()
+            self._thread = threading.Thread(target=self._sample_thread,
+                                            args=(threading.get_ident(),), daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        if self.mode == "signal":
+            signal.setitimer(signal.ITIMER_PROF, 0, 0)
+            signal.signal(signal.SIGPROF, self._previous)
+        else:
+            self._stop.set()
+            self._thread.join()
+        self.elapsed += time.perf_counter() - self._started
+        return self
+
+    def __enter__(self):
+        self.start()
+        # start() 记录的是 __enter__ 的栈帧；换成 with 语句所在的栈帧
+        self._stop_frame = sys._getframe(1)
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # ----- 结果 -----
+
+    def collapsed(self):
+        """折叠栈文本，每行 "外层;...;内层 次数"，按次数从大到小"""
+        return "\n".join(f"{';'.join(stack)} {count}"
+                         for stack, count in self.stacks.most_common()) + "\n"
+
+    def write_collapsed(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.collapsed())
+
+    def table(self):
+        """
+        每个函数的采样统计
+
+        返回:
+            list: [(函数, 自身采样数, 累计采样数), ...]，按自身采样数从大到小
+        """
+        own = Counter()
+        total = Counter()
+        for stack, count in self.stacks.items():
+            own[stack[-1]] += count
+            for label in set(stack):  # 递归函数在一条栈里只算一次
+                total[label] += count
+        return sorted(((label, own[label], total[label]) for label in total),
+                      key=lambda row: (row[1], row[2]), reverse=True)
+
+    def print_table(self, top=20):
+        samples = self.samples or 1
+        # 内核定时器的精度有限（常见 1~4 ms），实际采样数可能少于 hz * 秒数，
+        # 所以按实际采样数折算时间
+        seconds_per_sample = self.elapsed / samples
+        print(f"  用时 {self.elapsed:.3f}s，采样 {self.samples} 次"
+              f"（{self.mode}，间隔 {self.interval * 1e3:.2f} ms）")
+        if self.samples < 100:
+            print("  ⚠️ 采样数太少，结果不可靠；请用 --repeat 让被测代码运行更久")
+        print(f"  {'自身%':>7}{'累计%':>7}{'自身(s)':>9}  函数")
+        for label, own, total in self.table()[:top]:
+            print(f"  {own / samples:>7.1%}{total / samples:>7.1%}"
+                  f"{own * seconds_per_sample:>9.3f}  {label}")
+
+
+def profile(func, *args, hz=1000, mode=None, **kwargs):
+    """
+    在分析器下运行 func(*args, **kwargs)
+
+    返回:
+        (返回值, Profiler)
+    """
+    prof = Profiler(hz, mode)
+    prof.start()
+    try:
+        result = func(*args, **kwargs)
+    finally:
+        prof.stop()
+    return result, prof
+
+
+def _workload(args):
+    """根据命令行参数返回要分析的无参函数"""
+    if args.case:
+        import bench
+
+        case = bench.CASES[args.case]
+        run, call_args = case.setup(args.size or case.sizes[-1])
+
+        def workload():
+            for _ in range(args.repeat):
+                run(*call_args)
+        return workload
+
+    import demo_runner
+
+    def workload():
+        for _ in range(args.repeat):
+            with contextlib.redirect_stdout(NullWriter()):
+                demo_runner.run(args.module, args.sections)
+    return workload
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="采样分析演示小节或基准用例")
+    parser.add_argument("module", nargs="?", help="演示模块（var/for/if/func/import）")
+    parser.add_argument("sections", nargs="*", type=int, help="小节编号，默认全部")
+    parser.add_argument("--case", help="bench.py 中的用例名，例如 if.grade_chain")
+    parser.add_argument("--size", type=int, help="用例的输入规模，默认用最大的规模")
+    parser.add_argument("--repeat", type=int, default=1, help="重复运行次数（默认 1）")
+    parser.add_argument("--hz", type=float, default=1000, help="采样频率（默认 1000）")
+    parser.add_argument("--mode", choices=["signal", "thread"], help="采样方式")
+    parser.add_argument("--out", help="折叠栈输出文件（可交给 flamegraph.pl）")
+    parser.add_argument("--top", type=int, default=20, help="表格显示的函数数（默认 20）")
+    parser.add_argument("--overhead", action="store_true", help="对比有无分析器的运行时间")
+    args = parser.parse_args(argv)
+    if not args.case and not args.module:
+        parser.error("需要指定演示模块或 --case")
+
+    workload = _workload(args)
+    workload()  # 预热：导入、缓存
+
+    if args.overhead:
+        plain = []
+        profiled = []
+        for _ in range(5):
+            start = time.perf_counter()
+            workload()
+            plain.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            profile(workload, hz=args.hz, mode=args.mode)
+            profiled.append(time.perf_counter() - start)
+        base, with_prof = min(plain), min(profiled)
+        print(f"  无分析器: {base:.3f}s，{args.hz:.0f} Hz 采样: {with_prof:.3f}s，"
+              f"开销 {with_prof / base - 1:+.1%}")
+        return
+
+    _, prof = profile(workload, hz=args.hz, mode=args.mode)
+    print("=" * 60)
+    print(f"采样分析: {args.case or args.module}")
+    print("=" * 60)
+    prof.print_table(args.top)
+    if args.out:
+        prof.write_collapsed(args.out)
+        print()
+        print(f"  折叠栈已写入 {args.out}（flamegraph.pl {args.out} > flame.svg）")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,473 @@
+"""
+============================================================================
+成绩列文件（Score File）- 定长二进制列 + 头部统计 + 分块区间图（zone map）
+============================================================================
+
+📚 核心总结：
+-----------
+for.py、if.py 里的 scores 和 func.py 里学生的 score 都是写在代码里的字面量。
+成绩有几十亿条时，既不能都放进 Python 列表，也不能每次求平均分都扫一遍。
+
+文件格式（一个文件保存一列定长数值，小端序）：
+
+   [头部 64 字节][值 0][值 1]...[值 count-1]          scores.col
+   [块 0 的 count/min/max/sum][块 1 ...]...          scores.col.zmap（可选）
+
+头部：
+   magic "IMBRSCOR"、版本、dtype（例如 "<i2"）、块大小、
+   count、sum、min、max —— 全列的平均分、最高分直接从头部得到，不读数据
+
+区间图（zone map）：
+   每 block_size 个值一块，记录块内的 count/min/max/sum。
+   - stats(start, stop)：完整的块直接用区间图合并，只扫描两端不完整的块
+   - count_between(lo, hi)：块的 [min, max] 完全落在范围内 → 整块计数；
+     完全不相交 → 跳过；只有部分重叠的块才读数据
+
+读取通过 np.memmap：数据按需从页缓存映射进来，打开几 GB 的文件也不占内存。
+写入只能追加：数据写在文件末尾，区间图只改写最后一个块，最后更新头部。
+
+🔑 用法：
+-------
+   from score_file import ScoreFile
+
+   with ScoreFile.create("scores.col", dtype="int16") as f:
+       f.append([85, 92, 78, 95, 88])           # 可以多次追加
+   with ScoreFile.open("scores.col") as f:
+       f.mean, f.max                            # 来自头部，O(1)
+       f.stats(1_000_000, 2_000_000)            # 一段范围的统计，使用区间图
+       f.count_between(60)                      # 及格人数
+       f.values()[:10]                          # np.memmap，只读
+
+⚠️ 注意：
+--------
+1. 同一时间只能有一个写入者；读者以头部的 count 为准，
+   写到一半的追加（数据已写、头部未更新）对读者不可见；
+   最后一个不满的块的区间图记录会被追加改写，读者只使用完整块的记录；
+   写入者追加时按数据重新计算这个块的记录，以可写方式打开时
+   还会修复被撕裂的追加留下的错误记录、删掉多余的记录
+2. 整数列的 sum 是精确的 Python int（分段累加，不会像 int64 那样溢出），
+   头部用 16 字节保存；浮点列用 float64 累加。
+   某个块的和超出 int64 时，它的区间图记录 count 写成 0，查询时改为扫描这个块
+3. 依赖 NumPy
+
+============================================================================
+"""
+
+import os
+import struct
+
+from lazy_import import lazy_import
+
+np = lazy_import("numpy")
+if np is None:
+    raise ImportError("score_file 依赖 NumPy，请先运行: pip install numpy")
+
+MAGIC = b"IMBRSCOR"
+VERSION = 1
+HEADER_SIZE = 64
+DEFAULT_BLOCK_SIZE = 65536
+SUPPORTED_DTYPES = ("<i1", "<i2", "<i4", "<i8", "<u1", "<u2", "<u4", "<f4", "<f8")
+
+# magic、版本、标志位、dtype、块大小、count、sum、min、max（sum/min/max 各 8 字节原始数据）、
+# 整数列 sum 的高 64 位（旧文件这里是补齐用的 0，读出来的 sum 不变）
+_HEADER = struct.Struct("<8sHH8sIQ8s8s8sq")
+_HAS_ZONES = 1
+
+
+def _stat_dtype(dtype):
+    """sum/min/max 的存储类型：整数列用 int64，浮点列用 float64"""
+    return np.dtype("<f8") if dtype.kind == "f" else np.dtype("<i8")
+
+
+def _zone_dtype(dtype):
+    stat = _stat_dtype(dtype)
+    return np.dtype([("count", "<u4"), ("min", stat), ("max", stat), ("sum", stat)])
+
+
+def _merge(a, b):
+    """合并两个 (count, sum, min, max)；count 为 0 表示空"""
+    if not a[0]:
+        return b
+    if not b[0]:
+        return a
+    return (a[0] + b[0], a[1] + b[1], min(a[2], b[2]), max(a[3], b[3]))
+
+
+def _int_sum(values):
+    """整数数组的精确和（Python int）：分段累加，每段的和都装得下 int64"""
+    if values.dtype.itemsize < 8:
+        step = 1 << 30
+        return sum(int(values[i:i + step].sum(dtype=np.int64)) for i in range(0, len(values), step))
+    # int64 拆成高 32 位和低 32 位分别求和：x == (x >> 32) * 2**32 + (x & 0xFFFFFFFF)
+    total = 0
+    step = 1 << 20
+    for i in range(0, len(values), step):
+        chunk = values[i:i + step]
+        total += ((int((chunk >> 32).sum(dtype=np.int64)) << 32)
+                  + int((chunk & 0xFFFFFFFF).sum(dtype=np.int64)))
+    return total
+
+
+def _reduce(values, stat):
+    if not len(values):
+        return (0, 0, None, None)
+    total = values.sum(dtype=stat).item() if stat.kind == "f" else _int_sum(values)
+    return (len(values), total, values.min().item(), values.max().item())
+
+
+def _split_sum(total):
+    """精确的整数和拆成 (低 64 位按有符号解释, 高 64 位)，total == low + (high << 64)"""
+    low = (total + 2**63) % 2**64 - 2**63
+    return low, (total - low) >> 64
+
+
+def _zone_records(zones, dtype):
+    """(count, sum, min, max) 列表转成区间图记录；sum 超出 int64 的块 count 记为 0"""
+    rows = []
+    for count, total, low, high in zones:
+        if dtype.kind != "f" and not -2**63 <= total < 2**63:
+            count, total = 0, 0
+        rows.append((count, low, high, total))
+    return np.array(rows, dtype=_zone_dtype(dtype))
+
+
+class ScoreFile:
+    """一列定长数值的文件；用 create() / open() 创建实例"""
+
+    def __init__(self, path, mode):
+        self.path = path
+        self.zone_path = path + ".zmap"
+        self._file = open(path, mode)
+        self._read_header()
+        self._map = None
+        if mode != "rb" and self.has_zone_maps:
+            self._repair_zones()
+
+    @classmethod
+    def create(cls, path, dtype="int32", block_size=DEFAULT_BLOCK_SIZE, zone_maps=True):
+        """
+        创建空文件（已存在时覆盖）
+
+        参数:
+            dtype: 数值类型，例如 "int16"、"float32"（见 SUPPORTED_DTYPES）
+            block_size: 区间图每块包含的值个数
+            zone_maps: 是否维护区间图
+        """
+        dtype = np.dtype(dtype).newbyteorder("<")
+        if not any(dtype == np.dtype(name) for name in SUPPORTED_DTYPES):
+            raise ValueError(f"不支持的类型 {dtype}，可选: {', '.join(SUPPORTED_DTYPES)}")
+        if block_size <= 0:
+            raise ValueError("block_size 必须大于 0")
+        stat = _stat_dtype(dtype)
+        zero = stat.type(0).tobytes()
+        header = _HEADER.pack(MAGIC, VERSION, _HAS_ZONES if zone_maps else 0,
+                              dtype.str.encode().ljust(8, b"\0"), block_size, 0, zero, zero, zero, 0)
+        with open(path, "wb") as f:
+            f.write(header.ljust(HEADER_SIZE, b"\0"))
+        if zone_maps:
+            open(path + ".zmap", "wb").close()
+        elif os.path.exists(path + ".zmap"):
+            os.remove(path + ".zmap")
+        return cls(path, "r+b")
+
+    @classmethod
+    def open(cls, path, writable=False):
+        """打开已有文件；writable=True 时可以追加"""
+        return cls(path, "r+b" if writable else "rb")
+
+    def _read_header(self):
+        self._file.seek(0)
+        raw = self._file.read(HEADER_SIZE)
+        if len(raw) < HEADER_SIZE or raw[:8] != MAGIC:
+            raise ValueError(f"{self.path} 不是成绩列文件")
+        magic, version, flags, dtype, block_size, count, total, low, high, total_high = \
+            _HEADER.unpack_from(raw)
+        if version != VERSION:
+            raise ValueError(f"不支持的文件版本 {version}")
+        self.dtype = np.dtype(dtype.rstrip(b"\0").decode())
+        self.block_size = block_size
+        self.has_zone_maps = bool(flags & _HAS_ZONES)
+        self.count = count
+        stat = _stat_dtype(self.dtype)
+        self.sum, self._min, self._max = (np.frombuffer(b, stat)[0].item() for b in (total, low, high))
+        if stat.kind != "f":
+            self.sum += total_high << 64
+
+    def _write_header(self):
+        stat = _stat_dtype(self.dtype)
+        total, total_high = (self.sum, 0) if stat.kind == "f" else _split_sum(self.sum)
+        header = _HEADER.pack(MAGIC, VERSION, _HAS_ZONES if self.has_zone_maps else 0,
+                              self.dtype.str.encode().ljust(8, b"\0"), self.block_size, self.count,
+                              *(stat.type(v or 0).tobytes() for v in (total, self._min, self._max)),
+                              total_high)
+        self._file.seek(0)
+        self._file.write(header)
+
+    # ----- 头部统计：不读数据 -----
+
+    @property
+    def min(self):
+        return self._min if self.count else None
+
+    @property
+    def max(self):
+        return self._max if self.count else None
+
+    @property
+    def mean(self):
+        return self.sum / self.count if self.count else None
+
+    def __len__(self):
+        return self.count
+
+    # ----- 写入 -----
+
+    def append(self, values):
+        """在文件末尾追加一批数值（列表或数组）"""
+        values = np.ascontiguousarray(values, dtype=self.dtype)
+        if values.ndim != 1:
+            raise ValueError("只能追加一维数据")
+        if not len(values):
+            return
+        stat = _stat_dtype(self.dtype)
+
+        self._file.seek(HEADER_SIZE + self.count * self.dtype.itemsize)
+        self._file.write(values.tobytes())
+        if self.has_zone_maps:
+            self._append_zones(values, stat)
+        # 最后更新头部：在这之前崩溃的话，多写的数据对读者不可见
+        self._file.flush()
+        count, total, low, high = _merge((self.count, self.sum, self._min, self._max),
+                                         _reduce(values, stat))
+        self.count, self.sum, self._min, self._max = count, total, low, high
+        self._write_header()
+        self._file.flush()
+        self._map = None
+
+    def _append_zones(self, values, stat):
+        filled = self.count % self.block_size
+        first_block = self.count // self.block_size
+        zones = []
+        if filled:
+            # 最后一个不满的块：记录可能来自一次被撕裂的追加，不能信任，按已有数据重新计算
+            existing = self.values()[first_block * self.block_size:]
+            head = values[:self.block_size - filled]
+            values = values[len(head):]
+            zones.append(_merge(_reduce(existing, stat), _reduce(head, stat)))
+        for start in range(0, len(values), self.block_size):
+            zones.append(_reduce(values[start:start + self.block_size], stat))
+        self._write_zones(first_block, _zone_records(zones, self.dtype))
+
+    def _write_zones(self, first_block, records):
+        with open(self.zone_path, "r+b") as f:
+            f.seek(first_block * records.dtype.itemsize)
+            f.write(records.tobytes())
+
+    def _repair_zones(self):
+        """
+        按数据修复区间图：被撕裂的追加（区间图已写、头部没更新）会留下
+        记录了不存在的数据的最后一块、以及头部 count 之外的多余记录
+        """
+        zone_dtype = _zone_dtype(self.dtype)
+        stat = _stat_dtype(self.dtype)
+        size = self.block_size
+        full = self.count // size
+        blocks = -(-self.count // size)
+        records = np.fromfile(self.zone_path, zone_dtype, count=blocks)
+        counts = records["count"][:full]
+        stale = np.flatnonzero((counts != size) & (counts != 0)).tolist()
+        stale += range(len(counts), blocks)  # 缺失的记录和最后一个不满的块
+        data = self.values()
+        for block in stale:
+            zone = _reduce(data[block * size:(block + 1) * size], stat)
+            self._write_zones(block, _zone_records([zone], self.dtype))
+        if os.path.getsize(self.zone_path) > blocks * zone_dtype.itemsize:
+            os.truncate(self.zone_path, blocks * zone_dtype.itemsize)
+
+    # ----- 读取 -----
+
+    def values(self):
+        """全部数值的只读 np.memmap（空文件返回空数组）"""
+        if not self.count:
+            return np.empty(0, self.dtype)
+        if self._map is None:
+            self._map = np.memmap(self.path, self.dtype, "r", offset=HEADER_SIZE,
+                                  shape=(self.count,))
+        return self._map
+
+    def zones(self):
+        """区间图：结构化数组，字段 count、min、max、sum"""
+        if not self.has_zone_maps:
+            raise ValueError(f"{self.path} 没有区间图")
+        zone_dtype = _zone_dtype(self.dtype)
+        blocks = -(-self.count // self.block_size)
+        return np.fromfile(self.zone_path, zone_dtype, count=blocks)
+
+    def stats(self, start=0, stop=None):
+        """
+        第 start 到 stop-1 个值的统计
+
+        返回:
+            dict: count、sum、min、max、mean（空范围时 min/max/mean 为 None）
+        """
+        start, stop, _ = slice(start, stop).indices(self.count)
+        stop = max(start, stop)
+        stat = _stat_dtype(self.dtype)
+        if (start, stop) == (0, self.count):
+            result = (self.count, self.sum, self.min, self.max)
+        elif not self.has_zone_maps:
+            result = _reduce(self.values()[start:stop], stat)
+        else:
+            size = self.block_size
+            first_full = -(-start // size)
+            last_full = stop // size
+            if first_full >= last_full:
+                result = _reduce(self.values()[start:stop], stat)
+            else:
+                # 两端不完整的块扫描数据，中间完整的块直接合并区间图
+                data = self.values()
+                zones = self.zones()[first_full:last_full]
+                result = _merge(_reduce(data[start:first_full * size], stat),
+                                _reduce(data[last_full * size:stop], stat))
+                valid = zones["count"] == size
+                if valid.any():
+                    good = zones[valid]
+                    total = good["sum"].sum().item() if stat.kind == "f" else _int_sum(good["sum"])
+                    result = _merge(result, (int(valid.sum()) * size, total,
+                                             good["min"].min().item(), good["max"].max().item()))
+                # count 为 0 的块：和超出 int64，没有记录，直接扫描
+                for block in np.flatnonzero(~valid) + first_full:
+                    result = _merge(result, _reduce(data[block * size:(block + 1) * size], stat))
+        count, total, low, high = result
+        return {"count": count, "sum": total, "min": low, "max": high,
+                "mean": total / count if count else None}
+
+    def count_between(self, lo=None, hi=None):
+        """
+        统计 lo <= 值 <= hi 的个数（lo、hi 为 None 表示不限）
+
+        返回:
+            (个数, 实际读取数据的块数)
+        """
+        lo = -np.inf if lo is None else lo
+        hi = np.inf if hi is None else hi
+        if not self.count or lo > hi or self.min > hi or self.max < lo:
+            return 0, 0
+        if lo <= self.min and self.max <= hi:
+            return self.count, 0
+        data = self.values()
+        if not self.has_zone_maps:
+            return int(np.count_nonzero((data >= lo) & (data <= hi))), -(-self.count // self.block_size)
+
+        # 只信任完整块的记录：最后一个不满的块，写入者可能已经把新追加的值并进了记录，
+        # 但头部的 count 还是旧的；这个块直接扫描数据
+        full = self.count // self.block_size
+        zones = self.zones()[:full]
+        valid = zones["count"] == self.block_size  # count 为 0 的记录没有汇总信息，要扫描
+        inside = (zones["min"] >= lo) & (zones["max"] <= hi) & valid
+        overlap = ((zones["max"] >= lo) & (zones["min"] <= hi) | ~valid) & ~inside
+        total = int(inside.sum()) * self.block_size
+        for block in np.flatnonzero(overlap):
+            chunk = data[block * self.block_size:(block + 1) * self.block_size]
+            total += int(np.count_nonzero((chunk >= lo) & (chunk <= hi)))
+        scanned = int(overlap.sum())
+        tail = data[full * self.block_size:]
+        if len(tail):
+            total += int(np.count_nonzero((tail >= lo) & (tail <= hi)))
+            scanned += 1
+        return total, scanned
+
+    def close(self):
+        self._map = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "scores.col")
+    rng = np.random.default_rng(0)
+
+    print("=" * 60)
+    print("1. 分批追加 2000 万条成绩（int16）")
+    print("=" * 60)
+
+    start = time.perf_counter()
+    with ScoreFile.create(path, dtype="int16") as f:
+        # 每一批是一次考试，平均分逐批上升
+        for exam in range(20):
+            batch = rng.normal(55 + exam * 2, 12, 1_000_000).clip(0, 100).astype("int16")
+            f.append(batch)
+    elapsed = time.perf_counter() - start
+    print(f"  写入 {elapsed:.2f}s，文件 {os.path.getsize(path) / 2**20:.1f} MiB，"
+          f"区间图 {os.path.getsize(path + '.zmap') / 2**10:.1f} KiB")
+
+    print()
+
+    print("=" * 60)
+    print("2. 平均分、最高分（for.py 里的 total / len(scores) 和 max 循环）")
+    print("=" * 60)
+
+    with ScoreFile.open(path) as f:
+        start = time.perf_counter()
+        mean, high = f.mean, f.max
+        header_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        data = f.values()
+        scan_mean, scan_high = data.mean(dtype="float64"), data.max()
+        scan_time = time.perf_counter() - start
+        print(f"  头部: 平均分 {mean:.3f}，最高分 {high}，{header_time * 1e6:.1f} µs")
+        print(f"  扫描: 平均分 {scan_mean:.3f}，最高分 {scan_high}，{scan_time * 1e3:.1f} ms")
+
+        print()
+
+        print("=" * 60)
+        print("3. 区间图：某一段记录的统计、按分数范围计数")
+        print("=" * 60)
+
+        start = time.perf_counter()
+        part = f.stats(3_000_123, 17_000_456)
+        zone_time = time.perf_counter() - start
+        start = time.perf_counter()
+        chunk = data[3_000_123:17_000_456]
+        expected = chunk.sum(dtype="int64"), chunk.max()
+        chunk_time = time.perf_counter() - start
+        print(f"  第 3000123~17000455 条: 平均分 {part['mean']:.3f}，最高分 {part['max']}")
+        print(f"    区间图 {zone_time * 1e3:.2f} ms，扫描 {chunk_time * 1e3:.2f} ms，"
+              f"结果一致: {(part['sum'], part['max']) == tuple(int(x) for x in expected)}")
+
+        # 成绩是乱序的，每块的 [min, max] 都很宽：只有头部能排除的范围才不用读数据
+        for label, lo, hi in [("及格（>= 60）", 60, None), ("0~100", 0, 100), ("> 100", 101, None)]:
+            start = time.perf_counter()
+            count, scanned = f.count_between(lo, hi)
+            ms = (time.perf_counter() - start) * 1e3
+            blocks = -(-f.count // f.block_size)
+            print(f"  分数 {label}: {count:,} 人，读取 {scanned}/{blocks} 块，{ms:.2f} ms")
+
+    # 按顺序写入的列（学号、时间戳）每块范围很窄，区间图几乎能跳过所有块
+    ids_path = os.path.join(directory, "ids.col")
+    with ScoreFile.create(ids_path, dtype="int32") as ids:
+        ids.append(np.arange(20_000_000, dtype="int32"))
+        start = time.perf_counter()
+        count, scanned = ids.count_between(5_000_000, 5_999_999)
+        ms = (time.perf_counter() - start) * 1e3
+        blocks = -(-ids.count // ids.block_size)
+        print(f"  学号 5000000~5999999: {count:,} 个，读取 {scanned}/{blocks} 块，{ms:.2f} ms")
+
+    for name in os.listdir(directory):
+        os.remove(os.path.join(directory, name))
+    os.rmdir(directory)
+
+    print()
+    print("=" * 60)
+    print("成绩列文件演示完成！")
+    print("=" * 60)
@@ -0,0 +1,282 @@
+"""
+============================================================================
+分片累加器（Sharded Accumulators）- 每个线程一个分片，读取时才合并
+============================================================================
+
+📚 核心总结：
+-----------
+func.py 第 10 节用 global 修改 global_var，for.py 在循环里累加 total。
+多个线程一起累加同一个全局变量时：
+- 不加锁：counter += 1 不是原子操作（读、加、写三步），语言不保证不丢失更新
+- 加锁：每次累加都要抢同一把锁，线程越多竞争越激烈
+
+分片的做法（类似 Java 的 LongAdder）：
+1. 每个线程第一次使用时分到一个自己的分片（一个单元素列表）
+2. 累加只修改自己的分片：没有别的线程会写它，所以不需要锁
+3. 读取 value 时才把所有分片合并（求和 / 取最大值）
+4. 写多读少时（计数、统计耗时、统计最大值）效果最好
+
+提供：
+   Counter   计数，inc(n=1)
+   Sum       求和，add(x)
+   Max / Min 最大值 / 最小值，update(x)
+
+🔑 用法：
+-------
+   from sharded import Counter, Max
+
+   requests = Counter()
+   slowest = Max()
+
+   def worker():
+       for item in items:
+           requests.inc()
+           slowest.update(elapsed)
+
+   requests.value      # 合并所有线程的分片
+   slowest.value
+
+   python sharded.py                          # 基准：加锁的全局变量 vs 分片，1~64 个线程
+   python sharded.py --ops 2000000 --threads 1,8,64
+
+⚠️ 注意：
+--------
+1. 读取是"弱一致"的：合并过程中其它线程可能还在累加，
+   读到的是某个中间时刻的值；所有线程结束后读取一定准确
+2. 线程结束后它的分片会被回收：值先合并进一个"已退出线程"的汇总值，再删掉分片，
+   所以每个请求一个线程的服务器里分片数不会一直增长；shards 是还活着的线程的分片数
+3. 在有 GIL 的 CPython 上，锁的竞争主要体现在线程切换上；
+   在自由线程（free-threaded，3.13t）版本上分片的优势更明显
+
+============================================================================
+"""
+
+import argparse
+import os
+import threading
+import time
+import weakref
+
+
+class _Owner:
+    """放在线程局部存储里的哨兵：线程结束时局部存储被清空，它被回收，触发分片的回收"""
+
+    __slots__ = ("__weakref__",)
+
+
+def _retire(ref, key):
+    """线程已经结束：把它的分片合并进汇总值，然后删掉分片"""
+    accumulator = ref()
+    if accumulator is not None:
+        accumulator._retire(key)
+
+
+class _Sharded:
+    """分片累加器的基类：管理每个线程的分片"""
+
+    initial = 0
+
+    def __init__(self):
+        self._cells = {}  # 活着的线程的分片：{编号: [值]}
+        self._retired = self.initial  # 已经结束的线程累加的值
+        self._lock = threading.RLock()  # 只在登记、回收分片、合并、清零时使用
+        self._local = threading.local()
+        self._next_key = 0
+
+    def _register(self):
+        """当前线程第一次使用：创建并登记一个分片"""
+        cell = [self.initial]
+        owner = _Owner()
+        with self._lock:
+            key = self._next_key
+            self._next_key += 1
+            self._cells[key] = cell
+        # 不引用 self：累加器本身不再使用时可以正常回收
+        weakref.finalize(owner, _retire, weakref.ref(self), key)
+        self._local.owner = owner
+        self._local.cell = cell
+        return cell
+
+    def _retire(self, key):
+        with self._lock:
+            cell = self._cells.pop(key, None)
+            if cell is not None:
+                self._retired = self._reduce([self._retired, cell[0]])
+
+    def _values(self):
+        with self._lock:
+            return [self._retired] + [cell[0] for cell in self._cells.values()]
+
+    @staticmethod
+    def _reduce(values):
+        raise NotImplementedError
+
+    @property
+    def value(self):
+        return self._reduce(self._values())
+
+    @property
+    def shards(self):
+        """分片数（正在使用这个累加器、还没有结束的线程数）"""
+        return len(self._cells)
+
+    def reset(self):
+        """所有分片清零（同时还在累加的线程，其更新可能被清掉）"""
+        with self._lock:
+            self._retired = self.initial
+            for cell in self._cells.values():
+                cell[0] = self.initial
+
+
+class Sum(_Sharded):
+    """求和"""
+
+    _reduce = staticmethod(sum)
+
+    def add(self, value):
+        try:
+            cell = self._local.cell
+        except AttributeError:
+            cell = self._register()
+        cell[0] += value
+
+
+class Counter(Sum):
+    """计数"""
+
+    def inc(self, n=1):
+        self.add(n)
+
+
+def _non_empty(values):
+    return [v for v in values if v is not None]
+
+
+class Max(_Sharded):
+    """最大值；没有任何数据时 value 为 None"""
+
+    initial = None
+
+    @staticmethod
+    def _reduce(values):
+        values = _non_empty(values)
+        return max(values) if values else None
+
+    def update(self, value):
+        try:
+            cell = self._local.cell
+        except AttributeError:
+            cell = self._register()
+        current = cell[0]
+        if current is None or value > current:
+            cell[0] = value
+
+
+class Min(_Sharded):
+    """最小值；没有任何数据时 value 为 None"""
+
+    initial = None
+
+    @staticmethod
+    def _reduce(values):
+        values = _non_empty(values)
+        return min(values) if values else None
+
+    def update(self, value):
+        try:
+            cell = self._local.cell
+        except AttributeError:
+            cell = self._register()
+        current = cell[0]
+        if current is None or value < current:
+            cell[0] = value
+
+
+# ========== 基准测试 ==========
+
+class _LockedGlobals:
+    """对照组：模块级全局变量 + 一把锁（func.py 第 10 节的 global 写法加上锁）"""
+
+    def __init__(self):
+        self.total = 0
+        self.max = None
+        self.lock = threading.Lock()
+
+
+def _run_threads(threads, target):
+    barrier = threading.Barrier(threads + 1)
+
+    def body():
+        barrier.wait()
+        target()
+
+    workers = [threading.Thread(target=body) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    barrier.wait()  # 所有线程都就绪后才开始计时
+    start = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    return time.perf_counter() - start
+
+
+def benchmark(threads, ops):
+    """
+    threads 个线程一共执行 ops 次"计数 + 更新最大值"
+
+    返回:
+        dict: {方式: (耗时秒, 结果是否正确)}
+    """
+    per_thread = ops // threads
+    expected_total = per_thread * threads
+    expected_max = per_thread - 1
+    results = {}
+
+    shared = _LockedGlobals()
+
+    def locked():
+        lock = shared.lock
+        for i in range(per_thread):
+            with lock:
+                shared.total += 1
+                if shared.max is None or i > shared.max:
+                    shared.max = i
+
+    elapsed = _run_threads(threads, locked)
+    results["全局变量 + Lock"] = (elapsed, (shared.total, shared.max) == (expected_total, expected_max))
+
+    counter, maximum = Counter(), Max()
+
+    def sharded():
+        inc, update = counter.inc, maximum.update
+        for i in range(per_thread):
+            inc()
+            update(i)
+
+    elapsed = _run_threads(threads, sharded)
+    results["分片 Counter + Max"] = (elapsed, (counter.value, maximum.value) == (expected_total, expected_max))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="加锁的全局变量 vs 分片累加器")
+    parser.add_argument("--ops", type=int, default=1_000_000, help="总操作次数（默认 100 万）")
+    parser.add_argument("--threads", default="1,2,4,8,16,32,64", help="逗号分隔的线程数")
+    args = parser.parse_args(argv)
+    counts = [int(t) for t in args.threads.split(",")]
+
+    print("=" * 60)
+    print(f"{args.ops:,} 次计数 + 最大值更新（{os.cpu_count()} 核）")
+    print("=" * 60)
+    print(f"  {'线程':>4}{'全局变量 + Lock':>18}{'分片':>12}{'加速':>8}")
+    benchmark(2, 20_000)  # 预热
+    for threads in counts:
+        results = benchmark(threads, args.ops)
+        (locked, ok1), (sharded, ok2) = results.values()
+        mark = "" if ok1 and ok2 else "  ❌ 结果错误"
+        print(f"  {threads:>4}{locked * 1e3:>15.0f} ms{sharded * 1e3:>9.0f} ms"
+              f"{locked / sharded:>7.2f}x{mark}")
+
+
+if __name__ == "__main__":
+    main()
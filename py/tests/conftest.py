@@ -0,0 +1,5 @@
+import os
+import sys
+
+# 教程模块都直接放在 py/ 下（没有包结构），测试时把 py/ 加进导入路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
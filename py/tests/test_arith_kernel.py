@@ -0,0 +1,56 @@
+import operator
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from arith_kernel import apply, evaluate, negate  # noqa: E402
+
+
+def test_int_true_divide_matches_python_above_2_53():
+    a, b = [2**53 + 1, 10**18 + 1, 7], [3, 7, 2]
+    assert apply("/", a, b).tolist() == [x / y for x, y in zip(a, b)]
+    assert apply("/", [-(2**63)], [3]).tolist() == [-(2**63) / 3]
+
+
+def test_float_power_overflow_raises():
+    with pytest.raises(OverflowError):
+        apply("**", [10.0], [400.0])
+    with pytest.raises(OverflowError):
+        apply("**", [2, 10], [3.0, 400.0])
+    with pytest.raises(ZeroDivisionError):
+        apply("**", [0.0], [-1.0])
+    assert apply("**", [np.inf, 2.0], [2.0, -2000.0]).tolist() == [np.inf, 0.0]
+
+
+def test_int_power_is_per_element():
+    got = apply("**", [2, 7], [-1, 13]).tolist()
+    assert got == [0.5, 7**13]
+    assert type(got[1]) is int
+
+
+@pytest.mark.parametrize("op", ["+", "-", "*", "//", "%"])
+def test_int64_overflow_promotes_to_object(op):
+    a, b = [2**62, -(2**63), 5], [4, 1, -3]
+    func = {"+": operator.add, "-": operator.sub, "*": operator.mul,
+            "//": operator.floordiv, "%": operator.mod}[op]
+    assert apply(op, a, b).tolist() == [func(x, y) for x, y in zip(a, b)]
+
+
+def test_overflow_raise_and_huge_power():
+    with pytest.raises(OverflowError):
+        apply("*", [2**62], [4], overflow="raise")
+    assert apply("**", [3], [10**9], overflow="float").tolist() == [np.inf]
+
+
+def test_uint64_and_negative_zero():
+    big = np.array([2**64 - 1, 1], dtype=np.uint64)
+    assert apply("+", big, 1).tolist() == [2**64, 2]
+    assert str(negate(np.array([0.0]))[0]) == "-0.0"
+    assert negate(np.array([-(2**63)])).tolist() == [2**63]
+
+
+def test_evaluate_matches_python():
+    x, y = np.array([-7, 3, 10]), np.array([2, -4, 3])
+    got = evaluate("(x + y) * 2 % y - x // y", x=x, y=y).tolist()
+    assert got == [(p + q) * 2 % q - p // q for p, q in zip(x.tolist(), y.tolist())]
@@ -0,0 +1,39 @@
+import asyncio
+
+from async_fetch import AsyncFetcher, start_stub_server
+
+
+def _fetch(paths, **options):
+    """依次抓取 paths（同一个 fetcher，连接可复用），返回 (结果列表, 服务端计数)"""
+    async def run():
+        server, base, stats = await start_stub_server(body_size=100_000)
+        async with server:
+            async with AsyncFetcher(concurrency=1, per_host=1, **options) as fetcher:
+                results = [await fetcher.fetch(base + path) for path in paths]
+        return results, stats
+    return asyncio.run(run())
+
+
+def test_content_length_body():
+    (result,), _ = _fetch(["/a"])
+    assert result.ok and result.status == 200 and result.size == 100_000
+
+
+def test_chunked_body():
+    (result,), _ = _fetch(["/a?chunked=1&size=150000"])
+    assert result.ok and result.size == 150_000
+
+
+def test_close_delimited_body():
+    results, stats = _fetch(["/a?close=1&size=70000", "/b"])
+    assert [r.size for r in results] == [70_000, 100_000]
+    assert all(r.ok and r.attempts == 1 for r in results)
+    assert stats["200"] == 2
+
+
+def test_204_has_no_body_and_keeps_connection():
+    results, stats = _fetch(["/a?status=204", "/b?status=304", "/c"], timeout=1, retries=1)
+    assert [(r.status, r.size, r.attempts) for r in results] == [(204, 0, 1), (304, 0, 1),
+                                                                  (200, 100_000, 1)]
+    assert all(r.error is None for r in results)
+    assert all(r.elapsed < 0.5 for r in results)
@@ -0,0 +1,27 @@
+import contextlib
+import io
+
+import pytest
+
+import bench
+from demo_runner import load
+
+
+@pytest.mark.parametrize("name", sorted(bench.CASES))
+def test_every_case_runs_at_smallest_size(name):
+    case = bench.CASES[name]
+    run, args = case.setup(min(case.sizes))
+    with contextlib.redirect_stdout(io.StringIO()):
+        run(*args)
+
+
+def test_for_and_if_cases_call_the_demo_functions():
+    for_demo, if_demo = load("for"), load("if")
+    assert bench.CASES["for.total_average"].setup(10)[0] is for_demo.total_and_average
+    assert bench.CASES["for.max_loop"].setup(10)[0] is for_demo.find_max
+    assert bench.CASES["for.squares"].setup(10)[0] is for_demo.square_all
+    assert bench.CASES["for.even_squares"].setup(10)[0] is for_demo.even_squares
+
+    run, (scores,) = bench.CASES["if.grade_chain"].setup(100)
+    assert run(scores) == [if_demo.get_grade(s) for s in scores]
+    assert if_demo.get_grade(92) == "优秀" and if_demo.get_grade(59) == "不及格"
@@ -0,0 +1,53 @@
+import pytest
+
+from event_router import EventRouter
+
+
+def test_same_named_handlers_keep_separate_histograms():
+    def make(name):
+        def handler(batch):
+            pass
+        handler.__name__ = name
+        return handler
+
+    first, second = make("handle"), make("handle")
+    router = EventRouter()
+    router.add_route("a", first)
+    router.add_route("b", second)
+    router.dispatch_batch(["a", "b", "b"])
+
+    latency = router.stats()["latency"]
+    assert latency[first]["count"] == 1
+    assert latency[second]["count"] == 1
+
+
+def test_generator_events_are_routed_with_key():
+    seen = []
+    router = EventRouter(key=lambda e: e["status"])
+    router.add_route("ok", seen.extend)
+
+    events = ({"status": s, "id": i} for i, s in enumerate(["ok", "bad", "ok"]))
+    result = router.dispatch_batch(events)
+
+    assert [e["id"] for e in seen] == [0, 2]
+    assert result[seen.extend] == 2
+    assert router.counts == {"ok": 2, "bad": 1}
+
+
+def test_failing_handler_events_are_not_counted():
+    router = EventRouter()
+
+    @router.route("ok")
+    def on_ok(batch):
+        pass
+
+    @router.route("boom")
+    def on_boom(batch):
+        raise RuntimeError("handler failed")
+
+    with pytest.raises(RuntimeError):
+        router.dispatch_batch(["ok", "boom", "ok", "boom"])
+
+    assert router.counts == {"ok": 2}
+    assert on_boom not in router.latency
+    assert router.latency[on_ok].count == 1
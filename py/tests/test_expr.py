@@ -0,0 +1,37 @@
+import pytest
+
+from expr import arg, col, lit
+
+STUDENTS = [
+    {"name": "a", "score": 85, "age": 19},
+    {"name": "b", "score": 55, "age": 18},
+    {"name": "c", "score": 92, "age": 22},
+]
+
+
+def test_negative_literal_base_is_parenthesized():
+    assert (lit(-5) ** arg(0))(2) == 25
+    assert (lit(-3) ** col("x")).map([{"x": 2}, {"x": 3}]) == [9, -27]
+    assert (lit(-2.5) ** arg(0))(2) == 6.25
+    assert (lit(-0.0) ** arg(0))(0) == 1.0
+    assert (-lit(-5) + arg(0))(0) == 5
+
+
+def test_negative_literal_in_numpy_kernel():
+    np = pytest.importorskip("numpy")
+    got = (lit(-3) ** col("x")).evaluate({"x": np.array([2, 3])})
+    assert got.tolist() == [9, -27]
+
+
+def test_filter_map_match_lambdas():
+    passed = (col("score") >= 60) & (col("age") < 20)
+    assert passed.filter(STUDENTS) == [s for s in STUDENTS if s["score"] >= 60 and s["age"] < 20]
+    assert col("score").map(STUDENTS) == [85, 55, 92]
+    assert (arg(0) ** arg(1)).function()(2, 3) == 8
+
+
+def test_bool_and_mixed_col_arg_are_rejected():
+    with pytest.raises(TypeError):
+        bool(col("score") >= 60)
+    with pytest.raises(ValueError):
+        (col("x") + arg(0)).function()
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from demo_runner import load
+from grading import SCORE_GRADES, ThresholdClassifier, grade
+
+
+def test_grade_matches_if_chain_at_every_boundary():
+    get_grade = load("if").get_grade
+    for score in [-1, 0, 59, 59.9, 60, 79, 80, 89.5, 90, 100, 101]:
+        assert grade(score) == get_grade(score)
+
+
+def test_array_stream_and_count_agree_with_scalar_path():
+    scores = np.arange(-5, 106)
+    expected = [grade(s) for s in scores.tolist()]
+    assert SCORE_GRADES.classify_array(scores).tolist() == expected
+    chunks = list(SCORE_GRADES.classify_stream(iter(scores.tolist()), chunk_size=7))
+    assert [label for chunk in chunks for label in chunk] == expected
+    for source in (scores, iter(scores.tolist())):
+        counts = SCORE_GRADES.count(source, chunk_size=10)
+        assert counts == {label: expected.count(label) for label in SCORE_GRADES.labels}
+    assert list(counts) == SCORE_GRADES.labels
+
+
+def test_empty_input():
+    assert SCORE_GRADES.count([]) == dict.fromkeys(SCORE_GRADES.labels, 0)
+    assert list(SCORE_GRADES.classify_stream([])) == []
+
+
+@pytest.mark.parametrize("cutoffs, labels", [
+    ([60, 80], ["a", "b"]),      # labels 少一个
+    ([60, 60], ["a", "b", "c"]),  # 不是严格升序
+    ([80, 60], ["a", "b", "c"]),
+])
+def test_rejects_invalid_rules(cutoffs, labels):
+    with pytest.raises(ValueError):
+        ThresholdClassifier(cutoffs, labels)
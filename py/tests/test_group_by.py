@@ -0,0 +1,60 @@
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import group_by as gb  # noqa: E402
+from group_by import GroupBy, factorize, group_by  # noqa: E402
+
+RECORDS = [
+    {"city": "北京", "age": 18, "score": 90},
+    {"city": "上海", "age": 19, "score": 70},
+    {"city": "北京", "age": 18, "score": 60},
+    {"city": "北京", "age": 20, "score": 80},
+    {"city": "上海", "age": 19, "score": 100},
+]
+
+
+def test_mixed_type_list_keeps_key_types():
+    uniques, codes = factorize([1, "a", 1])
+    assert uniques == [1, "a"]
+    assert codes.tolist() == [0, 1, 0]
+    result = group_by({"k": [1, "a", 1]}, "k").result()
+    assert result == {1: {"count": 2}, "a": {"count": 1}}
+
+
+def test_nan_keys_are_one_group_across_chunks():
+    g = GroupBy("k", "v")
+    g.update({"k": [1.0, float("nan")], "v": [1, 2]})
+    g.update({"k": np.array([np.nan, 1.0]), "v": [3, 4]})
+    g.update({"k": ["x", float("nan"), float("nan")], "v": [5, 6, 7]})
+    result = g.result()
+    assert len(result) == 3
+    nan_key = [k for k in result if isinstance(k, float) and math.isnan(k)]
+    assert len(nan_key) == 1
+    assert result[nan_key[0]]["count"] == 4
+
+
+def test_pairwise_path_matches_combined(monkeypatch):
+    expected = group_by(RECORDS, ["city", "age"], "score").result()
+    monkeypatch.setattr(gb, "_INT64_LIMIT", 2)  # 强制走逐字段重新编码的路径
+    assert group_by(RECORDS, ["city", "age"], "score").result() == expected
+    assert expected[("北京", 18)] == {"count": 2, "sum": 150.0, "mean": 75.0,
+                                     "min": 60.0, "max": 90.0}
+
+
+def test_merge_equals_single_pass():
+    part1 = group_by(RECORDS[:2], ["city", "age"], "score")
+    part2 = group_by(RECORDS[2:], ["city", "age"], "score")
+    whole = group_by(RECORDS, ["city", "age"], "score")
+    assert part1.merge(part2).result() == whole.result()
+    with pytest.raises(ValueError):
+        part1.merge(GroupBy("city"))
+
+
+def test_none_sorts_last():
+    data = {"k": ["b", None, "a", None], "g": [2, None, 1, 3]}
+    assert list(group_by(data, "k").result()) == ["a", "b", None]
+    assert list(group_by(data, ["g", "k"]).result()) == [(1, "a"), (2, "b"), (3, None),
+                                                          (None, None)]
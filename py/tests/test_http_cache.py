@@ -0,0 +1,77 @@
+import io
+
+import pytest
+
+pytest.importorskip("requests")
+
+import requests  # noqa: E402
+from requests.structures import CaseInsensitiveDict  # noqa: E402
+
+from http_cache import CachingClient, ResponseCache, start_stub_server  # noqa: E402
+from http_client import HttpClient  # noqa: E402
+
+
+class _StubClient:
+    """不走网络：返回一个没有 Content-Length 的流式响应"""
+
+    def __init__(self, body, headers=None):
+        self.body = body
+        self.headers = headers or {}
+
+    def request(self, method, url, headers=None, stream=False):
+        response = requests.Response()
+        response.status_code = 200
+        response.headers = CaseInsensitiveDict(self.headers)
+        response.raw = io.BytesIO(self.body)
+        return response
+
+
+def test_oversized_body_with_content_length(tmp_path):
+    server, base, counts = start_stub_server(body_size=200_000)
+    try:
+        cache = ResponseCache(tmp_path, max_bytes=100_000)
+        with HttpClient(pool_size=1) as http:
+            client = CachingClient(cache, http)
+            with client.get(f"{base}/fresh/1") as response:
+                assert response.status == 200
+                assert not response.from_cache
+                assert len(response.body) == 200_000
+        assert len(cache) == 0
+        cache.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_oversized_body_without_content_length(tmp_path):
+    body = b"x" * 200_000
+    cache = ResponseCache(tmp_path, max_bytes=100_000)
+    client = CachingClient(cache, _StubClient(body, {"Cache-Control": "max-age=60"}))
+    with client.get("http://example.invalid/big") as response:
+        assert response.content == body
+        assert not response.from_cache
+    assert len(cache) == 0 and cache.total_bytes() == 0
+    cache.close()
+
+
+def test_oversized_body_keeps_other_entries(tmp_path):
+    cache = ResponseCache(tmp_path, max_bytes=100_000)
+    small = CachingClient(cache, _StubClient(b"s" * 1000, {"Cache-Control": "max-age=60"}))
+    small.get("http://example.invalid/small").close()
+    big = CachingClient(cache, _StubClient(b"b" * 200_000, {"Cache-Control": "max-age=60"}))
+    big.get("http://example.invalid/big").close()
+    assert len(cache) == 1 and cache.evicted == 0
+    cache.close()
+
+
+def test_stored_headers_describe_decoded_body(tmp_path):
+    headers = {"Cache-Control": "max-age=60", "Content-Length": "5", "Content-Encoding": "identity"}
+    cache = ResponseCache(tmp_path)
+    client = CachingClient(cache, _StubClient(b"hello", headers))
+    client.get("http://example.invalid/a").close()
+    with client.get("http://example.invalid/a") as response:
+        assert response.from_cache
+        assert response.content == b"hello"
+        assert "content-length" not in response.headers
+        assert "content-encoding" not in response.headers
+    cache.close()
@@ -0,0 +1,62 @@
+import pytest
+
+pytest.importorskip("requests")
+
+from http_client import HttpClient, start_stub_server  # noqa: E402
+
+
+@pytest.fixture
+def base():
+    server, base = start_stub_server()
+    yield base
+    server.shutdown()
+    server.server_close()
+
+
+def test_idempotent_methods_are_retried(base):
+    with HttpClient(retries=3, backoff=0.001) as client:
+        response = client.get(base + "/flaky/2")
+    assert response.status_code == 200
+    assert response.attempts == 3
+
+
+def test_post_is_not_retried_by_default(base):
+    with HttpClient(retries=3, backoff=0.001) as client:
+        response = client.request("POST", base + "/flaky/2", data=b"x")
+    assert response.status_code == 503
+    assert response.attempts == 1
+
+
+def test_retry_methods_is_configurable(base):
+    with HttpClient(retries=3, backoff=0.001, retry_methods=["get", "post"]) as client:
+        response = client.request("POST", base + "/flaky/2", data=b"x")
+    assert response.status_code == 200
+    assert response.attempts == 3
+
+    with HttpClient(retries=3, backoff=0.001, retry_methods=None) as client:
+        response = client.request("POST", base + "/flaky/1", data=b"x")
+    assert response.status_code == 200
+    assert response.attempts == 2
+
+
+class _Response:
+    def __init__(self, retry_after):
+        self.headers = {"Retry-After": retry_after}
+
+
+@pytest.mark.parametrize("retry_after, expected", [
+    ("-5", 0.0), ("nan", 0.5), ("inf", 0.5), ("-inf", 0.5), ("2", 2.0), ("999", 10.0),
+])
+def test_retry_after_is_clamped(retry_after, expected):
+    client = HttpClient(backoff=0.5, max_backoff=10.0)
+    assert client._delay(1, _Response(retry_after)) == expected
+
+
+def test_fetch_many_does_not_accumulate_sessions(base):
+    with HttpClient(pool_size=4) as client:
+        client.get(base + "/")
+        for _ in range(5):
+            results = client.fetch_many([base + "/"] * 8, workers=4)
+            assert all(r.ok for r in results)
+        assert len(client._sessions) == 1  # 只剩调用线程自己的 Session
+        assert client.get(base + "/").status_code == 200
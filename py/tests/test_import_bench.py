@@ -0,0 +1,20 @@
+import import_bench
+
+
+def test_every_module_imports_within_budget():
+    # 和 python import_bench.py --all --budget-ms BUDGET_MS 相同的检查
+    report = import_bench.measure(import_bench.all_modules(), repeat=3)
+    assert import_bench.check_budget(report, import_bench.BUDGET_MS) == []
+    assert [row["module"] for row in report if row["import_stdout_bytes"]] == []
+
+
+def test_check_budget_reports_slow_and_heavy_modules():
+    report = [
+        {"module": "fast", "import_us": 1_000, "heavy_imports": []},
+        {"module": "slow", "import_us": 250_000, "heavy_imports": []},
+        {"module": "heavy", "import_us": 1_000, "heavy_imports": ["numpy"]},
+    ]
+    assert import_bench.check_budget(report, 100) == [
+        ("slow", "250.0 ms > 100 ms"),
+        ("heavy", "加载了 numpy"),
+    ]
@@ -0,0 +1,74 @@
+import random
+
+import pytest
+
+from intervals import IntervalIndex, linear_stab
+
+
+def _random_intervals(rng, n, start=0):
+    intervals = []
+    for i in range(n):
+        lo = rng.randint(0, 100)
+        intervals.append((lo, lo + rng.randint(0, 20), start + i))
+    return intervals
+
+
+def _check(index, live, xs):
+    expected = [sorted(linear_stab(live.values(), x)) for x in xs]
+    assert [sorted(index.stab(x)) for x in xs] == expected
+    assert [sorted(hits) for hits in index.stab_many(xs)] == expected
+
+
+def test_closed_endpoints_and_centers():
+    index = IntervalIndex([(10, 20, "中档"), (0, 9, "低档"), (20, 20, "点")])
+    assert index.stab(10) == ["中档"]
+    assert sorted(index.stab(20)) == ["中档", "点"]
+    assert index.stab(9.5) == []
+    assert [sorted(h) for h in index.stab_many([0, 9, 20, 21])] == \
+        [["低档"], ["低档"], ["中档", "点"], []]
+
+
+def test_empty_index():
+    index = IntervalIndex()
+    assert len(index) == 0
+    assert index.stab(1) == []
+    assert index.stab_many([1, 2]) == [[], []]
+    key = index.insert(0, 5, "a")
+    assert index.stab_many([3]) == [["a"]]
+    index.delete(key)
+    assert index.stab_many([3]) == [[]]
+
+
+def test_rejects_inverted_interval():
+    with pytest.raises(ValueError):
+        IntervalIndex([(5, 1, "x")])
+
+
+def test_stab_many_matches_stab_with_pending_and_deleted():
+    rng = random.Random(0)
+    intervals = _random_intervals(rng, 500)
+    index = IntervalIndex(intervals)
+    live = {value: (lo, hi, value) for lo, hi, value in intervals}
+    keys = dict(enumerate(live))  # 初始区间的 key 就是插入顺序
+    xs = [rng.uniform(-5, 125) for _ in range(200)] + list(range(0, 121, 5))
+
+    # 少量改动：留在缓冲区和墓碑里，不触发重建
+    for lo, hi, value in _random_intervals(rng, 20, start=1000):
+        keys[index.insert(lo, hi, value)] = value
+        live[value] = (lo, hi, value)
+    for key in rng.sample(sorted(keys), 20):
+        index.delete(key)
+        del live[keys.pop(key)]
+    assert index._pending and index._deleted
+    _check(index, live, xs)
+
+    # 大量改动：触发自动重建，之后缓冲区和墓碑被清空
+    for lo, hi, value in _random_intervals(rng, 100, start=2000):
+        keys[index.insert(lo, hi, value)] = value
+        live[value] = (lo, hi, value)
+    assert not index._deleted
+    _check(index, live, xs)
+    assert len(index) == len(live)
+
+    index.rebuild()
+    _check(index, live, xs)
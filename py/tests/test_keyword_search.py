@@ -0,0 +1,57 @@
+import random
+
+from keyword_search import KeywordMatcher
+
+
+def _naive(keywords, text):
+    return sorted((i, k) for k in dict.fromkeys(keywords) if k
+                  for i in range(len(text)) if text.startswith(k, i))
+
+
+def test_overlapping_and_nested_hits():
+    matcher = KeywordMatcher(["he", "she", "his", "hers", "e"])
+    assert sorted(matcher.find_all("ushers")) == _naive(matcher.keywords, "ushers")
+    assert matcher.find_all("USHERS") == []  # 区分大小写
+    assert KeywordMatcher(["Python", "Java", "on"]).find_all("Hello Python") == \
+        [(6, "Python"), (10, "on")]
+
+
+def test_matches_naive_search_on_random_text():
+    rng = random.Random(0)
+    keywords = ["".join(rng.choice("ab") for _ in range(rng.randint(1, 4))) for _ in range(15)]
+    matcher = KeywordMatcher(keywords + ["", keywords[0]])
+    assert matcher.keywords == list(dict.fromkeys(keywords))
+    for _ in range(50):
+        text = "".join(rng.choice("abc") for _ in range(rng.randint(0, 40)))
+        assert sorted(matcher.find_all(text)) == _naive(keywords, text)
+        assert matcher.contains_any(text) == bool(_naive(keywords, text))
+
+
+def test_stream_scanner_finds_hits_across_chunk_boundaries():
+    matcher = KeywordMatcher(["Python", "关键词", "on"])
+    text = "学 Python 找关键词，Python 3 on"
+    expected = matcher.find_all(text)
+    for size in (1, 2, 3, 7):
+        scanner = matcher.scanner()
+        hits = []
+        for start in range(0, len(text), size):
+            hits += scanner.feed(text[start:start + size])
+        assert hits == expected
+    scanner.reset()
+    assert scanner.feed("Python") == [(0, "Python"), (4, "on")]
+
+
+def test_empty_matcher_and_empty_text():
+    assert KeywordMatcher([]).find_all("anything") == []
+    assert not KeywordMatcher([""]).contains_any("anything")
+    assert KeywordMatcher(["a"]).find_all("") == []
+
+
+def test_save_load_roundtrip(tmp_path):
+    matcher = KeywordMatcher(["苹果", "果汁", "汁"])
+    path = tmp_path / "keywords.json"
+    matcher.save(path)
+    loaded = KeywordMatcher.load(path)
+    text = "苹果汁和果汁"
+    assert loaded.find_all(text) == matcher.find_all(text)
+    assert loaded.contains_any("一杯汁")
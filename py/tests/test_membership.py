@@ -0,0 +1,58 @@
+import pytest
+
+from membership import _HEADER, BloomFilter, build_index
+
+
+def test_probes_never_collapse_onto_one_bit(monkeypatch):
+    bloom = BloomFilter(1000, 0.01)
+    m = bloom.num_bits
+    # h2 为 0 或 m 的倍数时，旧实现的 k 个位置全部相同
+    for h2 in (0, m, 3 * m):
+        monkeypatch.setattr("membership.struct.unpack", lambda fmt, data, h2=h2: (12345, h2))
+        positions = bloom._positions("x")
+        assert len(set(positions)) == bloom.num_hashes
+
+
+def test_tiny_filter_has_no_zero_step():
+    bloom = BloomFilter(1, fp_rate=0.99)
+    bloom.add("a")
+    assert "a" in bloom
+
+
+def test_no_false_negatives_and_roundtrip(tmp_path):
+    items = [f"user-{i}" for i in range(2000)]
+    bloom = build_index(items, bloom=True, fp_rate=0.01)
+    assert all(bloom.contains_many(items))
+    path = tmp_path / "f.bloom"
+    bloom.save(path)
+    for use_mmap in (True, False):
+        loaded = BloomFilter.load(path, use_mmap=use_mmap)
+        assert all(loaded.contains_many(items))
+        assert len(loaded) == 2000
+        del loaded
+
+
+def test_load_rejects_short_header(tmp_path):
+    path = tmp_path / "short.bloom"
+    path.write_bytes(b"BLM1\x00\x01")
+    with pytest.raises(ValueError, match="文件头不完整"):
+        BloomFilter.load(path)
+
+
+@pytest.mark.parametrize("use_mmap", [True, False])
+@pytest.mark.parametrize("delta", [-1, 1])
+def test_load_rejects_wrong_bit_array_length(tmp_path, use_mmap, delta):
+    bloom = BloomFilter.from_items(["a", "b"])
+    path = tmp_path / "f.bloom"
+    bloom.save(path)
+    data = path.read_bytes()
+    path.write_bytes(data[:-1] if delta < 0 else data + b"\x00")
+    with pytest.raises(ValueError, match="位数组长度"):
+        BloomFilter.load(path, use_mmap=use_mmap)
+
+
+def test_load_rejects_zero_bits(tmp_path):
+    path = tmp_path / "zero.bloom"
+    path.write_bytes(_HEADER.pack(b"BLM1", 0, 3, 0))
+    with pytest.raises(ValueError, match="文件头无效"):
+        BloomFilter.load(path)
@@ -0,0 +1,63 @@
+import sys
+
+import metrics
+from demo_runner import load
+
+func = load("func")
+
+
+def test_enable_keeps_recursion_depth():
+    registry = metrics.Registry()
+    depth = sys.getrecursionlimit() - 100
+    expected = func.factorial(depth)  # 不埋点时能跑通的深度
+    metrics.enable({"func": ["factorial"]}, registry=registry)
+    try:
+        assert func.factorial(depth) == expected
+        assert func.factorial(5) == 120
+    finally:
+        metrics.disable()
+    assert registry.snapshot()["func.factorial"]["calls"] == 2
+    assert not hasattr(func, "_factorial__uninstrumented")
+
+
+def test_decorated_recursion_counts_outermost_call():
+    registry = metrics.Registry()
+
+    @metrics.instrument(name="fib", registry=registry)
+    def fib(n):
+        return n if n < 2 else fib(n - 1) + fib(n - 2)
+
+    assert fib(15) == 610
+    assert registry.snapshot()["fib"]["calls"] == 1
+
+
+def test_errors_reset_reentrancy_guard():
+    registry = metrics.Registry()
+
+    @metrics.instrument(name="boom", registry=registry)
+    def boom():
+        raise ValueError
+
+    for _ in range(3):
+        try:
+            boom()
+        except ValueError:
+            pass
+    stats = registry.snapshot()["boom"]
+    assert stats["calls"] == stats["errors"] == 3
+
+
+def test_prometheus_emits_every_bucket():
+    registry = metrics.Registry()
+    metrics.instrument(lambda: None, name="fast", registry=registry)()
+    registry.record("slow", 100.0, False)  # 超过最大的桶，只计入 +Inf
+
+    text = metrics.to_prometheus(registry)
+    for name in ("fast", "slow"):
+        lines = [line for line in text.splitlines()
+                 if line.startswith(f'imber_function_duration_seconds_bucket{{function="{name}"')]
+        assert len(lines) == len(metrics.PROMETHEUS_BUCKETS) + 1
+        assert lines[-1].endswith('le="+Inf"} 1')
+        counts = [int(line.rsplit(" ", 1)[1]) for line in lines]
+        assert counts == sorted(counts)
+        assert counts[-2] == (1 if name == "fast" else 0)
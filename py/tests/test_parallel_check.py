@@ -0,0 +1,33 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from parallel_check import all_of, any_of, excellent, passed  # noqa: E402
+
+PY_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_threaded_first_use_of_lazy_numpy():
+    # 必须是新的解释器：NumPy 还没加载时，多个 worker 线程同时第一次访问 np.asarray
+    script = (
+        "from parallel_check import all_of, passed\n"
+        "result = all_of(list(range(60, 100)) * 100, passed, chunk_size=10,"
+        " workers=8, executor='thread')\n"
+        "assert result.value and result.scanned == 4000, result\n"
+    )
+    for _ in range(3):
+        proc = subprocess.run([sys.executable, "-c", script], cwd=PY_DIR,
+                              capture_output=True, text=True, timeout=120)
+        assert proc.returncode == 0, proc.stderr
+
+
+def test_matches_builtin_all_any():
+    scores = [85, 90, 78, 92, 88]
+    assert bool(all_of(scores, passed, executor="thread")) == all(s >= 60 for s in scores)
+    assert bool(any_of(scores, excellent, executor="thread")) == any(s >= 90 for s in scores)
+    assert not any_of([], excellent, executor="thread")
+    assert all_of([], passed, executor="thread")
@@ -0,0 +1,27 @@
+import contextlib
+import io
+
+import demo_runner
+import parallel_runner
+
+
+def _capture(func, *args):
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        func(*args)
+    return buffer.getvalue()
+
+
+def test_parallel_output_matches_serial_main():
+    serial = _capture(demo_runner.load("if").main)
+    output = _capture(parallel_runner.main, ["if", "-j", "2"])
+    # 汇总表（墙上时间等）之前的部分应与串行运行逐字相同
+    summary = "=" * 60 + "\n并行运行汇总\n"
+    assert summary in output
+    assert output[:output.index(summary)] == serial
+    assert serial.rstrip().endswith("if 条件判断演示完成！\n" + "=" * 60)
+
+
+def test_quiet_prints_only_summary():
+    output = _capture(parallel_runner.main, ["for", "-j", "1", "--quiet"])
+    assert output.startswith("=" * 60 + "\n并行运行汇总\n")
@@ -0,0 +1,55 @@
+import math
+
+import pytest
+
+import parse_numbers
+from parse_numbers import parse_column, split_buffer
+
+
+def test_bad_values_in_nan_mode():
+    result = parse_column(["12", "abc", "7", "", "99999999999999999999"], "int64", "nan")
+    assert result.errors == [(1, "abc"), (3, ""), (4, "99999999999999999999")]
+    values = list(result.values)
+    assert values[0] == 12 and values[2] == 7
+    assert all(math.isnan(values[i]) for i in (1, 3, 4))
+
+
+def test_sentinel_and_raise_modes():
+    dirty = ["1", "x", "3"]
+    assert list(parse_column(dirty, "int64", "sentinel", sentinel=-1).values) == [1, -1, 3]
+    with pytest.raises(ValueError, match="第 1 行 'x'"):
+        parse_column(dirty, "float64", "raise")
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 4, 1000])
+def test_bad_rows_across_chunks(chunk_size):
+    rows = [str(i) for i in range(20)]
+    for i in (0, 5, 6, 19):
+        rows[i] = "N/A"
+    result = parse_column(rows, "float64", "sentinel", sentinel=-1.0, chunk_size=chunk_size)
+    assert [i for i, _ in result.errors] == [0, 5, 6, 19]
+    assert list(result.values) == [-1.0 if r == "N/A" else float(r) for r in rows]
+
+
+def test_bad_rows_convert_each_value_once(monkeypatch):
+    calls = []
+
+    def counting_float(raw):
+        calls.append(raw)
+        return float(raw)
+
+    monkeypatch.setitem(parse_numbers._CONVERTERS, "float64", counting_float)
+    rows = ["1", "2", "bad", "4"] * 10
+    result = parse_column(rows, "float64", chunk_size=8)
+    assert len(result.errors) == 10
+    # 第一块快速路径失败后重做一次，之后每块都只转换一遍
+    assert len(calls) <= len(rows) + 8
+
+
+def test_buffers_are_split_without_bytes_copy():
+    data = b"1.5\n-2\nx\n"
+    for buffer in (data, bytearray(data), memoryview(data)):
+        assert split_buffer(buffer) == [b"1.5", b"-2", b"x"]
+    result = parse_column(memoryview(data)[:7], "float64")
+    assert list(result.values) == [1.5, -2.0]
+    assert split_buffer(b"1;2;", b";") == [b"1", b"2"]
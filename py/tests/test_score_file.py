@@ -0,0 +1,70 @@
+import os
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from score_file import HEADER_SIZE, ScoreFile  # noqa: E402
+
+
+def _torn_append(path, values):
+    """模拟追加到一半崩溃：数据和区间图已经写入，头部还是旧的"""
+    with open(path, "rb") as f:
+        header = f.read(HEADER_SIZE)
+    with ScoreFile.open(path, writable=True) as f:
+        f.append(values)
+    with open(path, "r+b") as f:
+        f.write(header)
+
+
+def test_append_after_torn_append_recomputes_partial_zone(tmp_path):
+    path = str(tmp_path / "s.col")
+    first, torn, later = [90, 91, 92, 93, 94], [10, 11, 12, 13, 14], [95, 96, 97, 98, 99, 80, 81]
+    with ScoreFile.create(path, dtype="int16", block_size=10) as f:
+        f.append(first)
+    _torn_append(path, torn)
+    with ScoreFile.open(path, writable=True) as f:
+        f.append(later)
+
+    expected = first + later
+    with ScoreFile.open(path) as f:
+        assert f.values().tolist() == expected
+        block = f.stats(0, 10)
+        assert (block["count"], block["sum"], block["min"], block["max"]) == \
+            (10, sum(expected[:10]), 90, 99)
+        assert f.count_between(None, 50) == (0, 0)
+        assert f.count_between(95, 99)[0] == 5
+
+
+def test_reopen_drops_zone_records_beyond_header(tmp_path):
+    path = str(tmp_path / "s.col")
+    with ScoreFile.create(path, dtype="int16", block_size=4) as f:
+        f.append([1, 2, 3, 4, 5])
+    _torn_append(path, list(range(100, 110)))
+    with ScoreFile.open(path, writable=True) as f:
+        zones = f.zones()
+        assert zones["count"].tolist() == [4, 1]
+        assert zones["sum"].tolist() == [10, 5]
+    assert os.path.getsize(path + ".zmap") == 2 * zones.dtype.itemsize
+
+
+def test_int64_sum_does_not_overflow(tmp_path):
+    path = str(tmp_path / "big.col")
+    big = 2**62
+    values = [big, big, 1, big, big]
+    with ScoreFile.create(path, dtype="int64", block_size=2) as f:
+        f.append(values)
+    with ScoreFile.open(path) as f:
+        assert f.sum == sum(values)
+        assert f.stats(0, 4)["sum"] == sum(values[:4])  # 块的和超出 int64，改为扫描
+        assert f.stats(1, 5)["sum"] == sum(values[1:])
+        assert f.count_between(2**61) == (4, 3)
+
+
+def test_negative_sum_roundtrip(tmp_path):
+    path = str(tmp_path / "neg.col")
+    with ScoreFile.create(path, dtype="int64") as f:
+        f.append([-2**62] * 3 + [-7])
+    with ScoreFile.open(path) as f:
+        assert f.sum == -3 * 2**62 - 7
+        assert f.mean == (-3 * 2**62 - 7) / 4
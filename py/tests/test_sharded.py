@@ -0,0 +1,53 @@
+import threading
+
+from sharded import Counter, Max, Min, Sum
+
+
+def _run(threads, target):
+    workers = [threading.Thread(target=target, args=(i,)) for i in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+
+def test_concurrent_totals_are_exact():
+    counter, total, high, low = Counter(), Sum(), Max(), Min()
+
+    def work(i):
+        for j in range(1000):
+            counter.inc()
+            total.add(j)
+            high.update(i * 1000 + j)
+            low.update(i * 1000 + j)
+
+    _run(8, work)
+    assert counter.value == 8000
+    assert total.value == 8 * sum(range(1000))
+    assert (high.value, low.value) == (7999, 0)
+
+
+def test_dead_threads_cells_are_reclaimed():
+    counter, high = Counter(), Max()
+
+    def work(i):
+        counter.inc(2)
+        high.update(i)
+
+    for i in range(2000):
+        _run(1, lambda _, i=i: work(i))
+    assert counter.shards == 0 and high.shards == 0
+    assert counter.value == 4000
+    assert high.value == 1999
+
+    counter.inc()
+    assert counter.shards == 1
+    assert counter.value == 4001
+    counter.reset()
+    assert counter.value == 0
+
+
+def test_empty_max_min_are_none():
+    assert Max().value is None
+    assert Min().value is None
+    assert Counter().value == 0
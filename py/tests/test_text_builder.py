@@ -0,0 +1,55 @@
+import contextlib
+import io
+import json
+
+import text_builder
+from text_builder import STRATEGIES, TextBuilder
+
+
+def test_builder_tracks_length_and_builds_once():
+    builder = TextBuilder("分数", 85)
+    builder.append(": ").line("优秀").extend(["a", "b"])
+    builder += "c"
+    assert len(builder) == len("分数85: 优秀\nabc")
+    assert builder.build() == "分数85: 优秀\nabc"
+    # 第二次 build 不重复拼接，结果不变；之后还能继续追加
+    assert builder.build() == str(builder) == "分数85: 优秀\nabc"
+    builder.append("!")
+    assert builder.build() == "分数85: 优秀\nabc!"
+    assert len(builder) == len("分数85: 优秀\nabc!")
+
+
+def test_build_with_separator_and_clear():
+    builder = TextBuilder().extend(["a", "b", "c"])
+    assert builder.build(",") == "a,b,c"
+    assert builder.build() == "abc"
+    builder.clear()
+    assert len(builder) == 0 and builder.build() == ""
+
+
+def test_print_to_builder():
+    builder = TextBuilder()
+    print("成绩", 92, file=builder)
+    print("等级", end="", file=builder)
+    assert builder.build() == "成绩 92\n等级"
+    assert len(builder) == len("成绩 92\n等级")
+
+
+def test_all_strategies_build_the_same_text():
+    for n in (0, 1, 37):
+        outputs = {name: func(n, "张三", 85) for name, func in STRATEGIES.items()}
+        assert set(outputs.values()) == {"张三:85;" * n}
+
+
+def test_main_writes_json_report(tmp_path):
+    path = tmp_path / "report.json"
+    with contextlib.redirect_stdout(io.StringIO()):
+        text_builder.main(["--max-power", "2", "--repeat", "1", "--strategy", "join",
+                           "--strategy", "builder", "--json", str(path)])
+    report = json.loads(path.read_text(encoding="utf-8"))
+    rows = report["results"]
+    assert {(r["strategy"], r["fragment"], r["iterations"]) for r in rows} == {
+        (s, f, n) for s in ("join", "builder") for f in ("short", "long") for n in (10, 100)}
+    for r in rows:
+        name, score = text_builder._FRAGMENTS[r["fragment"]]
+        assert r["output_chars"] == r["iterations"] * len(f"{name}:{score};")
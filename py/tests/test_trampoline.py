@@ -0,0 +1,62 @@
+import pytest
+
+from trampoline import recursive
+
+
+def test_deep_recursion_and_memoize():
+    @recursive
+    def depth(n):
+        return 0 if n == 0 else 1 + (yield depth(n - 1))
+
+    @recursive(memoize=True)
+    def fib(n):
+        return n if n < 2 else (yield fib(n - 1)) + (yield fib(n - 2))
+
+    assert depth(100_000) == 100_000
+    assert fib(300) == 222232244629420445529739893461909967206666939096499764990979600
+
+
+def test_bad_call_arguments_reach_callers_except():
+    @recursive
+    def f(n):
+        if n == 0:
+            return "bottom"
+        try:
+            return (yield f(n - 1, "extra"))
+        except TypeError:
+            return "caught"
+
+    assert f(3) == "caught"
+
+
+def test_unhashable_memo_key_reaches_callers_finally():
+    cleaned = []
+
+    @recursive(memoize=True)
+    def g(x):
+        try:
+            return (yield g([x]))
+        finally:
+            cleaned.append(x)
+
+    with pytest.raises(TypeError):
+        g(1)
+    assert cleaned == [1]
+
+
+def test_exception_propagates_through_stack():
+    @recursive
+    def countdown(n):
+        if n == 0:
+            raise ValueError("bottom")
+        return (yield countdown(n - 1))
+
+    with pytest.raises(ValueError):
+        countdown(10_000)
+
+
+def test_non_generator_body_is_rejected():
+    with pytest.raises(TypeError):
+        @recursive
+        def plain(n):
+            return n
@@ -0,0 +1,255 @@
+"""
+============================================================================
+字符串构建（TextBuilder）与拼接策略基准测试
+============================================================================
+
+📚 核心总结：
+-----------
+var.py 第 6 节演示了三种构建字符串的方式：+ 拼接、f-string、.format()；
+func.py 和 for.py 的循环里也到处在用 f-string。
+在循环里反复 `s += ...` 时，每次都可能生成一个新字符串，
+总代价最坏是 O(n²)；CPython 对 += 有原地扩展的优化，但并不可靠
+（字符串有其它引用、在其它解释器上都会失效）。
+
+推荐做法是"先收集片段，最后 join 一次"：
+   parts = []
+   for ...:
+       parts.append(f"...")
+   text = "".join(parts)
+
+TextBuilder 把这个模式包装成一个小 API：
+   builder = TextBuilder()
+   builder.append("你好，").append(name)
+   builder.line(f"分数: {score}")
+   text = builder.build()
+
+🔑 基准测试：
+-----------
+   python text_builder.py                             # 10 ~ 10^6 次迭代
+   python text_builder.py --max-power 7 --budget 60   # 一直测到 10^7
+   python text_builder.py --json report.json          # 输出 JSON 报告
+
+比较的策略：+= 拼接、f-string +=、.format +=、list + str.join、
+io.StringIO、TextBuilder；片段分为短（约 10 字符）和长（约 200 字符）两种。
+
+============================================================================
+"""
+
+import argparse
+import io
+import json
+import platform
+import sys
+import time
+
+
+class TextBuilder:
+    """缓冲字符串片段，最后一次性 join"""
+
+    __slots__ = ("_parts", "_length")
+
+    def __init__(self, *parts):
+        self._parts = [str(p) for p in parts]
+        self._length = sum(len(p) for p in self._parts)
+
+    def append(self, text):
+        """追加一个片段，返回自身以便链式调用"""
+        self._parts.append(text)
+        self._length += len(text)
+        return self
+
+    def __iadd__(self, text):
+        self.append(text)
+        return self
+
+    def line(self, text=""):
+        """追加一行（自动加换行符）"""
+        self._parts.append(text)
+        self._parts.append("\n")
+        self._length += len(text) + 1
+        return self
+
+    def extend(self, texts):
+        """追加多个片段"""
+        for text in texts:
+            self.append(text)
+        return self
+
+    def write(self, text):
+        """兼容文件对象接口，可以作为 print(..., file=builder) 的目标"""
+        self.append(text)
+        return len(text)
+
+    def __len__(self):
+        return self._length
+
+    def build(self, sep=""):
+        """拼接所有片段；拼接结果会替换掉片段列表，重复调用不会重复拼接"""
+        text = sep.join(self._parts)
+        if not sep:
+            self._parts = [text] if text else []
+        return text
+
+    def __str__(self):
+        return self.build()
+
+    def clear(self):
+        self._parts.clear()
+        self._length = 0
+
+
+# ========== 基准测试 ==========
+
+_FRAGMENTS = {
+    "short": ("张三", 85),
+    "long": ("张" * 196, 85),
+}
+
+
+def _concat(n, name, score):
+    s = ""
+    for i in range(n):
+        s = s + name + ":" + str(score) + ";"
+    return s
+
+
+def _fstring(n, name, score):
+    s = ""
+    for i in range(n):
+        s += f"{name}:{score};"
+    return s
+
+
+def _format(n, name, score):
+    s = ""
+    for i in range(n):
+        s += "{}:{};".format(name, score)
+    return s
+
+
+def _join(n, name, score):
+    parts = []
+    for i in range(n):
+        parts.append(f"{name}:{score};")
+    return "".join(parts)
+
+
+def _stringio(n, name, score):
+    buf = io.StringIO()
+    for i in range(n):
+        buf.write(f"{name}:{score};")
+    return buf.getvalue()
+
+
+def _builder(n, name, score):
+    builder = TextBuilder()
+    append = builder.append
+    for i in range(n):
+        append(f"{name}:{score};")
+    return builder.build()
+
+
+STRATEGIES = {
+    "concat": _concat,
+    "fstring": _fstring,
+    "format": _format,
+    "join": _join,
+    "stringio": _stringio,
+    "builder": _builder,
+}
+
+
+def run_benchmark(max_power=6, strategies=None, repeat=3, budget=5.0):
+    """
+    运行拼接策略基准测试
+
+    参数:
+        max_power: 迭代次数从 10 到 10**max_power
+        strategies: 要测试的策略名列表，默认全部
+        repeat: 每组重复次数，取最小值
+        budget: 预计下一档规模单次运行会超过这个秒数时，不再继续放大
+
+    返回:
+        dict: 可直接写成 JSON 的报告
+    """
+    names = strategies or list(STRATEGIES)
+    results = []
+    for size, (name, score) in _FRAGMENTS.items():
+        for strategy in names:
+            func = STRATEGIES[strategy]
+            previous = None
+            for power in range(1, max_power + 1):
+                n = 10 ** power
+                times = []
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    text = func(n, name, score)
+                    times.append(time.perf_counter() - start)
+                best = min(times)
+                results.append({
+                    "strategy": strategy,
+                    "fragment": size,
+                    "iterations": n,
+                    "seconds": best,
+                    "ns_per_iter": best / n * 1e9,
+                    "output_chars": len(text),
+                })
+                del text
+                # 下一档规模是 10 倍：按上一档到这一档的实际增长倍数估算
+                # 下一档耗时（平方级的 concat 会增长约 100 倍），超出预算就停止
+                growth = max(10.0, best / previous) if previous else 10.0
+                if best * growth > budget:
+                    break
+                previous = best
+    return {
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def print_report(report):
+    """把报告打印成表格"""
+    print(f"  Python {report['python']} ({report['implementation']})")
+    rows = report["results"]
+    for fragment in _FRAGMENTS:
+        print()
+        print(f"  片段: {fragment}（ns/次）")
+        sizes = sorted({r["iterations"] for r in rows if r["fragment"] == fragment})
+        labels = [f"10^{len(str(n)) - 1}" for n in sizes]
+        print(f"  {'策略':<10}" + "".join(f"{label:>10}" for label in labels))
+        for strategy in dict.fromkeys(r["strategy"] for r in rows):
+            cells = {r["iterations"]: r["ns_per_iter"] for r in rows
+                     if r["strategy"] == strategy and r["fragment"] == fragment}
+            line = "".join(f"{cells[n]:>10.0f}" if n in cells else f"{'-':>10}" for n in sizes)
+            print(f"  {strategy:<10}{line}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="字符串拼接策略基准测试")
+    parser.add_argument("--max-power", type=int, default=6, help="最大迭代次数 10^N（默认 6）")
+    parser.add_argument("--repeat", type=int, default=3, help="每组重复次数（默认 3）")
+    parser.add_argument("--strategy", action="append", choices=list(STRATEGIES),
+                        help="只测试指定策略，可重复")
+    parser.add_argument("--budget", type=float, default=5.0,
+                        help="预计单次运行超过这个秒数就停止放大规模（默认 5.0）")
+    parser.add_argument("--json", metavar="PATH", help="把报告写入 JSON 文件")
+    args = parser.parse_args(argv)
+
+    print("=" * 60)
+    print("字符串拼接策略基准测试")
+    print("=" * 60)
+
+    report = run_benchmark(args.max_power, args.strategy, args.repeat, args.budget)
+    print_report(report)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print()
+        print(f"  JSON 报告已写入 {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,337 @@
+"""
+============================================================================
+蹦床（Trampoline）- 用显式栈执行生成器写法的递归函数，不受递归深度限制
+============================================================================
+
+📚 核心总结：
+-----------
+func.py 里的 factorial 是最典型的递归函数：
+
+   def factorial(n):
+       if n <= 1:
+           return 1
+       return n * factorial(n - 1)
+
+Python 没有尾调用优化，每一层递归都占一个栈帧：
+- 超过 sys.getrecursionlimit()（默认 1000）就抛出 RecursionError
+- 调大递归上限也不安全：C 栈溢出时解释器直接崩溃
+
+蹦床的做法：把"递归调用"改写成 yield，由一个循环来调度：
+
+   @recursive
+   def factorial(n):
+       if n <= 1:
+           return 1
+       return n * (yield factorial(n - 1))     # 只多了 yield 和一对括号
+
+1. 函数体是生成器；yield factorial(n - 1) 并不真的调用，而是交给调度循环一个"调用请求"
+2. 调度循环把新的生成器压进一个列表（显式栈），执行到它 return，
+   再把返回值 send 回上一层生成器
+3. 无论递归多深，C 栈的深度都是常数；显式栈只占堆内存
+4. @recursive(memoize=True)：按参数缓存结果（斐波那契、动态规划），
+   缓存命中时不再创建生成器
+
+🔑 用法：
+-------
+   from trampoline import recursive
+
+   @recursive
+   def depth(node):
+       best = 0
+       for child in node.children:
+           best = max(best, (yield depth(child)))
+       return best + 1
+
+   depth(root)           # 在外部正常调用，得到结果
+
+   @recursive(memoize=True)
+   def fib(n):
+       if n < 2:
+           return n
+       return (yield fib(n - 1)) + (yield fib(n - 2))
+
+   fib.cache_clear()
+
+⚠️ 注意：
+--------
+1. 在被装饰的函数体内，递归调用必须写成 yield f(...)；
+   不带 yield 的调用会得到一个"调用请求"对象而不是结果
+2. 每层调用要创建一个生成器，比普通递归慢几倍；
+   只在递归可能很深、或者需要记忆化时使用
+3. 记忆化的参数必须可哈希；缓存不会自动清理，用 cache_clear() 释放
+4. 异常会沿着显式栈逐层抛回各个生成器，try/except、finally 和普通递归一样生效；
+   参数个数不对、记忆化的参数不可哈希时的 TypeError 也一样抛回发起调用的那一层
+5. 挂起的生成器都会被循环垃圾回收器跟踪，几十万层的深递归中 gc 要反复扫描它们；
+   对性能敏感、又确定不会产生循环引用时，可以在调用前后 gc.disable() / gc.enable()
+6. 被装饰的函数必须是生成器函数（函数体里有 yield），否则装饰时就抛出 TypeError
+
+============================================================================
+"""
+
+import functools
+import inspect
+import sys
+
+_BODIES = set()  # 所有被装饰的函数体的 code 对象
+
+
+class _Call(tuple):
+    """函数体内 yield 出来的调用请求：(函数, args, kwargs)；继承 tuple，创建开销小"""
+
+    __slots__ = ()
+
+    def __repr__(self):
+        return f"<调用请求 {self[0].__name__}{self[1]}（需要 yield）>"
+
+
+class Recursive:
+    """@recursive 装饰后的函数"""
+
+    def __init__(self, body, memoize=False):
+        if not inspect.isgeneratorfunction(body):
+            raise TypeError(f"@recursive 只能装饰生成器函数（函数体里要有 yield）: {body.__qualname__}")
+        self.body = body
+        self.cache = {} if memoize else None
+        _BODIES.add(body.__code__)
+        functools.update_wrapper(self, body)
+
+    def __call__(self, *args, **kwargs):
+        # 从被装饰的函数体里调用：返回调用请求，交给调度循环
+        if sys._getframe(1).f_code in _BODIES:
+            return _Call((self, args, kwargs))
+        return _run(_Call((self, args, kwargs)))
+
+    def __get__(self, instance, owner):
+        # 支持装饰方法
+        return self if instance is None else functools.partial(self, instance)
+
+    def cache_clear(self):
+        if self.cache is not None:
+            self.cache.clear()
+
+
+def _key(args, kwargs):
+    return args if not kwargs else (args, frozenset(kwargs.items()))
+
+
+def _run(call):
+    """调度循环：用列表代替调用栈"""
+    stack = []  # [(生成器, 被调用的函数, 缓存键), ...]
+    value = None
+    error = None
+
+    while True:
+        if call is not None:
+            function, args, kwargs = call
+            call, key = None, None
+            try:
+                if function.cache is not None:
+                    key = _key(args, kwargs)
+                    if key in function.cache:  # 参数不可哈希时这里抛 TypeError
+                        value = function.cache[key]
+                        if not stack:
+                            return value
+                        continue
+                generator = function.body(*args, **kwargs)  # 参数个数不对时这里抛 TypeError
+            except BaseException as e:
+                if not stack:
+                    raise
+                error = e  # 和函数体里的异常一样，抛回发起调用的生成器
+                continue
+            stack.append((generator, function, key))
+            value = None
+
+        generator, function, key = stack[-1]
+        try:
+            if error is not None:
+                request, error = generator.throw(error), None
+            else:
+                request = generator.send(value)
+        except StopIteration as stop:
+            stack.pop()
+            value = stop.value
+            if key is not None:
+                function.cache[key] = value
+            if not stack:
+                return value
+            continue
+        except BaseException as e:
+            stack.pop()
+            if not stack:
+                raise
+            error = e  # 抛回上一层生成器
+            continue
+
+        if not isinstance(request, _Call):
+            error = TypeError(f"{function.__name__} 只能 yield 被 @recursive 装饰的函数调用，"
+                              f"收到 {request!r}")
+            continue
+        call = request
+
+
+def recursive(func=None, *, memoize=False):
+    """
+    把生成器写法的递归函数交给蹦床执行
+
+    可以直接使用 @recursive，也可以 @recursive(memoize=True)
+    """
+    if func is None:
+        return functools.partial(recursive, memoize=memoize)
+    return Recursive(func, memoize)
+
+
+if __name__ == "__main__":
+    import time
+
+    from demo_runner import load
+
+    func = load("func")
+
+    def timed(f, *args, repeat=3):
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = f(*args)
+            best = min(best, time.perf_counter() - start)
+        return result, best
+
+    print("=" * 60)
+    print("1. factorial：普通递归 vs 蹦床 vs 循环")
+    print("=" * 60)
+
+    @recursive
+    def factorial(n):
+        if n <= 1:
+            return 1
+        return n * (yield factorial(n - 1))
+
+    def factorial_loop(n):
+        result = 1
+        for i in range(2, n + 1):
+            result *= i
+        return result
+
+    n = 500
+    expected, plain = timed(func.factorial, n)
+    result, tramp = timed(factorial, n)
+    _, loop = timed(factorial_loop, n)
+    assert result == expected
+    print(f"  factorial({n}): 递归 {plain * 1e6:.0f} µs，蹦床 {tramp * 1e6:.0f} µs"
+          f"（{tramp / plain:.1f} 倍），循环 {loop * 1e6:.0f} µs")
+
+    n = 20_000
+    try:
+        func.factorial(n)
+    except RecursionError:
+        print(f"  func.factorial({n}): RecursionError（递归上限 {sys.getrecursionlimit()}）")
+    result, tramp = timed(factorial, n, repeat=1)
+    print(f"  蹦床 factorial({n}): {result.bit_length()} 位二进制数，{tramp * 1e3:.0f} ms")
+
+    print()
+
+    print("=" * 60)
+    print("2. 树的遍历：100 万层的链状树、100 万个节点的平衡树")
+    print("=" * 60)
+
+    class Node:
+        __slots__ = ("value", "children")
+
+        def __init__(self, value, children=()):
+            self.value = value
+            self.children = list(children)
+
+    def chain(depth):
+        node = Node(depth - 1)
+        for value in range(depth - 2, -1, -1):
+            node = Node(value, [node])
+        return node
+
+    def balanced(count):
+        nodes = [Node(i) for i in range(count)]
+        for i in range(1, count):
+            nodes[(i - 1) // 2].children.append(nodes[i])
+        return nodes[0]
+
+    def tree_sum_plain(node):
+        return node.value + sum(tree_sum_plain(child) for child in node.children)
+
+    @recursive
+    def tree_sum(node):
+        total = node.value
+        for child in node.children:
+            total += yield tree_sum(child)
+        return total
+
+    def tree_sum_stack(root):
+        total = 0
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            total += node.value
+            stack.extend(node.children)
+        return total
+
+    for name, root, count in [("平衡树", balanced(1_000_000), 1_000_000),
+                              ("链状树", chain(1_000_000), 1_000_000)]:
+        expected = count * (count - 1) // 2
+        try:
+            _, plain = timed(tree_sum_plain, root, repeat=1)
+            plain_text = f"{plain * 1e3:.0f} ms"
+        except RecursionError:
+            plain_text = "RecursionError"
+        result, tramp = timed(tree_sum, root, repeat=1)
+        _, manual = timed(tree_sum_stack, root, repeat=1)
+        assert result == expected
+        print(f"  {name}: 普通递归 {plain_text}，蹦床 {tramp * 1e3:.0f} ms，"
+              f"手写显式栈 {manual * 1e3:.0f} ms")
+
+    print()
+
+    print("=" * 60)
+    print("3. 记忆化：斐波那契")
+    print("=" * 60)
+
+    @recursive
+    def fib_plain(n):
+        if n < 2:
+            return n
+        return (yield fib_plain(n - 1)) + (yield fib_plain(n - 2))
+
+    @recursive(memoize=True)
+    def fib(n):
+        if n < 2:
+            return n
+        return (yield fib(n - 1)) + (yield fib(n - 2))
+
+    _, slow = timed(fib_plain, 25, repeat=1)
+    result, fast = timed(fib, 25, repeat=1)
+    print(f"  fib(25): 不缓存 {slow * 1e3:.0f} ms，缓存 {fast * 1e6:.0f} µs，结果 {result}")
+    fib.cache_clear()
+    result, fast = timed(fib, 50_000, repeat=1)
+    print(f"  fib(50000)（5 万层递归）: {result.bit_length()} 位二进制数，{fast * 1e3:.0f} ms")
+
+    print()
+
+    print("=" * 60)
+    print("4. 异常沿显式栈传播")
+    print("=" * 60)
+
+    @recursive
+    def countdown(n):
+        if n == 0:
+            raise ValueError("到底了")
+        try:
+            return (yield countdown(n - 1))
+        finally:
+            if n == 100_000:
+                print("  最外层的 finally 执行了")
+
+    try:
+        countdown(100_000)
+    except ValueError as e:
+        print(f"  捕获到 ValueError: {e}")
+
+    print()
+    print("=" * 60)
+    print("蹦床演示完成！")
+    print("=" * 60)
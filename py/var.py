@@ -145,10 +145,13 @@ name1, name2 = "小王", "小李"
 x = y = z = 0
 
 # 4. 变量类型查看
-print(f"age 的类型: {type(age)}")
-print(f"price 的类型: {type(price)}")
-print(f"name 的类型: {type(name)}")
-print(f"is_student 的类型: {type(is_student)}")
+def show_types():
+    """4. 变量类型查看"""
+    print(f"age 的类型: {type(age)}")
+    print(f"price 的类型: {type(price)}")
+    print(f"name 的类型: {type(name)}")
+    print(f"is_student 的类型: {type(is_student)}")
+
 
 # 5. 变量运算
 num1 = 10
@@ -162,6 +165,7 @@ division = num1 / num2      # 3.333...
 floor_division = num1 // num2 # 3
 modulo = num1 % num2        # 1
 power = num1 ** num2        # 1000
+# 💡 对整列数据做同样的运算（并保持 Python 的负数取整/溢出语义）见 arith_kernel.py
 
 # 6. 字符串变量操作
 first_name = "张"
@@ -169,39 +173,65 @@ last_name = "三"
 full_name = first_name + last_name  # 字符串拼接
 greeting = f"你好，{full_name}！"     # f-string 格式化
 greeting2 = "你好，{}！".format(full_name)  # format 方法
+# 💡 在循环里反复拼接时，先收集片段再 "".join() 一次（见 text_builder.py 的 TextBuilder）
 
 # 7. 变量类型转换
 str_num = "123"
 int_num = int(str_num)      # 字符串转整数
 float_num = float(str_num)  # 字符串转浮点数
+# 💡 整列（几亿个）数字字符串请用 parse_numbers.py 的 parse_column，
+#    按块批量转换成类型化数组，非法值不会逐行抛异常
 
 num_to_str = str(123)       # 数字转字符串
 bool_val = bool(1)          # 数字转布尔值（非0为True）
 
 # 8. 常用变量操作示例
-print("=" * 50)
-print("变量演示输出:")
-print("=" * 50)
-print(f"姓名: {name}, 年龄: {age}")
-print(f"价格: {price} 元")
-print(f"是否为学生: {is_student}")
-print(f"完整问候: {greeting}")
-print(f"数学运算: {num1} + {num2} = {addition}")
-print(f"字符串拼接: {first_name} + {last_name} = {full_name}")
+def show_summary():
+    """8. 常用变量操作示例"""
+    print("=" * 50)
+    print("变量演示输出:")
+    print("=" * 50)
+    print(f"姓名: {name}, 年龄: {age}")
+    print(f"价格: {price} 元")
+    print(f"是否为学生: {is_student}")
+    print(f"完整问候: {greeting}")
+    print(f"数学运算: {num1} + {num2} = {addition}")
+    print(f"字符串拼接: {first_name} + {last_name} = {full_name}")
+
 
 # 9. 变量作用域示例（简要）
 global_var = "我是全局变量"
 
 def test_function():
+    """9. 变量作用域示例"""
     local_var = "我是局部变量"
     print(f"函数内访问全局变量: {global_var}")
     print(f"函数内局部变量: {local_var}")
 
-test_function()
-
 # 10. 特殊变量值
 none_var = None           # None 表示空值
 empty_str = ""            # 空字符串
 empty_list = []           # 空列表
 empty_dict = {}           # 空字典
 
+
+# 只有"打印"的部分放进函数里；上面的变量赋值本身几乎没有开销，
+# 所以 import var 时不会有任何输出
+SECTIONS = [
+    show_types,
+    show_summary,
+    test_function,
+]
+
+
+def main():
+    """按顺序运行所有演示"""
+    for section in SECTIONS:
+        section()
+
+
+if __name__ == "__main__":
+    from output_sink import install
+
+    with install():  # 输出到文件、管道时按大块缓冲
+        main()